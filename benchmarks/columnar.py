@@ -0,0 +1,62 @@
+"""Columnar result memory benchmark
+
+Compares the memory that is retained by a list of namedtuples, the result
+of Schema.load with a post_load hook, and by a ColumnarResult with the same
+rows. The memory of the decoded json document is not included.
+
+Run with ``python -m benchmarks.columnar``
+"""
+import gc
+import time
+import tracemalloc
+
+from clientlib.columnar import ColumnarLoader
+from clientlib.deserialization import compile_schema
+
+from benchmarks.deserialization import PostSchema, create_posts
+
+
+def measure(load, data):
+    gc.collect()
+    tracemalloc.start()
+
+    start = time.perf_counter()
+    result = load(data)
+    duration = time.perf_counter() - start
+
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert len(result) == len(data)
+
+    return retained, peak, duration
+
+
+def main():
+    schema = PostSchema(many=True)
+    loaders = (
+        ("namedtuples", schema.load),
+        ("compiled namedtuples", compile_schema(schema).load),
+        ("columnar", ColumnarLoader(schema).load),
+    )
+
+    for count in (10000, 100000):
+        data = create_posts(count)
+
+        for name, load in loaders:
+            retained, peak, duration = measure(load, data)
+
+            print(
+                "{} posts, {}: {:.1f} bytes/row retained, {:.1f}MB peak, "
+                "{:.1f}ms".format(
+                    count,
+                    name,
+                    retained / count,
+                    peak / 1024 / 1024,
+                    duration * 1000
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Compression benchmark
+
+Measures the bytes on the wire and the client CPU time per call for a large
+list response in each content encoding, and for a large request payload
+with and without gzip compression, against a local in-process server.
+
+Run with ``python -m benchmarks.compression``
+"""
+import gzip
+import time
+import zlib
+
+from clientlib.clients import Client
+from clientlib.compression import Compression, get_available_encodings
+from clientlib.endpoints import Endpoint
+
+from benchmarks.deserialization import create_posts
+from benchmarks.server import BenchmarkServer
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+
+class BenchmarkClient(Client):
+    posts = Endpoint(method="GET", endpoint="/posts")
+
+    create_posts = Endpoint(method="POST", endpoint="/posts", payload="posts")
+
+
+def get_server_encodings():
+    encodings = {
+        "gzip": gzip.compress,
+        "deflate": zlib.compress,
+    }
+
+    if brotli is not None:
+        encodings["br"] = brotli.compress
+
+    return {
+        encoding: compress
+        for encoding, compress in encodings.items()
+        if encoding in get_available_encodings()
+    }
+
+
+def measure(server, call, calls):
+    bytes_sent = server.bytes_sent
+    bytes_received = server.bytes_received
+    start = time.perf_counter()
+    cpu_start = time.thread_time()
+
+    for _ in range(calls):
+        call()
+
+    cpu = time.thread_time() - cpu_start
+    duration = time.perf_counter() - start
+
+    return (
+        (server.bytes_sent - bytes_sent) / calls,
+        (server.bytes_received - bytes_received) / calls,
+        cpu / calls * 1000,
+        duration / calls * 1000
+    )
+
+
+def benchmark_responses(items, calls):
+    server_encodings = get_server_encodings()
+
+    with BenchmarkServer(response=create_posts(items),
+                         encodings=server_encodings) as server:
+        for encoding in ["identity"] + list(server_encodings):
+            encodings = [] if encoding == "identity" else [encoding]
+
+            with BenchmarkClient(
+                    base_url=server.base_url,
+                    compression=Compression(encodings=encodings)) as client:
+                client.posts()
+
+                bytes_sent, _, cpu, duration = measure(
+                    server, client.posts, calls)
+
+            print(
+                "response {}: {:.0f} bytes, client cpu {:.2f}ms, "
+                "{:.2f}ms per call".format(encoding, bytes_sent, cpu, duration)
+            )
+
+
+def benchmark_requests(items, calls):
+    payload = create_posts(items)
+
+    with BenchmarkServer() as server:
+        for name, compression in (
+                ("identity", Compression()),
+                ("gzip", Compression(request_threshold=1024))):
+            with BenchmarkClient(
+                    base_url=server.base_url,
+                    compression=compression) as client:
+                def call():
+                    client.create_posts(posts=payload)
+
+                call()
+
+                _, bytes_received, cpu, duration = measure(
+                    server, call, calls)
+
+            print(
+                "request {}: {:.0f} bytes, client cpu {:.2f}ms, "
+                "{:.2f}ms per call".format(
+                    name, bytes_received, cpu, duration)
+            )
+
+
+def main(items=5000, calls=20):
+    benchmark_responses(items, calls)
+    benchmark_requests(items, calls)
+
+
+if __name__ == "__main__":
+    main()
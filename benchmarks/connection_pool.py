@@ -0,0 +1,48 @@
+"""Connection pooling benchmark
+
+Compares the number of requests per second that a client can execute when
+the session is closed after every call, which was the behaviour of clientlib
+before connection pooling, against a client that keeps its pooled
+connections alive.
+
+Run with ``python -m benchmarks.connection_pool``
+"""
+import time
+
+from clientlib.clients import Client
+from clientlib.endpoints import Endpoint
+
+from benchmarks.server import BenchmarkServer
+
+
+class BenchmarkClient(Client):
+    message = Endpoint(method="GET", endpoint="/message")
+
+
+def run(client, calls, close_session=False):
+    start = time.perf_counter()
+
+    for _ in range(calls):
+        client.message()
+
+        if close_session:
+            client.session.close()
+
+    return calls / (time.perf_counter() - start)
+
+
+def main(calls=1000):
+    with BenchmarkServer() as server:
+        with BenchmarkClient(base_url=server.base_url) as client:
+            closed = run(client, calls, close_session=True)
+
+        with BenchmarkClient(base_url=server.base_url) as client:
+            pooled = run(client, calls)
+
+    print("session closed after every call: {:.1f} requests/sec".format(
+        closed))
+    print("pooled keep-alive connections: {:.1f} requests/sec".format(pooled))
+
+
+if __name__ == "__main__":
+    main()
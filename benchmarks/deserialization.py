@@ -0,0 +1,74 @@
+"""Response deserialization benchmark
+
+Compares the time that Schema.load and the compiled loader need in order to
+deserialize a list of posts, the response of a typical list endpoint.
+
+Run with ``python -m benchmarks.deserialization``
+"""
+import time
+from collections import namedtuple
+
+from marshmallow import Schema, post_load, fields
+
+from clientlib.deserialization import compile_schema
+
+
+Post = namedtuple("Post", ["userId", "id", "title", "body"])
+
+
+class PostSchema(Schema):
+    userId = fields.Int(required=True)
+    id = fields.Int(required=True)
+    title = fields.Str(required=True)
+    body = fields.Str(required=True)
+
+    @post_load
+    def make_post(self, data, **kwargs):
+        return Post(**data)
+
+
+def create_posts(count):
+    return [
+        {
+            "userId": i % 10,
+            "id": i,
+            "title": "post title {}".format(i),
+            "body": "lorem ipsum dolor sit amet"
+        }
+        for i in range(count)
+    ]
+
+
+def measure(schema, data, rounds):
+    timings = []
+
+    for _ in range(rounds):
+        start = time.perf_counter()
+        schema.load(data)
+        timings.append(time.perf_counter() - start)
+
+    return min(timings) * 1000
+
+
+def main(rounds=10):
+    schema = PostSchema(many=True)
+    compiled_schemas = (
+        ("compiled", compile_schema(schema)),
+        ("compiled 1% validated",
+         compile_schema(schema, validation_sample_rate=0.01)),
+    )
+
+    for count in (100, 1000, 10000):
+        data = create_posts(count)
+        results = ["Schema.load {:.2f}ms".format(
+            measure(schema, data, rounds))]
+
+        for name, compiled_schema in compiled_schemas:
+            results.append("{} {:.2f}ms".format(
+                name, measure(compiled_schema, data, rounds)))
+
+        print("{} posts: {}".format(count, ", ".join(results)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Instrumentation overhead benchmark
+
+Measures the time per call to a local in-process server without
+instrumentation and with the in-memory metrics.
+
+Run with ``python -m benchmarks.instrumentation``
+"""
+from clientlib.instrumentation import InMemoryMetrics, format_prometheus
+
+from benchmarks.request_overhead import BenchmarkClient, measure
+from benchmarks.server import BenchmarkServer
+
+
+def main(calls=1000, rounds=5):
+    metrics = InMemoryMetrics()
+
+    with BenchmarkServer() as server:
+        with BenchmarkClient(base_url=server.base_url) as client, \
+                BenchmarkClient(base_url=server.base_url,
+                                instrumentation=metrics) as instrumented:
+            timings = {"disabled": [], "in-memory metrics": []}
+
+            # the rounds are interleaved and the best one is reported in
+            # order to reduce the effect of the server noise
+            for _ in range(rounds):
+                for name, endpoint in (
+                        ("disabled", client.message),
+                        ("in-memory metrics", instrumented.message)):
+                    timings[name].append(measure(
+                        lambda i: endpoint(message_id=i, page=i), calls))
+
+    print("complete call: {}".format(", ".join(
+        "{} {:.1f}us".format(name, min(values))
+        for name, values in timings.items()
+    )))
+    print(format_prometheus(metrics))
+
+
+if __name__ == "__main__":
+    main()
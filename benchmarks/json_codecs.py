@@ -0,0 +1,60 @@
+"""JSON codec benchmark
+
+Measures the time that each of the available codecs needs in order to
+encode and decode small, medium and large documents.
+
+Run with ``python -m benchmarks.json_codecs``
+"""
+import time
+
+from clientlib.json_codecs import get_available_codecs
+
+
+def create_item(i):
+    return {
+        "id": i,
+        "userId": i % 10,
+        "title": "item title {}".format(i),
+        "body": "lorem ipsum dolor sit amet " * 4,
+        "score": i / 3.0,
+        "completed": i % 2 == 0,
+        "tags": ["first", "second", "third"]
+    }
+
+
+DOCUMENTS = (
+    ("small", create_item(1)),
+    ("medium", [create_item(i) for i in range(100)]),
+    ("large", [create_item(i) for i in range(10000)]),
+)
+
+
+def measure(function, document, calls):
+    start = time.perf_counter()
+
+    for _ in range(calls):
+        function(document)
+
+    return (time.perf_counter() - start) / calls * 1000000
+
+
+def main(total_items=100000):
+    codecs = get_available_codecs()
+
+    for name, document in DOCUMENTS:
+        items = len(document) if isinstance(document, list) else 1
+        calls = max(total_items // items, 5)
+
+        for codec in codecs:
+            encoded = codec.encode(document)
+
+            print("{} {}: encode {:.1f}us, decode {:.1f}us".format(
+                name,
+                codec.name,
+                measure(codec.encode, document, calls),
+                measure(codec.decode, encoded, calls)
+            ))
+
+
+if __name__ == "__main__":
+    main()
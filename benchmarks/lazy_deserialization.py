@@ -0,0 +1,78 @@
+"""Lazy deserialization benchmark
+
+Measures the time to execute a list endpoint whose caller only reads the
+status code and the first items of the response, with eager and lazy
+deserialization. The api function is replaced with a stub in order to
+measure only the client side work.
+
+Run with ``python -m benchmarks.lazy_deserialization``
+"""
+import time
+
+from clientlib.endpoints import Endpoint, BoundEndpoint
+from clientlib.instrumentation import NO_INSTRUMENTATION
+from clientlib.models import Response
+
+from benchmarks.deserialization import PostSchema, create_posts
+
+
+class StubFunction(object):
+    instrumentation = NO_INSTRUMENTATION
+
+    def __init__(self, response):
+        self.response = response
+
+    def execute(self, args, params, json, headers):
+        return self.response
+
+
+def measure(endpoint, read_items, rounds):
+    timings = []
+
+    for _ in range(rounds):
+        start = time.perf_counter()
+
+        endpoint_response = endpoint()
+        if endpoint_response.response.status_code == 200:
+            for post in endpoint_response.data[:read_items]:
+                post.title
+
+        timings.append(time.perf_counter() - start)
+
+    return min(timings) * 1000
+
+
+def main(count=10000, rounds=10):
+    function = StubFunction(Response(
+        status_code=200, headers={}, json=create_posts(count)))
+
+    endpoints = [
+        (
+            name,
+            BoundEndpoint(
+                Endpoint(
+                    method="GET",
+                    endpoint="/posts",
+                    response_schema=PostSchema(many=True),
+                    lazy=lazy
+                ),
+                function
+            )
+        )
+        for name, lazy in (("eager", False), ("lazy", True))
+    ]
+
+    for read_items in (10, 1000, count):
+        print("{} of {} posts read: {}".format(
+            read_items,
+            count,
+            ", ".join(
+                "{} {:.2f}ms".format(
+                    name, measure(endpoint, read_items, rounds))
+                for name, endpoint in endpoints
+            )
+        ))
+
+
+if __name__ == "__main__":
+    main()
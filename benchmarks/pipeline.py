@@ -0,0 +1,237 @@
+"""Full call pipeline benchmark suite
+
+Drives the endpoints of a client against a local in-process server and
+reports throughput, p50/p99 latency, CPU time per call and peak memory for
+single calls, concurrent calls and large list responses. The results are
+written as json, so that they can be compared between runs.
+
+The server runs in the same process, so the process CPU time includes the
+work of the server. The client CPU time is measured on the calling thread
+and it is reported only for the sequential scenarios.
+
+Run with ``python -m benchmarks.pipeline [--output results.json]``
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from clientlib.clients import Client
+from clientlib.endpoints import Endpoint
+
+from benchmarks.deserialization import PostSchema, create_posts
+from benchmarks.server import BenchmarkServer
+
+
+class BenchmarkClient(Client):
+    post = Endpoint(
+        method="GET",
+        endpoint="/posts/{post_id}",
+        args=["post_id"],
+        response_schema=PostSchema()
+    )
+
+    posts = Endpoint(
+        method="GET",
+        endpoint="/posts",
+        response_schema=PostSchema(many=True)
+    )
+
+
+def percentile(values, percent):
+    """Get a percentile of a list of values with the nearest rank method
+
+    :param list[float] values: the values
+    :param float percent: the percentile, between 0 and 100
+    :rtype: float
+    :return: the percentile
+    """
+    values = sorted(values)
+    rank = max(int(round(percent / 100.0 * len(values))), 1)
+
+    return values[rank - 1]
+
+
+def timed(function, latencies):
+    def execute(**kwargs):
+        start = time.perf_counter()
+        result = function(**kwargs)
+        latencies.append(time.perf_counter() - start)
+
+        return result
+
+    return execute
+
+
+def run_sequential(endpoint, calls, kwargs):
+    latencies = []
+    call = timed(endpoint, latencies)
+
+    start = time.perf_counter()
+    process_start = time.process_time()
+    thread_start = time.thread_time()
+
+    for i in range(calls):
+        call(**kwargs(i))
+
+    return (
+        latencies,
+        time.perf_counter() - start,
+        time.process_time() - process_start,
+        time.thread_time() - thread_start
+    )
+
+
+def run_concurrent(client, endpoint, calls, kwargs, concurrency):
+    latencies = []
+    call = timed(endpoint, latencies)
+
+    start = time.perf_counter()
+    process_start = time.process_time()
+
+    for result in client.gather(
+            [(call, kwargs(i)) for i in range(calls)],
+            concurrency=concurrency,
+            ordered=False):
+        if result.error is not None:
+            raise result.error
+
+    return (
+        latencies,
+        time.perf_counter() - start,
+        time.process_time() - process_start,
+        None
+    )
+
+
+def measure_peak_memory(function, calls):
+    tracemalloc.start()
+
+    try:
+        function(calls)
+
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def create_result(scenario, calls, run, memory_run, memory_calls):
+    latencies, duration, process_cpu, client_cpu = run(calls)
+
+    return {
+        "scenario": scenario,
+        "calls": calls,
+        "throughput": calls / duration,
+        "latency_p50_ms": percentile(latencies, 50) * 1000,
+        "latency_p99_ms": percentile(latencies, 99) * 1000,
+        "cpu_per_call_us": process_cpu / calls * 1000000,
+        "client_cpu_per_call_us":
+            None if client_cpu is None else client_cpu / calls * 1000000,
+        "peak_memory_bytes": measure_peak_memory(memory_run, memory_calls)
+    }
+
+
+def benchmark_single_calls(options):
+    with BenchmarkServer(response=create_posts(1)[0],
+                         latency=options.latency) as server:
+        with BenchmarkClient(base_url=server.base_url) as client:
+            def run(calls):
+                return run_sequential(
+                    client.post, calls, lambda i: {"post_id": i})
+
+            run(options.warmup)
+
+            return create_result(
+                "single", options.calls, run, run, options.memory_calls)
+
+
+def benchmark_concurrent_calls(options):
+    with BenchmarkServer(response=create_posts(1)[0],
+                         latency=options.latency) as server:
+        with BenchmarkClient(base_url=server.base_url,
+                             pool_maxsize=options.concurrency) as client:
+            def run(calls):
+                return run_concurrent(
+                    client, client.post, calls, lambda i: {"post_id": i},
+                    options.concurrency
+                )
+
+            run(options.warmup)
+
+            result = create_result(
+                "concurrent", options.calls, run, run, options.memory_calls)
+            result["concurrency"] = options.concurrency
+
+            return result
+
+
+def benchmark_list_responses(options):
+    with BenchmarkServer(response=create_posts(options.list_size),
+                         latency=options.latency) as server:
+        with BenchmarkClient(base_url=server.base_url) as client:
+            def run(calls):
+                return run_sequential(client.posts, calls, lambda i: {})
+
+            run(1)
+
+            calls = max(options.calls // 100, 5)
+            result = create_result("large_list", calls, run, run, 1)
+            result["list_size"] = options.list_size
+
+            return result
+
+
+SCENARIOS = {
+    "single": benchmark_single_calls,
+    "concurrent": benchmark_concurrent_calls,
+    "large_list": benchmark_list_responses,
+}
+
+
+def parse_arguments(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--scenario", choices=sorted(SCENARIOS), action="append",
+        help="the scenarios to run. All the scenarios run by default")
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--memory-calls", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--list-size", type=int, default=5000)
+    parser.add_argument(
+        "--latency", type=float, default=0,
+        help="the server latency in seconds")
+    parser.add_argument(
+        "--output", help="the file to write the results to. The results are "
+                         "written to stdout by default")
+
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    options = parse_arguments(args)
+
+    results = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "options": vars(options),
+        "results": [
+            SCENARIOS[scenario](options)
+            for scenario in options.scenario or sorted(SCENARIOS)
+        ]
+    }
+
+    if options.output:
+        with open(options.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
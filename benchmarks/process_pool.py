@@ -0,0 +1,64 @@
+"""Process pool deserialization benchmark
+
+Measures the throughput of concurrent calls to a list endpoint with a large
+response when the responses are deserialized inline by the calling threads
+and when they are deserialized by process pools with an increasing number
+of workers. The inline deserialization doesn't scale with the threads,
+since Schema.load holds the GIL.
+
+Run with ``python -m benchmarks.process_pool``
+"""
+import os
+import time
+
+from clientlib.clients import Client
+from clientlib.endpoints import Endpoint
+from clientlib.process_pool import ProcessPoolDeserializer
+
+from benchmarks.deserialization import PostSchema, create_posts
+from benchmarks.server import BenchmarkServer
+
+
+class BenchmarkClient(Client):
+    posts = Endpoint(
+        method="GET",
+        endpoint="/posts",
+        response_schema=PostSchema(many=True)
+    )
+
+
+def measure(base_url, process_pool, calls, concurrency):
+    with BenchmarkClient(base_url=base_url, process_pool=process_pool,
+                         pool_maxsize=concurrency) as client:
+        # warm up the connections and the worker processes
+        for result in client.posts.execute_many(
+                [{}] * concurrency, concurrency=concurrency):
+            assert result.error is None, result.error
+
+        start = time.perf_counter()
+        for result in client.posts.execute_many(
+                [{}] * calls, concurrency=concurrency):
+            assert result.error is None, result.error
+
+        return calls / (time.perf_counter() - start)
+
+
+def main(items=20000, calls=64, concurrency=16):
+    cpu_count = os.cpu_count() or 1
+    worker_counts = sorted({1, 2, 4, cpu_count} - {
+        count for count in (2, 4) if count > cpu_count})
+
+    with BenchmarkServer(response=create_posts(items)) as server:
+        throughput = measure(server.base_url, None, calls, concurrency)
+        print("inline: {:.1f} calls/s".format(throughput))
+
+        for workers in worker_counts:
+            with ProcessPoolDeserializer(max_workers=workers) as pool:
+                throughput = measure(
+                    server.base_url, pool, calls, concurrency)
+
+            print("{} workers: {:.1f} calls/s".format(workers, throughput))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Per call overhead benchmark
+
+Measures the time that is spent on the client side to create a request,
+first for the request preparation alone and then for complete calls to a
+local in-process server, with and without the prepared request prototype.
+
+Run with ``python -m benchmarks.request_overhead``
+"""
+import time
+
+from requests import Request
+
+from clientlib.authentication import TokenAuthenticator
+from clientlib.clients import Client
+from clientlib.endpoints import Endpoint
+from clientlib.requests import RequestPrototype
+
+from benchmarks.server import BenchmarkServer
+
+
+class BenchmarkClient(Client):
+    message = Endpoint(
+        method="GET",
+        endpoint="/messages/{message_id}",
+        args=["message_id"],
+        params=["page"]
+    )
+
+
+def measure(function, calls):
+    start = time.perf_counter()
+
+    for i in range(calls):
+        function(i)
+
+    return (time.perf_counter() - start) / calls * 1000000
+
+
+def benchmark_preparation(calls):
+    auth = TokenAuthenticator("token", "Bearer")
+    prototype = RequestPrototype(method="GET", auth=auth)
+
+    def prepare_with_requests(i):
+        Request(
+            method="GET",
+            url="http://localhost/messages/{}".format(i),
+            params={"page": i},
+            auth=auth
+        ).prepare()
+
+    def prepare_with_prototype(i):
+        prototype.prepare(
+            url="http://localhost/messages/{}".format(i),
+            params={"page": i}
+        )
+
+    return (
+        measure(prepare_with_requests, calls),
+        measure(prepare_with_prototype, calls)
+    )
+
+
+def benchmark_calls(calls, rounds=5):
+    with BenchmarkServer() as server:
+        with BenchmarkClient(
+                base_url=server.base_url,
+                auth=TokenAuthenticator("token", "Bearer")) as client:
+            endpoint = client.message
+
+            def call(i):
+                endpoint(message_id=i, page=i)
+
+            prototype = endpoint.function.prototype
+            without_prototype = []
+            with_prototype = []
+
+            # the rounds are interleaved and the best one is reported in
+            # order to reduce the effect of the server noise
+            for _ in range(rounds):
+                endpoint.function.prototype = None
+                without_prototype.append(measure(call, calls))
+
+                endpoint.function.prototype = prototype
+                with_prototype.append(measure(call, calls))
+
+    return min(without_prototype), min(with_prototype)
+
+
+def main(calls=1000):
+    print("request preparation: requests {:.1f}us, prototype {:.1f}us".format(
+        *benchmark_preparation(calls * 10)))
+    print("complete call: requests {:.1f}us, prototype {:.1f}us".format(
+        *benchmark_calls(calls)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class BenchmarkRequestHandler(BaseHTTPRequestHandler):
+    """Request handler that responds to every request with a json document"""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    wbufsize = -1
+
+    def _select_encoding(self):
+        accepted = [
+            encoding.strip()
+            for encoding in self.headers.get("Accept-Encoding", "").split(",")
+        ]
+
+        for encoding in accepted:
+            if encoding in self.server.encoded_bodies:
+                return encoding
+
+        return None
+
+    def do_GET(self):
+        encoding = self._select_encoding()
+        if encoding is None:
+            body = self.server.response_body
+        else:
+            body = self.server.encoded_bodies[encoding]
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if encoding is not None:
+            self.send_header("Content-Encoding", encoding)
+        self.end_headers()
+        self.wfile.write(body)
+
+        self.server.bytes_sent += len(body)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.bytes_received += len(body)
+
+        self.do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    # the concurrent benchmarks open many connections at once
+    request_queue_size = 128
+
+
+class BenchmarkServer(object):
+    """Local HTTP server that runs in a background thread"""
+
+    def __init__(self, response=None, host="127.0.0.1", port=0, latency=0,
+                 encodings=None):
+        """Create a new BenchmarkServer object
+
+        :param object response: the json document to respond with
+        :param str host: the address to bind to
+        :param int port: the port to bind to. A free port is selected when
+        this is 0
+        :param float latency: the time in seconds to wait before every
+        response
+        :param dict[str, callable] encodings: the functions that compress the
+        response for each content encoding that the server supports. The
+        response is not compressed when this is None
+        """
+        self._server = _HTTPServer((host, port), BenchmarkRequestHandler)
+        self._server.daemon_threads = True
+        self._server.latency = latency
+        self._server.response_body = json.dumps(
+            response if response is not None else {"message": "hello world"}
+        ).encode("utf-8")
+        self._server.encoded_bodies = {
+            encoding: compress(self._server.response_body)
+            for encoding, compress in (encodings or {}).items()
+        }
+        self._server.bytes_sent = 0
+        self._server.bytes_received = 0
+        self._thread = None
+
+    @property
+    def bytes_sent(self):
+        """The size of the response bodies that were sent"""
+        return self._server.bytes_sent
+
+    @property
+    def bytes_received(self):
+        """The size of the request bodies that were received"""
+        return self._server.bytes_received
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+
+        return "http://{}:{}".format(host, port)
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        self.start()
+
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
@@ -0,0 +1,278 @@
+import asyncio
+import heapq
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import copy_context
+from functools import partial
+from itertools import count
+from time import monotonic
+
+from clientlib.exceptions import BatchExecutionError
+
+
+# the maximum number of batches whose window expired that are executed
+# concurrently by the batchers of the process
+MAX_SCHEDULED_BATCHES = 32
+
+
+def _create_batch_error(error):
+    # every caller gets its own exception, so that the callers that raise it
+    # concurrently don't share a traceback
+    batch_error = BatchExecutionError(
+        reason="the batch request failed", error=error)
+    batch_error.__cause__ = error
+
+    return batch_error
+
+
+class _Scheduler(object):
+    """Executes the batches whose window expires
+
+    A single thread waits for the windows of all the batchers and the
+    batches are executed by a shared thread pool, so the number of threads
+    doesn't grow with the number of pending batches.
+    """
+
+    def __init__(self, max_workers):
+        """Create a new _Scheduler object
+
+        :param int max_workers: the maximum number of batches to execute
+        concurrently
+        """
+        self.max_workers = max_workers
+
+        self._condition = threading.Condition()
+        self._entries = []
+        self._sequence = count()
+        self._thread = None
+        self._executor = None
+
+    def schedule(self, delay, callback):
+        """Execute a callback after a delay
+
+        :param float delay: the delay in seconds
+        :param callable callback: the callback to execute
+        """
+        with self._condition:
+            heapq.heappush(
+                self._entries,
+                (monotonic() + delay, next(self._sequence), callback)
+            )
+
+            if self._thread is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="clientlib-batch"
+                )
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="clientlib-batch-scheduler",
+                    daemon=True
+                )
+                self._thread.start()
+
+            self._condition.notify()
+
+    def _run(self):
+        with self._condition:
+            while True:
+                if not self._entries:
+                    self._condition.wait()
+                    continue
+
+                delay = self._entries[0][0] - monotonic()
+                if delay > 0:
+                    self._condition.wait(delay)
+                    continue
+
+                _, _, callback = heapq.heappop(self._entries)
+                self._executor.submit(callback)
+
+
+_scheduler = _Scheduler(MAX_SCHEDULED_BATCHES)
+
+
+class _Batch(object):
+    """Calls that are buffered in order to be executed in one request"""
+
+    __slots__ = ("items", "futures", "timer")
+
+    def __init__(self):
+        self.items = []
+        self.futures = []
+        self.timer = None
+
+
+class Batcher(object):
+    """Buffers concurrent calls and executes them in batches
+
+    The calls are grouped by a key. The first call of a group starts a
+    window and the calls that arrive during the window are executed
+    together when it expires, or as soon as the group reaches the maximum
+    batch size. The batch that fills up is executed by the thread of the
+    last call. The batches whose window expires are executed by a thread
+    pool that is shared by all the batchers, with the context of the first
+    call, so that its deadline applies to the batch.
+
+    The batch function receives the key and the items of the calls and it
+    must return a BatchResult for each item, in the same order.
+    """
+
+    def __init__(self, execute_batch, max_batch_size=100, window=0.01):
+        """Create a new Batcher object
+
+        :param callable execute_batch: the function that executes a batch
+        :param int max_batch_size: the maximum number of calls in a batch
+        :param float window: the time in seconds to wait for more calls
+        """
+        self.execute_batch = execute_batch
+        self.max_batch_size = max_batch_size
+        self.window = window
+
+        self._lock = threading.Lock()
+        self._batches = {}
+
+    def submit(self, key, item):
+        """Add a call to the batch of its group
+
+        :param tuple key: the key of the group
+        :param object item: the item of the call
+        :rtype: concurrent.futures.Future
+        :return: the future of the call result
+        """
+        future = Future()
+
+        with self._lock:
+            batch = self._batches.get(key)
+            if batch is None:
+                batch = self._batches[key] = _Batch()
+                _scheduler.schedule(
+                    self.window,
+                    partial(copy_context().run, self._flush, key, batch)
+                )
+
+            batch.items.append(item)
+            batch.futures.append(future)
+
+            full = len(batch.items) >= self.max_batch_size
+            if full:
+                del self._batches[key]
+
+        if full:
+            self._dispatch(key, batch)
+
+        return future
+
+    def _flush(self, key, batch):
+        with self._lock:
+            if self._batches.get(key) is not batch:
+                # the batch filled up and it has already been executed
+                return
+
+            del self._batches[key]
+
+        self._dispatch(key, batch)
+
+    def _dispatch(self, key, batch):
+        futures = [
+            future
+            for future in batch.futures
+            if future.set_running_or_notify_cancel()
+        ]
+
+        try:
+            results = self.execute_batch(key, batch.items)
+        except Exception as e:
+            for future in futures:
+                future.set_exception(_create_batch_error(e))
+
+            return
+
+        for future, result in zip(batch.futures, results):
+            if not future.running():
+                continue
+
+            if result.error is not None:
+                future.set_exception(result.error)
+            else:
+                future.set_result(result.response)
+
+
+class AsyncBatcher(object):
+    """Buffers concurrent coroutine calls and executes them in batches
+
+    This is the asyncio counterpart of Batcher. The batches are executed by
+    tasks of the event loop. It must be used by a single event loop.
+    """
+
+    def __init__(self, execute_batch, max_batch_size=100, window=0.01):
+        """Create a new AsyncBatcher object
+
+        :param callable execute_batch: the coroutine function that executes a
+        batch
+        :param int max_batch_size: the maximum number of calls in a batch
+        :param float window: the time in seconds to wait for more calls
+        """
+        self.execute_batch = execute_batch
+        self.max_batch_size = max_batch_size
+        self.window = window
+
+        self._batches = {}
+        self._tasks = set()
+
+    async def submit(self, key, item):
+        """Add a call to the batch of its group and wait for the result
+
+        :param tuple key: the key of the group
+        :param object item: the item of the call
+        :return: the call result
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        batch = self._batches.get(key)
+        if batch is None:
+            batch = self._batches[key] = _Batch()
+            batch.timer = loop.call_later(
+                self.window, self._flush, key, batch)
+
+        batch.items.append(item)
+        batch.futures.append(future)
+
+        if len(batch.items) >= self.max_batch_size:
+            batch.timer.cancel()
+            self._flush(key, batch)
+
+        return await future
+
+    def _flush(self, key, batch):
+        if self._batches.get(key) is not batch:
+            return
+
+        del self._batches[key]
+
+        # the tasks are referenced until they complete, so that they are not
+        # garbage collected
+        task = asyncio.ensure_future(self._dispatch(key, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, key, batch):
+        try:
+            results = await self.execute_batch(key, batch.items)
+        except Exception as e:
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(_create_batch_error(e))
+
+            return
+
+        for future, result in zip(batch.futures, results):
+            if future.done():
+                # the caller was cancelled
+                continue
+
+            if result.error is not None:
+                future.set_exception(result.error)
+            else:
+                future.set_result(result.response)
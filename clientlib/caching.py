@@ -0,0 +1,196 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+CACHEABLE_METHODS = frozenset(["GET", "HEAD"])
+
+
+def parse_cache_control(value):
+    """Parse the value of a Cache-Control header
+
+    :param str value: the header value
+    :rtype: dict
+    :return: the cache directives. Directives without a value are set to True
+    """
+    directives = {}
+
+    for directive in (value or "").split(","):
+        name, _, argument = directive.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') or True
+
+    return directives
+
+
+class CacheEntry(object):
+    """Cached endpoint response"""
+
+    __slots__ = ("value", "expires_at", "etag", "last_modified")
+
+    def __init__(self, value, expires_at, etag=None, last_modified=None):
+        """Create a new CacheEntry object
+
+        :param object value: the cached endpoint response
+        :param float expires_at: the monotonic time at which the entry stops
+        being fresh
+        :param str etag: the ETag validator of the response
+        :param str last_modified: the Last-Modified validator of the response
+        """
+        self.value = value
+        self.expires_at = expires_at
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def is_fresh(self):
+        return time.monotonic() < self.expires_at
+
+    def can_revalidate(self):
+        return self.etag is not None or self.last_modified is not None
+
+    def create_conditional_headers(self):
+        headers = {}
+
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+
+        return headers
+
+
+class ResponseCache(object):
+    """In-memory LRU cache for endpoint responses
+
+    The cache honours the Cache-Control, ETag and Last-Modified headers of
+    the responses. Stale entries that have a validator are kept, so that they
+    can be revalidated with a conditional request.
+    """
+
+    def __init__(self, max_size=256, ttl=60):
+        """Create a new ResponseCache object
+
+        :param int max_size: the maximum number of cached responses
+        :param float ttl: the maximum number of seconds a response is
+        considered fresh
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _get_lifetime(self, headers):
+        cache_control = parse_cache_control(headers.get("Cache-Control"))
+
+        if "no-store" in cache_control:
+            return None
+        elif "no-cache" in cache_control:
+            return 0
+
+        max_age = cache_control.get("max-age")
+        if max_age is not None:
+            try:
+                return min(int(max_age), self.ttl)
+            except ValueError:
+                return 0
+
+        return self.ttl
+
+    def lookup(self, key):
+        """Look up a cached response
+
+        The lookup is recorded as a hit when a fresh entry exists and as a
+        miss otherwise.
+
+        :param tuple key: the cache key
+        :rtype: tuple[CacheEntry|None, boolean]
+        :return: the cache entry, or None if there isn't a usable entry, and
+        a flag that indicates whether the entry is fresh
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and \
+                    not entry.is_fresh() and not entry.can_revalidate():
+                del self._entries[key]
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None, False
+
+            self._entries.move_to_end(key)
+
+            fresh = entry.is_fresh()
+            if fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+            return entry, fresh
+
+    def set(self, key, value, headers):
+        """Store a response in the cache
+
+        :param tuple key: the cache key
+        :param object value: the endpoint response
+        :param dict headers: the response headers
+        """
+        lifetime = self._get_lifetime(headers)
+        if lifetime is None:
+            return
+
+        entry = CacheEntry(
+            value=value,
+            expires_at=time.monotonic() + lifetime,
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified")
+        )
+
+        if lifetime <= 0 and not entry.can_revalidate():
+            return
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def revalidate(self, key, entry, headers):
+        """Mark a cache entry as fresh after a 304 Not Modified response
+
+        :param tuple key: the cache key
+        :param CacheEntry entry: the revalidated entry
+        :param dict headers: the headers of the 304 response
+        :rtype: object
+        :return: the cached endpoint response
+        """
+        lifetime = self._get_lifetime(headers)
+
+        with self._lock:
+            self.revalidations += 1
+
+            if lifetime is None:
+                self._entries.pop(key, None)
+            else:
+                entry.expires_at = time.monotonic() + lifetime
+                entry.etag = headers.get("ETag", entry.etag)
+                entry.last_modified = headers.get(
+                    "Last-Modified", entry.last_modified)
+
+        return entry.value
+
+    def clear(self):
+        """Remove all the cached responses"""
+        with self._lock:
+            self._entries.clear()
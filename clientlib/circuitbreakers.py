@@ -0,0 +1,278 @@
+import logging
+import threading
+import time
+from collections import deque
+
+from clientlib.exceptions import RequestExecutionError, CircuitOpenError
+
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker(object):
+    """Circuit breaker
+
+    The breaker keeps the outcome of the latest calls. When the rate of the
+    failed or slow calls exceeds the configured thresholds the circuit opens
+    and the calls fail fast with a CircuitOpenError. After the reset timeout
+    a limited number of trial calls are allowed and, if they succeed, the
+    circuit closes again.
+
+    A call fails when it raises a RequestExecutionError, like a timeout or a
+    connection error, or when the response status code is 5xx.
+    """
+
+    def __init__(self, name=None, failure_rate_threshold=0.5,
+                 slow_call_duration=None, slow_call_rate_threshold=1.0,
+                 window_size=20, minimum_calls=10, reset_timeout=30,
+                 half_open_max_calls=1, on_state_change=None):
+        """Create a new CircuitBreaker object
+
+        :param str name: the breaker name
+        :param float failure_rate_threshold: the failed call rate at which the
+        circuit opens
+        :param float slow_call_duration: the duration in seconds above which a
+        call is considered slow. Call latency is ignored when this is None
+        :param float slow_call_rate_threshold: the slow call rate at which the
+        circuit opens
+        :param int window_size: the number of latest calls to keep
+        :param int minimum_calls: the minimum number of calls required before
+        the failure rates are evaluated
+        :param float reset_timeout: the number of seconds the circuit stays
+        open before trial calls are allowed
+        :param int half_open_max_calls: the number of trial calls
+        :param on_state_change: a callable that is called with the breaker,
+        the old state and the new state on every state transition
+        """
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_duration = slow_call_duration
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.window_size = window_size
+        self.minimum_calls = minimum_calls
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.on_state_change = on_state_change
+
+        self.calls = 0
+        self.failed_calls = 0
+        self.slow_calls = 0
+        self.rejected_calls = 0
+
+        self._state = CLOSED
+        self._outcomes = deque(maxlen=window_size)
+        self._opened_at = None
+        self._half_open_calls = 0
+        self._half_open_successes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state
+
+    def _transition(self, state):
+        old_state = self._state
+        self._state = state
+
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+        elif state == HALF_OPEN:
+            self._half_open_calls = 0
+            self._half_open_successes = 0
+        elif state == CLOSED:
+            self._outcomes.clear()
+
+        logger.warning(
+            "circuit breaker %s changed state from %s to %s",
+            self.name, old_state, state
+        )
+
+        return old_state, state
+
+    def _notify(self, transition):
+        if transition is not None and self.on_state_change is not None:
+            self.on_state_change(self, *transition)
+
+    def _should_open(self):
+        if len(self._outcomes) < self.minimum_calls:
+            return False
+
+        failed = sum(1 for failed, _ in self._outcomes if failed)
+        slow = sum(1 for _, slow in self._outcomes if slow)
+        total = len(self._outcomes)
+
+        return failed / total >= self.failure_rate_threshold or \
+            (self.slow_call_duration is not None and
+             slow / total >= self.slow_call_rate_threshold)
+
+    def allow_request(self):
+        """Acquire a permission to execute a call
+
+        Every permitted call must be followed by a call to record.
+
+        :rtype: boolean
+        :return: True if the call is permitted
+        """
+        transition = None
+
+        with self._lock:
+            if self._state == OPEN and \
+                    time.monotonic() - self._opened_at >= self.reset_timeout:
+                transition = self._transition(HALF_OPEN)
+
+            if self._state == CLOSED:
+                allowed = True
+            elif self._state == HALF_OPEN and \
+                    self._half_open_calls < self.half_open_max_calls:
+                self._half_open_calls += 1
+                allowed = True
+            else:
+                self.rejected_calls += 1
+                allowed = False
+
+        self._notify(transition)
+
+        return allowed
+
+    def release(self):
+        """Release the permission of a call that was not completed"""
+        with self._lock:
+            if self._state == HALF_OPEN and self._half_open_calls > 0:
+                self._half_open_calls -= 1
+
+    def record(self, failed, duration):
+        """Record the outcome of a permitted call
+
+        :param boolean failed: flag that indicates whether the call failed
+        :param float duration: the call duration in seconds
+        """
+        slow = self.slow_call_duration is not None and \
+            duration >= self.slow_call_duration
+        transition = None
+
+        with self._lock:
+            self.calls += 1
+            self.failed_calls += failed
+            self.slow_calls += slow
+
+            if self._state == HALF_OPEN:
+                if failed or slow:
+                    transition = self._transition(OPEN)
+                else:
+                    self._half_open_successes += 1
+                    if self._half_open_successes >= self.half_open_max_calls:
+                        transition = self._transition(CLOSED)
+            elif self._state == CLOSED:
+                self._outcomes.append((failed, slow))
+                if self._should_open():
+                    transition = self._transition(OPEN)
+
+        self._notify(transition)
+
+    def _create_open_error(self, request):
+        return CircuitOpenError(
+            reason="the circuit breaker is open",
+            base_url=request.base_url,
+            method=request.method,
+            endpoint=request.endpoint
+        )
+
+    def call(self, request):
+        """Execute a request through the circuit breaker
+
+        :param APIRequest request: the request to execute
+        :rtype: Response
+        :return: the request result
+        """
+        if not self.allow_request():
+            raise self._create_open_error(request)
+
+        start = time.monotonic()
+        try:
+            response = request.execute()
+        except Exception as e:
+            # any error other than a request execution error means that the
+            # upstream has responded
+            self.record(
+                isinstance(e, RequestExecutionError),
+                time.monotonic() - start
+            )
+            raise
+        except BaseException:
+            self.release()
+            raise
+
+        self.record(response.status_code >= 500, time.monotonic() - start)
+
+        return response
+
+    async def call_async(self, request):
+        """Execute an asynchronous request through the circuit breaker
+
+        :param AsyncAPIRequest request: the request to execute
+        :rtype: Response
+        :return: the request result
+        """
+        if not self.allow_request():
+            raise self._create_open_error(request)
+
+        start = time.monotonic()
+        try:
+            response = await request.execute()
+        except Exception as e:
+            # any error other than a request execution error means that the
+            # upstream has responded
+            self.record(
+                isinstance(e, RequestExecutionError),
+                time.monotonic() - start
+            )
+            raise
+        except BaseException:
+            self.release()
+            raise
+
+        self.record(response.status_code >= 500, time.monotonic() - start)
+
+        return response
+
+
+class CircuitBreakerRegistry(object):
+    """Collection of circuit breakers, one per base url and endpoint"""
+
+    def __init__(self, **kwargs):
+        """Create a new CircuitBreakerRegistry object
+
+        :param kwargs: the arguments that are used to create the circuit
+        breakers. See CircuitBreaker for the available arguments
+        """
+        self._kwargs = kwargs
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def get(self, base_url, endpoint):
+        """Get the circuit breaker of an endpoint
+
+        :param str base_url: the api base url
+        :param str endpoint: the endpoint path template
+        :rtype: CircuitBreaker
+        :return: the circuit breaker
+        """
+        key = (base_url, endpoint)
+
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    name="{}{}".format(base_url, endpoint), **self._kwargs)
+                self._breakers[key] = breaker
+
+            return breaker
+
+    def __iter__(self):
+        with self._lock:
+            return iter(list(self._breakers.values()))
@@ -1,22 +1,232 @@
 from abc import ABCMeta
 
 from requests import Session
+from requests.adapters import HTTPAdapter, DEFAULT_POOLSIZE
+
+from clientlib.compression import DEFAULT_HEADERS
+from clientlib.concurrency import execute_concurrently
+from clientlib.instrumentation import NO_INSTRUMENTATION
+from clientlib.json_codecs import StdlibJSONCodec
+from clientlib.transports import RequestsTransport
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
 
 
 class Client(metaclass=ABCMeta):
     """Client base class"""
 
-    def __init__(self, base_url, auth=None, timeout=5, verify=True):
+    def __init__(self, base_url, auth=None, timeout=5, verify=True,
+                 pool_connections=DEFAULT_POOLSIZE,
+                 pool_maxsize=DEFAULT_POOLSIZE, pool_block=False, cache=None,
+                 retry_policy=None, circuit_breakers=None, rate_limiter=None,
+                 json_codec=None, single_flight=None, instrumentation=None,
+                 transport=None, compression=None, process_pool=None,
+                 hedging_policy=None):
         """Create a new Client object
 
+        The client owns a pooled session whose connections are kept alive
+        between endpoint calls. Use the client as a context manager or call
+        close when it is no longer needed in order to release them.
+
+        :param str base_url: the APi base url
+        :param AuthBase auth: the authenticator object
+        :param int|float|tuple|Timeout timeout: the request timeout, a
+        (connect, read) tuple or a Timeout object with separate connect, read
+        and deadline timeouts, for example an AdaptiveTimeout
+        :param boolean verify: flag that indicates whether to verify ssl or not
+        :param int pool_connections: the number of host connection pools to
+        keep
+        :param int pool_maxsize: the maximum number of connections to keep in
+        the pool of each host
+        :param boolean pool_block: flag that indicates whether to block when
+        no free connections are available in a host pool
+        :param ResponseCache cache: the response cache to use for the GET
+        endpoints of the client
+        :param RetryPolicy retry_policy: the retry policy of the endpoints
+        :param CircuitBreakerRegistry circuit_breakers: the circuit breakers
+        of the endpoints
+        :param TokenBucketRateLimiter rate_limiter: the rate limiter that is
+        shared by all the endpoints
+        :param JSONCodec json_codec: the codec of the request and response
+        bodies. The json module of the standard library is used when this is
+        None
+        :param SingleFlight single_flight: the object that coalesces the
+        identical concurrent GET and HEAD requests of the endpoints
+        :param Instrumentation instrumentation: the instrumentation that the
+        request metrics of the endpoints are reported to. Nothing is recorded
+        when this is None
+        :param Transport transport: the transport to send the requests with,
+        for example an HTTP2Transport. The requests are sent with the pooled
+        session of the client when this is None
+        :param Compression compression: the compression settings of the
+        endpoints. The responses are requested uncompressed when this is None
+        :param ProcessPoolDeserializer process_pool: the process pool that
+        deserializes the large responses of the endpoints. The pool is not
+        closed with the client, since it can be shared by many clients
+        :param HedgingPolicy hedging_policy: the policy that hedges the slow
+        requests of the idempotent endpoints
+        """
+        self.base_url = base_url
+        self.auth = auth
+        self.timeout = timeout
+        self.verify = verify
+        self.cache = cache
+        self.retry_policy = retry_policy
+        self.circuit_breakers = circuit_breakers
+        self.rate_limiter = rate_limiter
+        self.json_codec = json_codec or StdlibJSONCodec()
+        self.single_flight = single_flight
+        self.instrumentation = instrumentation or NO_INSTRUMENTATION
+        self.compression = compression
+        self.process_pool = process_pool
+        self.hedging_policy = hedging_policy
+
+        self.session = self._create_session(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block
+        )
+        self.transport = transport or RequestsTransport(self.session)
+
+    def _create_session(self, pool_connections, pool_maxsize, pool_block):
+        session = Session()
+
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        return session
+
+    def gather(self, calls, concurrency=DEFAULT_POOLSIZE, ordered=True):
+        """Execute calls to different endpoints concurrently
+
+        :param calls: an iterable of (endpoint, kwargs) tuples, for example
+        ``[(client.post, {"post_id": 1}), (client.posts, {})]``
+        :param int concurrency: the maximum number of concurrent requests.
+        This should not exceed the pool_maxsize of the client
+        :param boolean ordered: yield the results in the order of the calls
+        when True, or as soon as they complete when False
+        :rtype: collections.Iterable[BatchResult]
+        :return: the request results
+        """
+        return execute_concurrently(
+            calls=calls, concurrency=concurrency, ordered=ordered)
+
+    def close(self):
+        """Close the client and release the pooled connections"""
+        self.transport.close()
+
+        # a custom transport doesn't close the session of the client
+        if not self._uses_session_transport():
+            self.session.close()
+
+    def _uses_session_transport(self):
+        return isinstance(self.transport, RequestsTransport) and \
+            self.transport.session is self.session
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class AsyncClient(metaclass=ABCMeta):
+    """Asynchronous client base class
+
+    The endpoints that are declared on an asynchronous client return
+    awaitables. The requests are executed using an httpx.AsyncClient session
+    which maintains its own connection pool.
+    """
+
+    def __init__(self, base_url, auth=None, timeout=5, verify=True,
+                 max_connections=100, max_keepalive_connections=20,
+                 cache=None, retry_policy=None, circuit_breakers=None,
+                 rate_limiter=None, json_codec=None, single_flight=None,
+                 instrumentation=None, http2=False, compression=None,
+                 process_pool=None, hedging_policy=None):
+        """Create a new AsyncClient object
+
         :param str base_url: the APi base url
         :param AuthBase auth: the authenticator object
-        :param int timeout: the request timeout
+        :param int|float|tuple|Timeout timeout: the request timeout, a
+        (connect, read) tuple or a Timeout object with separate connect, read
+        and deadline timeouts, for example an AdaptiveTimeout
         :param boolean verify: flag that indicates whether to verify ssl or not
+        :param int max_connections: the maximum number of concurrent
+        connections
+        :param int max_keepalive_connections: the maximum number of idle
+        connections to keep in the pool
+        :param ResponseCache cache: the response cache to use for the GET
+        endpoints of the client
+        :param RetryPolicy retry_policy: the retry policy of the endpoints
+        :param CircuitBreakerRegistry circuit_breakers: the circuit breakers
+        of the endpoints
+        :param TokenBucketRateLimiter rate_limiter: the rate limiter that is
+        shared by all the endpoints
+        :param JSONCodec json_codec: the codec of the request and response
+        bodies. The json module of the standard library is used when this is
+        None
+        :param AsyncSingleFlight single_flight: the object that coalesces the
+        identical concurrent GET and HEAD requests of the endpoints
+        :param Instrumentation instrumentation: the instrumentation that the
+        request metrics of the endpoints are reported to. Nothing is recorded
+        when this is None
+        :param boolean http2: flag that indicates whether to use HTTP/2. The
+        concurrent requests to a host are then multiplexed over a single
+        connection. This requires the http2 extra of httpx
+        :param Compression compression: the compression settings of the
+        endpoints. The responses are requested uncompressed when this is None
+        :param ProcessPoolDeserializer process_pool: the process pool that
+        deserializes the large responses of the endpoints. The pool is not
+        closed with the client, since it can be shared by many clients
+        :param HedgingPolicy hedging_policy: the policy that hedges the slow
+        requests of the idempotent endpoints
         """
+        if httpx is None:
+            raise ImportError("httpx is required in order to use AsyncClient")
+
         self.base_url = base_url
         self.auth = auth
         self.timeout = timeout
         self.verify = verify
+        self.cache = cache
+        self.retry_policy = retry_policy
+        self.circuit_breakers = circuit_breakers
+        self.rate_limiter = rate_limiter
+        self.json_codec = json_codec or StdlibJSONCodec()
+        self.single_flight = single_flight
+        self.instrumentation = instrumentation or NO_INSTRUMENTATION
+        self.compression = compression
+        self.process_pool = process_pool
+        self.hedging_policy = hedging_policy
+
+        # the redirects are followed and the default headers are set like
+        # they are by the synchronous clients
+        self.session = httpx.AsyncClient(
+            http2=http2,
+            verify=verify,
+            follow_redirects=True,
+            headers=DEFAULT_HEADERS,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections
+            )
+        )
+
+    async def close(self):
+        """Close the client and release the pooled connections"""
+        await self.session.aclose()
+
+    async def __aenter__(self):
+        return self
 
-        self.session = Session()
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
@@ -0,0 +1,171 @@
+import asyncio
+import threading
+from functools import partial
+from urllib.parse import urlencode
+
+from clientlib.exceptions import DeadlineExceeded
+from clientlib.timeouts import get_remaining_time
+
+
+COALESCABLE_METHODS = frozenset(["GET", "HEAD"])
+
+
+def create_coalescing_key(method, url, params, auth, headers=None):
+    """Create the key that identifies identical requests
+
+    :param str method: the http method
+    :param str url: the rendered request url
+    :param dict params: the url parameters
+    :param AuthBase auth: the authenticator object
+    :param dict headers: additional request headers
+    :rtype: tuple
+    :return: the key
+    """
+    return (
+        method,
+        url,
+        urlencode(sorted((params or {}).items()), doseq=True),
+        auth,
+        frozenset((headers or {}).items())
+    )
+
+
+def _create_deadline_error():
+    return DeadlineExceeded(
+        reason="the deadline was exceeded while waiting for an identical "
+               "request"
+    )
+
+
+class _Call(object):
+    """In flight call that is shared by the identical concurrent calls"""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """Executes identical concurrent calls once
+
+    The first caller of a key executes the call and the callers that arrive
+    while it is in flight wait for it and receive the same result, or the
+    same exception. The results are not kept after the call completes. The
+    callers that wait don't wait beyond the deadline of their operation.
+    """
+
+    def __init__(self):
+        """Create a new SingleFlight object"""
+        self._lock = threading.Lock()
+        self._calls = {}
+
+        self.calls = 0
+        self.coalesced_calls = 0
+
+    def execute(self, key, function):
+        """Execute a call or wait for the identical call that is in flight
+
+        :param tuple key: the key of the call
+        :param callable function: the function that executes the call
+        :return: the result of the function
+        :raises DeadlineExceeded: if the deadline of the current operation
+        is exceeded while waiting for the identical call
+        """
+        with self._lock:
+            self.calls += 1
+
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                leader = True
+            else:
+                self.coalesced_calls += 1
+                leader = False
+
+        if not leader:
+            remaining = get_remaining_time()
+            if remaining is not None and remaining <= 0:
+                raise _create_deadline_error()
+
+            if not call.done.wait(remaining):
+                raise _create_deadline_error()
+
+            if call.error is not None:
+                raise call.error
+
+            return call.result
+
+        try:
+            call.result = function()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+            call.done.set()
+
+        return call.result
+
+
+class AsyncSingleFlight(object):
+    """Executes identical concurrent coroutine calls once
+
+    This is the asyncio counterpart of SingleFlight. The callers that arrive
+    while a call is in flight await the same future. It must be used by a
+    single event loop.
+    """
+
+    def __init__(self):
+        """Create a new AsyncSingleFlight object"""
+        self._futures = {}
+
+        self.calls = 0
+        self.coalesced_calls = 0
+
+    async def execute(self, key, function):
+        """Execute a call or await the identical call that is in flight
+
+        :param tuple key: the key of the call
+        :param callable function: the coroutine function that executes the
+        call
+        :return: the result of the coroutine
+        :raises DeadlineExceeded: if the deadline of the current operation
+        is exceeded while waiting for the identical call
+        """
+        self.calls += 1
+
+        future = self._futures.get(key)
+        if future is not None:
+            self.coalesced_calls += 1
+
+            return await self._wait(future)
+
+        future = asyncio.ensure_future(function())
+        self._futures[key] = future
+        future.add_done_callback(partial(self._remove, key))
+
+        return await asyncio.shield(future)
+
+    async def _wait(self, future):
+        remaining = get_remaining_time()
+        if remaining is not None and remaining <= 0:
+            raise _create_deadline_error()
+
+        # a cancelled waiter must not cancel the shared call
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), remaining)
+        except asyncio.TimeoutError as e:
+            raise _create_deadline_error() from e
+
+    def _remove(self, key, future):
+        if self._futures.get(key) is future:
+            del self._futures[key]
+
+        # retrieve the exception, since every caller may have been cancelled
+        if not future.cancelled():
+            future.exception()
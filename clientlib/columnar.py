@@ -0,0 +1,184 @@
+from array import array
+from collections import namedtuple
+from collections.abc import Sequence
+
+from marshmallow import fields
+from marshmallow.exceptions import ValidationError
+
+from clientlib.deserialization import (
+    generate_field_loader, is_compilable_schema
+)
+
+
+INTERN_MAX_LENGTH = 64
+
+ARRAY_TYPECODES = {
+    fields.Integer: "q",
+    fields.Float: "d",
+}
+
+
+class _Column(object):
+    """Column builder
+
+    The values of numeric fields are stored in typed arrays. The column is
+    converted to a list if a value doesn't fit in the array, for example
+    because it is None. Short strings are interned per column, so that the
+    repeated values are stored once.
+    """
+
+    __slots__ = ("values", "_interned")
+
+    def __init__(self, typecode=None):
+        self.values = array(typecode) if typecode is not None else []
+        self._interned = {}
+
+    def append(self, value):
+        if type(value) is str and len(value) <= INTERN_MAX_LENGTH:
+            value = self._interned.setdefault(value, value)
+
+        try:
+            self.values.append(value)
+        except (TypeError, OverflowError):
+            self.values = list(self.values)
+            self.values.append(value)
+
+
+class ColumnarResult(Sequence):
+    """Compact container for a list of deserialized objects
+
+    The fields of the objects are stored column-wise. Indexing or iterating
+    the result returns row objects, namedtuples with the deserialized
+    fields, which are created on access.
+    """
+
+    def __init__(self, columns, length):
+        """Create a new ColumnarResult object
+
+        :param dict[str, list|array] columns: the values of each field
+        :param int length: the number of rows
+        """
+        self._columns = columns
+        self._length = length
+        self.row_class = namedtuple("Row", list(columns), rename=True)
+        self._column_values = tuple(columns.values())
+
+    @property
+    def column_names(self):
+        """The names of the columns
+
+        :rtype: list[str]
+        """
+        return list(self._columns)
+
+    def column(self, name):
+        """Get the values of a field
+
+        :param str name: the field name
+        :rtype: list|array
+        :return: the values of the field. Numeric fields are returned as
+        typed arrays
+        """
+        return self._columns[name]
+
+    def _get_row(self, index):
+        return self.row_class._make(
+            values[index] for values in self._column_values)
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [
+                self._get_row(i) for i in range(*index.indices(self._length))
+            ]
+
+        if index < 0:
+            index += self._length
+
+        if not 0 <= index < self._length:
+            raise IndexError("result index out of range")
+
+        return self._get_row(index)
+
+    def __iter__(self):
+        row_class = self.row_class
+
+        for values in zip(*self._column_values):
+            yield row_class._make(values)
+
+    def __reduce__(self):
+        # the row class is created dynamically, so only the columns are
+        # pickled
+        return ColumnarResult, (self._columns, self._length)
+
+    def __repr__(self):
+        return "<ColumnarResult {} rows, columns {}>".format(
+            self._length, self.column_names)
+
+
+class ColumnarLoader(object):
+    """Loader that deserializes a list of objects to a ColumnarResult
+
+    The fields are deserialized and validated with the schema, but its
+    post_load hooks are not executed, since the rows are not stored as
+    objects.
+    """
+
+    def __init__(self, schema):
+        """Create a new ColumnarLoader object
+
+        :param Schema schema: the schema of the objects
+        """
+        self.schema = schema
+        self._attributes = [
+            (field.attribute or name, type(field))
+            for name, field in schema.load_fields.items()
+        ]
+
+        self._load_fields = None
+        if is_compilable_schema(schema):
+            self._load_fields = generate_field_loader(schema)
+
+    def _load_row(self, index, item):
+        if self._load_fields is not None:
+            try:
+                return self._load_fields(item)
+            except ValidationError:
+                pass
+
+        try:
+            return self.schema._do_load(
+                item, many=False, partial=None, postprocess=False)
+        except ValidationError as e:
+            raise ValidationError({index: e.messages}) from e
+
+    def load(self, data):
+        """Deserialize a list of objects
+
+        :param list data: the objects to deserialize
+        :raises ValidationError: if the objects are not valid
+        :rtype: ColumnarResult
+        :return: the deserialized objects
+        """
+        if not isinstance(data, list):
+            raise ValidationError({"_schema": ["Invalid input type."]})
+
+        columns = [
+            (attribute, _Column(ARRAY_TYPECODES.get(field_class)))
+            for attribute, field_class in self._attributes
+        ]
+
+        for index, item in enumerate(data):
+            row = self._load_row(index, item)
+
+            for attribute, column in columns:
+                column.append(row.get(attribute))
+
+        return ColumnarResult(
+            columns={
+                attribute: column.values for attribute, column in columns
+            },
+            length=len(data)
+        )
@@ -0,0 +1,81 @@
+import gzip
+
+from urllib3.util.request import ACCEPT_ENCODING
+
+
+# the headers of the requests without compression settings. The requests
+# sessions ask for uncompressed responses and the httpx sessions are
+# configured to do the same, so that every transport sends the same headers
+DEFAULT_HEADERS = {
+    "Accept-Encoding": "identity"
+}
+
+
+def get_available_encodings():
+    """Get the content encodings that the responses can be decoded from
+
+    gzip and deflate are always available, while br and zstd depend on the
+    installed compression libraries.
+
+    :rtype: list[str]
+    :return: the content encodings
+    """
+    return ACCEPT_ENCODING.split(",")
+
+
+class Compression(object):
+    """Compression settings of the requests and responses
+
+    The responses are decoded incrementally while the body is read, so
+    streamed responses are decompressed chunk by chunk.
+    """
+
+    def __init__(self, encodings=None, request_threshold=None,
+                 compression_level=6):
+        """Create a new Compression object
+
+        :param list[str] encodings: the content encodings to advertise in the
+        Accept-Encoding header, in order of preference. All the available
+        encodings are advertised when this is None
+        :param int request_threshold: the minimum size in bytes of the
+        request bodies that are compressed with gzip. The request bodies are
+        not compressed when this is None
+        :param int compression_level: the gzip compression level of the
+        request bodies
+        """
+        available_encodings = get_available_encodings()
+
+        if encodings is None:
+            encodings = available_encodings
+
+        unsupported_encodings = set(encodings) - set(available_encodings)
+        if unsupported_encodings:
+            raise ValueError("unsupported content encodings {}".format(
+                sorted(unsupported_encodings)))
+
+        self.encodings = list(encodings)
+        self.request_threshold = request_threshold
+        self.compression_level = compression_level
+
+        self.headers = {
+            "Accept-Encoding": ", ".join(self.encodings) or "identity"
+        }
+
+    def should_compress(self, body):
+        """Check if a request body must be compressed
+
+        :param bytes body: the request body
+        :rtype: boolean
+        :return: True if the body must be compressed
+        """
+        return self.request_threshold is not None \
+            and len(body) >= self.request_threshold
+
+    def compress(self, body):
+        """Compress a request body with gzip
+
+        :param bytes body: the request body
+        :rtype: bytes
+        :return: the compressed body
+        """
+        return gzip.compress(body, compresslevel=self.compression_level)
@@ -0,0 +1,86 @@
+from collections import deque
+from concurrent.futures import (
+    ThreadPoolExecutor, wait, FIRST_COMPLETED
+)
+from contextvars import copy_context
+
+from clientlib.exceptions import EndpointError
+from clientlib.models import BatchResult
+
+
+def _execute_call(function, kwargs):
+    try:
+        response = function(**kwargs)
+    except EndpointError as e:
+        return BatchResult(kwargs=kwargs, response=None, error=e)
+
+    return BatchResult(kwargs=kwargs, response=response, error=None)
+
+
+def _submit(executor, function, kwargs):
+    # the calls are executed with the context of the caller, so that the
+    # deadline of the current operation applies to them
+    return executor.submit(copy_context().run, _execute_call, function, kwargs)
+
+
+def _cancel(futures):
+    for future in futures:
+        future.cancel()
+
+
+def _iter_ordered(executor, calls, max_pending):
+    pending = deque()
+
+    try:
+        for function, kwargs in calls:
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+
+            pending.append(_submit(executor, function, kwargs))
+
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        _cancel(pending)
+
+
+def _iter_completed(executor, calls, max_pending):
+    pending = set()
+
+    try:
+        for function, kwargs in calls:
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                while done:
+                    yield done.pop().result()
+
+            pending.add(_submit(executor, function, kwargs))
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            while done:
+                yield done.pop().result()
+    finally:
+        _cancel(pending)
+
+
+def execute_concurrently(calls, concurrency=10, ordered=True):
+    """Execute many endpoint calls on a bounded thread pool
+
+    The calls are consumed lazily and at most twice the concurrency number of
+    calls are in flight or waiting for their result to be consumed, so the
+    memory usage stays flat even for very large inputs. Endpoint errors are
+    collected in the results and do not abort the remaining calls.
+
+    :param calls: an iterable of (callable, kwargs) tuples
+    :param int concurrency: the maximum number of concurrent calls
+    :param boolean ordered: yield the results in the order of the calls
+    when True, or as soon as they complete when False
+    :rtype: collections.Iterable[BatchResult]
+    :return: the call results
+    """
+    iterate = _iter_ordered if ordered else _iter_completed
+    max_pending = 2 * concurrency
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        yield from iterate(executor, calls, max_pending)
@@ -0,0 +1,295 @@
+import random
+
+from marshmallow import RAISE, INCLUDE, fields
+from marshmallow.exceptions import ValidationError
+from marshmallow.utils import missing
+
+
+SUPPORTED_HOOKS = ("post_load",)
+
+
+class _Deoptimize(ValidationError):
+    """Raised by a compiled loader when the input needs the full schema"""
+
+    def __init__(self):
+        super(_Deoptimize, self).__init__("the schema must load the data")
+
+
+def _is_compilable_field(name, field):
+    attribute = field.attribute or name
+
+    return "." not in attribute
+
+
+def is_compilable_schema(schema):
+    """Check if a loader can be compiled for a schema
+
+    The schemas that use pre_load hooks, schema or field validation hooks,
+    post_load hooks that need the original data, partial loading or dotted
+    field attributes are not supported.
+
+    :param Schema schema: the schema to check
+    :rtype: boolean
+    :return: True if the schema can be compiled
+    """
+    for tag, hooks in schema._hooks.items():
+        if hooks and tag not in SUPPORTED_HOOKS:
+            return False
+
+    for _, _, hook_kwargs in schema._hooks["post_load"]:
+        if hook_kwargs.get("pass_original", False):
+            return False
+
+    if schema.partial:
+        return False
+
+    return all(
+        _is_compilable_field(name, field)
+        for name, field in schema.load_fields.items()
+    )
+
+
+def _create_fast_path(field, variable):
+    # the fast paths only accept the values that the field would return
+    # unchanged. Every other value goes through field.deserialize
+    if field.validators:
+        return None
+
+    field_class = type(field)
+
+    if field_class is fields.Integer:
+        return "type(v) is int", "v"
+
+    if field_class is fields.Float:
+        if field.allow_nan:
+            return "type(v) is float", "v"
+
+        # v - v is nan for both inf and nan
+        return "type(v) is float and v - v == 0.0", "v"
+
+    if field_class in (fields.String, fields.Str):
+        return "type(v) is str", "v"
+
+    if field_class is fields.Boolean:
+        if field.truthy and True not in field.truthy:
+            return None
+
+        if field.falsy and False not in field.falsy:
+            return None
+
+        return "v is True or v is False", "v"
+
+    if field_class is fields.Raw:
+        return "v is not None", "v"
+
+    if field_class is fields.Nested and not isinstance(field.nested, str) \
+            and field.unknown is None \
+            and is_compilable_schema(field.schema):
+        if field.schema.many:
+            return "type(v) is list", "{}.load_many(v)".format(variable)
+
+        return "type(v) is dict", "{}.load_one(v)".format(variable)
+
+    return None
+
+
+def generate_field_loader(schema):
+    """Generate the function that deserializes the fields of an object
+
+    The post_load hooks of the schema are not executed by the function.
+
+    :param Schema schema: a schema for which is_compilable_schema is True
+    :rtype: callable
+    :return: a function that accepts the raw object and returns the dict of
+    the deserialized fields. It raises a ValidationError for the objects that
+    have to be loaded by the schema
+    """
+    namespace = {
+        "_Deoptimize": _Deoptimize,
+        "_missing": missing,
+        "_dict_class": schema.dict_class,
+        "_known": frozenset(
+            field.data_key if field.data_key is not None else name
+            for name, field in schema.load_fields.items()
+        )
+    }
+
+    lines = [
+        "def load_fields(data):",
+        "    if type(data) is not dict:",
+        "        raise _Deoptimize()",
+    ]
+
+    if schema.unknown == RAISE:
+        lines += [
+            "    if not _known.issuperset(data):",
+            "        raise _Deoptimize()",
+        ]
+
+    if schema.dict_class is dict:
+        lines.append("    r = {}")
+    else:
+        lines.append("    r = _dict_class()")
+
+    for index, (name, field) in enumerate(schema.load_fields.items()):
+        data_key = field.data_key if field.data_key is not None else name
+        attribute = field.attribute or name
+
+        field_variable = "_field_{}".format(index)
+        namespace[field_variable] = field
+
+        loader_variable = "_loader_{}".format(index)
+        fast_path = _create_fast_path(field, loader_variable)
+        if isinstance(field, fields.Nested) and fast_path is not None:
+            namespace[loader_variable] = CompiledSchema(field.schema)
+
+        lines.append("    v = data.get({!r}, _missing)".format(data_key))
+
+        indent = "    "
+        if fast_path is not None:
+            condition, value = fast_path
+            lines += [
+                "    if {}:".format(condition),
+                "        r[{!r}] = {}".format(attribute, value),
+                "    else:",
+            ]
+            indent = "        "
+
+        lines += [
+            "{}v = {}.deserialize(v, {!r}, data)".format(
+                indent, field_variable, data_key),
+            "{}if v is not _missing:".format(indent),
+            "{}    r[{!r}] = v".format(indent, attribute),
+        ]
+
+    if schema.unknown == INCLUDE:
+        lines += [
+            "    for key in data:",
+            "        if key not in _known:",
+            "            r[key] = data[key]",
+        ]
+
+    lines.append("    return r")
+
+    exec("\n".join(lines), namespace)
+
+    return namespace["load_fields"]
+
+
+class CompiledSchema(object):
+    """Marshmallow schema with a compiled loader
+
+    The loader is generated once from the schema fields. It checks the types
+    of the values and builds the result of the post_load hooks without the
+    per field machinery of Schema.load. The values that don't match the
+    type that a field expects are deserialized by the field itself and, if
+    the input is invalid, the full Schema.load is executed in order to raise
+    the same ValidationError.
+
+    The object can be used as the response_schema of an endpoint.
+    """
+
+    def __init__(self, schema, validation_sample_rate=0.0):
+        """Create a new CompiledSchema object
+
+        :param Schema schema: the schema to compile
+        :param float validation_sample_rate: the fraction of the loads that
+        are executed with the full Schema.load instead of the compiled loader
+        """
+        self.schema = schema
+        self.validation_sample_rate = validation_sample_rate
+        self.many = schema.many
+        self.compiled = is_compilable_schema(schema)
+
+        if self.compiled:
+            self._load_fields = generate_field_loader(schema)
+            self._post_load_many = self._get_post_load_hooks(pass_many=True)
+            self._post_load = self._get_post_load_hooks(pass_many=False)
+
+    def _get_post_load_hooks(self, pass_many):
+        return [
+            getattr(self.schema, name)
+            for name, hook_many, _ in self.schema._hooks["post_load"]
+            if hook_many == pass_many
+        ]
+
+    def load_one(self, data):
+        """Deserialize a single object with the compiled loader
+
+        :param dict data: the object to deserialize
+        :raises ValidationError: if the compiled loader can't load the data
+        """
+        partial = self.schema.partial
+        result = self._load_fields(data)
+
+        for hook in self._post_load_many:
+            result = hook(result, many=False, partial=partial)
+
+        for hook in self._post_load:
+            result = hook(result, many=False, partial=partial)
+
+        return result
+
+    def load_many(self, data):
+        """Deserialize a list of objects with the compiled loader
+
+        :param list data: the objects to deserialize
+        :raises ValidationError: if the compiled loader can't load the data
+        """
+        if type(data) is not list:
+            raise _Deoptimize()
+
+        partial = self.schema.partial
+        load_fields = self._load_fields
+        result = [load_fields(item) for item in data]
+
+        for hook in self._post_load_many:
+            result = hook(result, many=True, partial=partial)
+
+        for hook in self._post_load:
+            result = [
+                hook(item, many=True, partial=partial) for item in result
+            ]
+
+        return result
+
+    def _should_validate(self):
+        return self.validation_sample_rate > 0 \
+            and random.random() < self.validation_sample_rate
+
+    def load(self, data, many=None):
+        """Deserialize the data
+
+        :param dict|list data: the data to deserialize
+        :param boolean many: whether the data is a list of objects. The many
+        attribute of the schema is used when this is None
+        :raises ValidationError: if the data is not valid
+        :return: the deserialized data
+        """
+        many = self.many if many is None else many
+
+        if not self.compiled or self._should_validate():
+            return self.schema.load(data, many=many)
+
+        try:
+            if many:
+                return self.load_many(data)
+
+            return self.load_one(data)
+        except ValidationError:
+            return self.schema.load(data, many=many)
+
+
+def compile_schema(schema, validation_sample_rate=0.0):
+    """Compile the loader of a schema
+
+    The schemas that can't be compiled are loaded with Schema.load.
+
+    :param Schema schema: the schema to compile
+    :param float validation_sample_rate: the fraction of the loads that are
+    validated with the full Schema.load
+    :rtype: CompiledSchema
+    :return: the compiled schema
+    """
+    return CompiledSchema(
+        schema, validation_sample_rate=validation_sample_rate)
@@ -1,33 +1,118 @@
 import logging
+from functools import partial
+from time import perf_counter
+from urllib.parse import urlencode
+
 from marshmallow.exceptions import ValidationError
 
-from clientlib.functions import Function
+from clientlib.batching import Batcher, AsyncBatcher
+from clientlib.caching import CACHEABLE_METHODS
+from clientlib.clients import AsyncClient
+from clientlib.columnar import ColumnarLoader
+from clientlib.concurrency import execute_concurrently
+from clientlib.functions import Function, AsyncFunction
+from clientlib.instrumentation import NO_INSTRUMENTATION
+from clientlib.lazy import (
+    LazyList, LazyEndpointResponse, can_load_items_lazily
+)
 from clientlib.exceptions import (
-    ExecutionError, ResponseDeserializationError, PayloadSerializationError
+    ExecutionError, ResponseDeserializationError, PayloadSerializationError,
+    EndpointDeclarationError, InvalidResponseContentType
 )
-from clientlib.models import EndpointResponse
+from clientlib.models import EndpointResponse, BatchResult
+from clientlib.pagination import iter_pages, aiter_pages
+from clientlib.process_pool import DeferredJSON
+from clientlib.timeouts import deadline_at, get_expiry
+from clientlib.urls import URLTemplate
 
 
 logger = logging.getLogger(__name__)
 
+_MISSING = object()
+
+
+def _get_instrumentation(function):
+    # the functions that don't report metrics don't need an instrumentation
+    return getattr(function, "instrumentation", NO_INSTRUMENTATION)
+
 
 class Endpoint(object):
     """Endpoint declaration class"""
 
     def __init__(self, method, endpoint, args=None, params=None, payload=None,
                  requires_auth=True, response_schema=None,
-                 payload_schema=None):
+                 payload_schema=None, cache=None, stream=False,
+                 pagination=None, retry_policy=None, circuit_breakers=None,
+                 rate_limiter=None, lazy=False, columnar=False,
+                 single_flight=None, compression=None, process_pool=None,
+                 timeout=None, hedging_policy=None):
         """Create a new Endpoint object
 
         :param str method: the http method to use
-        :param str endpoint: the endpoint
-        :param list[str] args: the endpoint address arguments
+        :param str endpoint: the endpoint path template. The argument values
+        are percent encoded when they are placed in the path
+        :param list[str] args: the endpoint address arguments. These must
+        match the placeholders of the endpoint path template
         :param list[str] params: the endpoint url arguments
         :param str payload: the endpoint payload
         :param boolean requires_auth: indicator flag that is used to specify
         if the endpoint requires authentication
-        :param Schema response_schema: the expected response schema
+        :param Schema|CompiledSchema response_schema: the expected response
+        schema. Use compile_schema in order to load large responses with a
+        compiled loader
         :param Schema payload_schema: the payload schema
+        :param ResponseCache|boolean cache: the response cache to use. The
+        cache of the client is used when this is None and caching is
+        disabled when this is False. Only GET and HEAD requests are cached
+        :param boolean stream: flag that indicates whether to stream the
+        response. The response body must be a json array. The array items are
+        decoded incrementally and the response data is an iterator that
+        yields them one at a time, deserialized with the response schema
+        :param Pagination pagination: the pagination specification of the
+        endpoint. The execution of a paginated endpoint returns a lazy
+        iterator over the items of all the pages, deserialized with the
+        response schema. The next page is prefetched while the items of the
+        current page are consumed
+        :param RetryPolicy|boolean retry_policy: the retry policy to use. The
+        retry policy of the client is used when this is None and retries are
+        disabled when this is False
+        :param CircuitBreakerRegistry|boolean circuit_breakers: the circuit
+        breakers to use. The circuit breakers of the client are used when
+        this is None and circuit breaking is disabled when this is False
+        :param TokenBucketRateLimiter|boolean rate_limiter: the rate limiter
+        of the endpoint. The requests must also acquire a token from the rate
+        limiter of the client, unless this is False
+        :param boolean lazy: flag that indicates whether to deserialize the
+        response on the first access of its data. The items of the responses
+        of many=True schemas are deserialized one at a time, when they are
+        accessed. This has no effect on streamed and paginated endpoints
+        :param boolean columnar: flag that indicates whether to store the
+        deserialized items in a compact ColumnarResult instead of a list. The
+        response schema must have many=True. The post_load hooks of the
+        schema are not executed and the rows are namedtuples of the fields
+        :param SingleFlight|AsyncSingleFlight|boolean single_flight: the
+        object that coalesces the identical concurrent GET and HEAD requests
+        of the endpoint. The object of the client is used when this is None
+        and coalescing is disabled when this is False
+        :param Compression|boolean compression: the compression settings of
+        the endpoint. The settings of the client are used when this is None
+        and the compression is disabled when this is False, in which case the
+        responses are requested uncompressed
+        :param ProcessPoolDeserializer|boolean process_pool: the process pool
+        that decodes and deserializes the large responses of the endpoint.
+        The pool of the client is used when this is None and the responses
+        are deserialized inline when this is False. This has no effect on
+        lazy, streamed and paginated endpoints and on the endpoints without a
+        response schema
+        :param int|float|tuple|Timeout timeout: the request timeout of the
+        endpoint, a (connect, read) tuple or a Timeout object. The timeout of
+        the client is used when this is None. The deadline of a Timeout
+        object limits the total time of a call, including its retries, and
+        of the iteration of the pages of a paginated endpoint
+        :param HedgingPolicy|boolean hedging_policy: the policy that hedges
+        the slow requests of the endpoint. The policy of the client is used
+        when this is None and hedging is disabled when this is False. Only
+        the requests of idempotent methods are hedged
         """
         self._method = method
         self._endpoint = endpoint
@@ -37,28 +122,181 @@ class Endpoint(object):
         self._requires_auth = requires_auth
         self._response_schema = response_schema
         self._payload_schema = payload_schema
+        self._cache = cache
+        self._stream = stream
+        self._pagination = pagination
+        self._retry_policy = retry_policy
+        self._circuit_breakers = circuit_breakers
+        self._rate_limiter = rate_limiter
+        self._lazy = lazy
+        self._columnar_loader = self._create_columnar_loader(columnar)
+        self._single_flight = single_flight
+        self._compression = compression
+        self._process_pool = process_pool
+        self._timeout = timeout
+        self._hedging_policy = hedging_policy
+
+        self._name = None
+
+        self._url_template = URLTemplate(endpoint)
+        self._url_template.validate_args(self._args)
 
-        self._function = None
-        self._session = None
+    def _create_columnar_loader(self, columnar):
+        if not columnar:
+            return None
 
-    def _initialize_function(self, obj):
-        self._function = Function(
-            session=self._session,
-            base_url=obj.base_url,
+        # compiled schemas keep the marshmallow schema in the schema attribute
+        schema = getattr(
+            self._response_schema, "schema", self._response_schema)
+
+        if schema is None or not schema.many:
+            raise EndpointDeclarationError(
+                reason="columnar endpoints require a response schema with "
+                       "many=True"
+            )
+
+        return ColumnarLoader(schema)
+
+    def __set_name__(self, owner, name):
+        self._name = name
+
+    def _create_function(self, function_class, client):
+        return function_class(
+            session=client.session,
+            base_url=client.base_url,
             method=self._method,
             endpoint=self._endpoint,
-            auth=obj.auth if self._requires_auth else None,
-            timeout=obj.timeout,
-            verify=obj.verify
+            auth=client.auth if self._requires_auth else None,
+            timeout=self._resolve_timeout(client),
+            verify=client.verify,
+            stream=self._stream,
+            retry_policy=self._resolve_retry_policy(client),
+            circuit_breaker=self._resolve_circuit_breaker(client),
+            rate_limiters=self._resolve_rate_limiters(client),
+            url_template=self._url_template,
+            json_codec=client.json_codec,
+            single_flight=self._resolve_single_flight(client),
+            instrumentation=client.instrumentation,
+            # the asynchronous clients send the requests with their session
+            transport=getattr(client, "transport", None),
+            compression=self._resolve_compression(client),
+            process_pool=self._resolve_process_pool(client),
+            hedging_policy=self._resolve_hedging_policy(client)
+        )
+
+    def _resolve_timeout(self, client):
+        if self._timeout is not None:
+            return self._timeout
+
+        return client.timeout
+
+    def _resolve_retry_policy(self, client):
+        if self._retry_policy is False:
+            return None
+
+        if self._retry_policy is not None:
+            return self._retry_policy
+
+        return client.retry_policy
+
+    def _resolve_single_flight(self, client):
+        if self._single_flight is False:
+            return None
+
+        if self._single_flight is not None:
+            return self._single_flight
+
+        return client.single_flight
+
+    def _resolve_hedging_policy(self, client):
+        if self._hedging_policy is False:
+            return None
+
+        if self._hedging_policy is not None:
+            return self._hedging_policy
+
+        return client.hedging_policy
+
+    def _resolve_compression(self, client):
+        if self._compression is False:
+            return None
+
+        if self._compression is not None:
+            return self._compression
+
+        return client.compression
+
+    def _resolve_process_pool(self, client):
+        if self._process_pool is False or not self._can_deserialize() \
+                or self._lazy or self._stream or self._pagination is not None:
+            return None
+
+        if self._process_pool is not None:
+            return self._process_pool
+
+        return client.process_pool
+
+    def _resolve_circuit_breaker(self, client):
+        if self._circuit_breakers is False:
+            return None
+
+        circuit_breakers = self._circuit_breakers or client.circuit_breakers
+        if circuit_breakers is None:
+            return None
+
+        return circuit_breakers.get(client.base_url, self._endpoint)
+
+    def _resolve_rate_limiters(self, client):
+        if self._rate_limiter is False:
+            return []
+
+        return [
+            rate_limiter
+            for rate_limiter in (self._rate_limiter, client.rate_limiter)
+            if rate_limiter is not None
+        ]
+
+    def _resolve_cache(self, client):
+        if self._method not in CACHEABLE_METHODS or self._cache is False \
+                or self._stream or self._pagination is not None:
+            return None
+
+        return self._cache if self._cache is not None else client.cache
+
+    def bind(self, client):
+        """Bind the endpoint to a client
+
+        :param Client|AsyncClient client: the client object
+        :rtype: BoundEndpoint|AsyncBoundEndpoint
+        :return: the endpoint bound to the client
+        """
+        if isinstance(client, AsyncClient):
+            return AsyncBoundEndpoint(
+                endpoint=self,
+                function=self._create_function(AsyncFunction, client),
+                cache=self._resolve_cache(client)
+            )
+
+        return BoundEndpoint(
+            endpoint=self,
+            function=self._create_function(Function, client),
+            cache=self._resolve_cache(client)
         )
 
     def __get__(self, obj, obj_type):
-        self._session = obj.session
+        if obj is None:
+            return self
+
+        bound_endpoint = self.bind(obj)
 
-        if self._function is None:
-            self._initialize_function(obj)
+        if self._name is None:
+            return bound_endpoint
 
-        return self.execute
+        # the bound endpoint is stored in the instance dictionary, so that
+        # any subsequent attribute access will not go through the descriptor.
+        # dict.setdefault is atomic, so concurrent first accesses will all
+        # receive the same bound endpoint
+        return obj.__dict__.setdefault(self._name, bound_endpoint)
 
     def _can_serialize_payload(self, payload):
         return payload is not None and self._payload_schema is not None
@@ -101,15 +339,43 @@ class Endpoint(object):
     def _can_deserialize(self):
         return self._response_schema is not None
 
-    def _deserialize_response(self, response):
-        if not (200 <= response.status_code < 300):
-            raise ExecutionError(
-                reason="the request was not executed successfully",
-                response=response
+    def _load_deferred(self, response, data):
+        try:
+            return data.load(
+                self._response_schema,
+                columnar=self._columnar_loader is not None
+            )
+        except ValueError as e:
+            logger.exception("failed to convert response content to json")
+
+            raise InvalidResponseContentType(
+                status_code=response.status_code,
+                content=data.content.decode("utf-8", errors="replace")
+            ) from e
+
+    async def _await_deferred(self, response):
+        if not isinstance(response.json, DeferredJSON):
+            return
+
+        try:
+            await response.json.aload(
+                self._response_schema,
+                columnar=self._columnar_loader is not None
             )
+        except (ValueError, ValidationError):
+            # the error is raised again when the response is deserialized
+            pass
 
+    def _load(self, response, data, **kwargs):
         try:
-            deserialized_response = self._response_schema.load(response.json)
+            if isinstance(data, DeferredJSON):
+                return self._load_deferred(response, data)
+
+            if self._columnar_loader is not None \
+                    and kwargs.get("many", True):
+                return self._columnar_loader.load(data)
+
+            return self._response_schema.load(data, **kwargs)
         except ValidationError as e:
             logger.exception("failed to deserialize endpoint response")
 
@@ -119,17 +385,265 @@ class Endpoint(object):
                 errors=e.messages
             ) from e
 
+    def _load_item(self, response, index, item):
+        try:
+            return self._response_schema.load(item, many=False)
+        except ValidationError as e:
+            logger.exception("failed to deserialize endpoint response item")
+
+            raise ResponseDeserializationError(
+                reason="failed to deserialize endpoint response",
+                response=response,
+                errors={index: e.messages}
+            ) from e
+
+    def _create_lazy_endpoint_response(self, response):
+        data = response.json
+
+        if isinstance(data, list) and self._columnar_loader is None \
+                and can_load_items_lazily(self._response_schema):
+            items = LazyList(data, partial(self._load_item, response))
+
+            return LazyEndpointResponse(response, lambda: items)
+
+        return LazyEndpointResponse(
+            response, partial(self._load, response, data))
+
+    def _iter_deserialized_items(self, response):
+        for item in response.json:
+            yield self._load(response, item, many=False)
+
+    async def _aiter_deserialized_items(self, response):
+        async for item in response.json:
+            yield self._load(response, item, many=False)
+
+    def _check_status_code(self, response):
+        if not (200 <= response.status_code < 300):
+            raise ExecutionError(
+                reason="the request was not executed successfully",
+                response=response
+            )
+
+    def _deserialize_response(self, response):
+        self._check_status_code(response)
+
+        if self._lazy and not self._stream:
+            return self._create_lazy_endpoint_response(response)
+
+        if not self._stream:
+            deserialized_response = self._load(response, response.json)
+        elif hasattr(response.json, "__aiter__"):
+            deserialized_response = self._aiter_deserialized_items(response)
+        else:
+            deserialized_response = self._iter_deserialized_items(response)
+
         return EndpointResponse(
             response=response,
             data=deserialized_response
         )
 
-    def _create_endpoint_response(self, response):
-        if self._can_deserialize():
+    def _create_endpoint_response(self, function, response):
+        if not self._can_deserialize():
+            return response
+
+        instrumentation = _get_instrumentation(function)
+        if not instrumentation.enabled:
             return self._deserialize_response(response)
-        else:
+
+        start = perf_counter()
+        endpoint_response = self._deserialize_response(response)
+        instrumentation.record_timing(
+            self._method, self._endpoint, "schema_load",
+            perf_counter() - start
+        )
+
+        return endpoint_response
+
+    def _record_event(self, function, event):
+        instrumentation = _get_instrumentation(function)
+        if instrumentation.enabled:
+            instrumentation.record_event(self._method, self._endpoint, event)
+
+    def _lookup_cache(self, function, cache, key):
+        entry, fresh = cache.lookup(key)
+
+        self._record_event(function, "cache_hit" if fresh else "cache_miss")
+
+        return entry, fresh
+
+    def _create_cache_key(self, function, args, params):
+        return (
+            self._method,
+            function.create_url(args),
+            urlencode(sorted(params.items()), doseq=True),
+            function.auth
+        )
+
+    def _create_cached_endpoint_response(self, function, cache, key, entry,
+                                         response):
+        if entry is not None and response.status_code == 304:
+            self._record_event(function, "cache_revalidated")
+
+            return cache.revalidate(key, entry, response.headers)
+
+        endpoint_response = self._create_endpoint_response(function, response)
+
+        if 200 <= response.status_code < 300:
+            cache.set(key, endpoint_response, response.headers)
+
+        return endpoint_response
+
+    def _create_page_params(self, params):
+        return dict(self._pagination.first_page_params(), **params)
+
+    def _deserialize_page(self, response, items):
+        if self._can_deserialize():
+            return self._load(response, items, many=True)
+
+        return items
+
+    def _paginate(self, function, args, params, payload):
+        expires_at = get_expiry(function.deadline)
+
+        def fetch_page(page_params):
+            with deadline_at(expires_at):
+                response = function.execute(
+                    args=args,
+                    params=page_params,
+                    json=payload,
+                    headers=None
+                )
+
+            self._check_status_code(response)
+
             return response
 
+        pages = iter_pages(
+            fetch_page=fetch_page,
+            pagination=self._pagination,
+            params=self._create_page_params(params)
+        )
+
+        for response, items in pages:
+            yield from self._deserialize_page(response, items)
+
+    async def _apaginate(self, function, args, params, payload):
+        expires_at = get_expiry(function.deadline)
+
+        async def fetch_page(page_params):
+            with deadline_at(expires_at):
+                response = await function.execute(
+                    args=args,
+                    params=page_params,
+                    json=payload,
+                    headers=None
+                )
+
+            self._check_status_code(response)
+
+            return response
+
+        pages = aiter_pages(
+            fetch_page=fetch_page,
+            pagination=self._pagination,
+            params=self._create_page_params(params)
+        )
+
+        async for response, items in pages:
+            for item in self._deserialize_page(response, items):
+                yield item
+
+    def _execute(self, bound_endpoint, kwargs):
+        function = bound_endpoint.function
+        cache = bound_endpoint.cache
+
+        args = self._create_args(kwargs)
+        params = self._create_params(kwargs)
+        payload = self._create_payload(kwargs)
+
+        if self._pagination is not None:
+            return self._paginate(function, args, params, payload)
+
+        if cache is None:
+            response = function.execute(
+                args=args,
+                params=params,
+                json=payload,
+                headers=None
+            )
+
+            return self._create_endpoint_response(function, response)
+
+        key = self._create_cache_key(function, args, params)
+        entry, fresh = self._lookup_cache(function, cache, key)
+        if fresh:
+            return entry.value
+
+        response = function.execute(
+            args=args,
+            params=params,
+            json=payload,
+            headers=entry.create_conditional_headers() if entry else None
+        )
+
+        return self._create_cached_endpoint_response(
+            function, cache, key, entry, response)
+
+    async def _execute_async(self, bound_endpoint, kwargs):
+        function = bound_endpoint.function
+        cache = bound_endpoint.cache
+
+        args = self._create_args(kwargs)
+        params = self._create_params(kwargs)
+        payload = self._create_payload(kwargs)
+
+        if self._pagination is not None:
+            return self._apaginate(function, args, params, payload)
+
+        if cache is None:
+            response = await function.execute(
+                args=args,
+                params=params,
+                json=payload,
+                headers=None
+            )
+            await self._await_deferred(response)
+
+            return self._create_endpoint_response(function, response)
+
+        key = self._create_cache_key(function, args, params)
+        entry, fresh = self._lookup_cache(function, cache, key)
+        if fresh:
+            return entry.value
+
+        response = await function.execute(
+            args=args,
+            params=params,
+            json=payload,
+            headers=entry.create_conditional_headers() if entry else None
+        )
+        await self._await_deferred(response)
+
+        return self._create_cached_endpoint_response(
+            function, cache, key, entry, response)
+
+
+class BoundEndpoint(object):
+    """Endpoint that is bound to a client object"""
+
+    __slots__ = ("endpoint", "function", "cache")
+
+    def __init__(self, endpoint, function, cache=None):
+        """Create a new BoundEndpoint object
+
+        :param Endpoint endpoint: the endpoint declaration
+        :param Function function: the function that executes the requests
+        :param ResponseCache cache: the response cache to use
+        """
+        self.endpoint = endpoint
+        self.function = function
+        self.cache = cache
+
     def execute(self, **kwargs):
         """Execute a request to the endpoint
 
@@ -137,14 +651,315 @@ class Endpoint(object):
         in the args and params arguments in the constructor
         :return: dict|EndpointResponse
         """
-        args = self._create_args(kwargs)
-        params = self._create_params(kwargs)
-        payload = self._create_payload(kwargs)
+        return self.endpoint._execute(self, kwargs)
+
+    def __call__(self, **kwargs):
+        return self.endpoint._execute(self, kwargs)
+
+    def execute_many(self, calls, concurrency=10, ordered=True):
+        """Execute many requests to the endpoint concurrently
+
+        The requests are executed on a bounded thread pool that shares the
+        pooled session of the client.
+
+        :param calls: an iterable with the keyword arguments of each request
+        :param int concurrency: the maximum number of concurrent requests
+        :param boolean ordered: yield the results in the order of the calls
+        when True, or as soon as they complete when False
+        :rtype: collections.Iterable[BatchResult]
+        :return: the request results
+        """
+        return execute_concurrently(
+            calls=((self.execute, kwargs) for kwargs in calls),
+            concurrency=concurrency,
+            ordered=ordered
+        )
+
+
+class AsyncBoundEndpoint(object):
+    """Endpoint that is bound to an asynchronous client object"""
+
+    __slots__ = ("endpoint", "function", "cache")
 
-        response = self._function.execute(
+    def __init__(self, endpoint, function, cache=None):
+        """Create a new AsyncBoundEndpoint object
+
+        :param Endpoint endpoint: the endpoint declaration
+        :param AsyncFunction function: the function that executes the requests
+        :param ResponseCache cache: the response cache to use
+        """
+        self.endpoint = endpoint
+        self.function = function
+        self.cache = cache
+
+    async def execute(self, **kwargs):
+        """Execute a request to the endpoint
+
+        :param kwargs: the endpoint arguments. These are the items defined
+        in the args and params arguments in the constructor
+        :return: dict|EndpointResponse
+        """
+        return await self.endpoint._execute_async(self, kwargs)
+
+    def __call__(self, **kwargs):
+        return self.endpoint._execute_async(self, kwargs)
+
+
+class BatchEndpoint(Endpoint):
+    """Batch endpoint declaration class
+
+    The calls to a batch endpoint are buffered for a short window and the
+    calls that have the same args and params are executed in one request.
+    The payload of the request is the list of the items of the calls, the
+    keyword arguments that are not args or params, and the response body
+    must be a json array with a result for each item. Each call returns an
+    EndpointResponse whose data is its own result.
+    """
+
+    def __init__(self, method, endpoint, key=None, item_key=None, args=None,
+                 params=None, requires_auth=True, response_schema=None,
+                 payload_schema=None, max_batch_size=100, window=0.01,
+                 retry_policy=None, circuit_breakers=None, rate_limiter=None,
+                 compression=None, timeout=None):
+        """Create a new BatchEndpoint object
+
+        :param str method: the http method to use
+        :param str endpoint: the endpoint path template
+        :param str key: the call argument that identifies the items. The
+        results are matched to the calls by key and the calls with the same
+        key in a batch are sent once. The results are matched by position
+        when this is None
+        :param str item_key: the field of the response items that contains
+        the key. This is the same as key when it is None
+        :param list[str] args: the endpoint address arguments
+        :param list[str] params: the endpoint url arguments
+        :param boolean requires_auth: indicator flag that is used to specify
+        if the endpoint requires authentication
+        :param Schema|CompiledSchema response_schema: the schema of a single
+        response item
+        :param Schema payload_schema: the schema that serializes the list of
+        the items. It must be declared with many=True
+        :param int max_batch_size: the maximum number of calls in a request
+        :param float window: the time in seconds to wait for more calls
+        before the request is sent
+        :param RetryPolicy|boolean retry_policy: the retry policy to use
+        :param CircuitBreakerRegistry|boolean circuit_breakers: the circuit
+        breakers to use
+        :param TokenBucketRateLimiter|boolean rate_limiter: the rate limiter
+        of the endpoint
+        :param Compression|boolean compression: the compression settings of
+        the endpoint
+        :param int|float|tuple|Timeout timeout: the request timeout of the
+        endpoint
+        """
+        super(BatchEndpoint, self).__init__(
+            method=method,
+            endpoint=endpoint,
             args=args,
             params=params,
-            json=payload
+            requires_auth=requires_auth,
+            response_schema=response_schema,
+            payload_schema=payload_schema,
+            cache=False,
+            retry_policy=retry_policy,
+            circuit_breakers=circuit_breakers,
+            rate_limiter=rate_limiter,
+            single_flight=False,
+            compression=compression,
+            process_pool=False,
+            timeout=timeout
+        )
+
+        self._key = key
+        self._item_key = item_key or key
+        self._max_batch_size = max_batch_size
+        self._window = window
+
+    def bind(self, client):
+        if isinstance(client, AsyncClient):
+            function = self._create_function(AsyncFunction, client)
+
+            return AsyncBoundBatchEndpoint(
+                endpoint=self,
+                function=function,
+                batcher=AsyncBatcher(
+                    execute_batch=partial(self._aexecute_batch, function),
+                    max_batch_size=self._max_batch_size,
+                    window=self._window
+                )
+            )
+
+        function = self._create_function(Function, client)
+
+        return BoundBatchEndpoint(
+            endpoint=self,
+            function=function,
+            batcher=Batcher(
+                execute_batch=partial(self._execute_batch, function),
+                max_batch_size=self._max_batch_size,
+                window=self._window
+            )
+        )
+
+    def _create_batch_key(self, kwargs):
+        return (
+            tuple(sorted(self._create_args(kwargs).items())),
+            tuple(sorted(self._create_params(kwargs).items()))
+        )
+
+    def _create_item(self, kwargs):
+        item = {
+            name: value
+            for name, value in kwargs.items()
+            if name not in self._args and name not in self._params
+        }
+
+        if self._key is not None and self._key not in item:
+            raise KeyError(self._key)
+
+        return item
+
+    def _get_unique_items(self, items):
+        if self._key is None:
+            return items
+
+        unique_items = {}
+        for item in items:
+            unique_items.setdefault(item[self._key], item)
+
+        return list(unique_items.values())
+
+    def _create_batch_payload(self, items):
+        if self._payload_schema is None:
+            return items
+
+        return self._create_serialized_payload(items)
+
+    def _get_item_values(self, response, items):
+        data = response.json
+
+        if not isinstance(data, list):
+            raise ExecutionError(
+                reason="the batch response is not a json array",
+                response=response
+            )
+
+        if self._key is None:
+            if len(data) != len(items):
+                raise ExecutionError(
+                    reason="the batch response doesn't contain a result for "
+                           "every item",
+                    response=response
+                )
+
+            return data
+
+        values = {
+            value.get(self._item_key): value
+            for value in data
+            if isinstance(value, dict)
+        }
+
+        return [values.get(item[self._key], _MISSING) for item in items]
+
+    def _create_item_result(self, response, item, value):
+        if value is _MISSING:
+            return BatchResult(
+                kwargs=item,
+                response=None,
+                error=ExecutionError(
+                    reason="the batch response doesn't contain a result for "
+                           "the item",
+                    response=response
+                )
+            )
+
+        data = value
+        if self._can_deserialize():
+            try:
+                data = self._load(response, value, many=False)
+            except ResponseDeserializationError as e:
+                return BatchResult(kwargs=item, response=None, error=e)
+
+        return BatchResult(
+            kwargs=item,
+            response=EndpointResponse(response=response, data=data),
+            error=None
+        )
+
+    def _split_batch_response(self, response, items):
+        self._check_status_code(response)
+
+        values = self._get_item_values(response, items)
+
+        return [
+            self._create_item_result(response, item, value)
+            for item, value in zip(items, values)
+        ]
+
+    def _execute_batch(self, function, key, items):
+        args, params = key
+
+        response = function.execute(
+            args=dict(args),
+            params=dict(params),
+            json=self._create_batch_payload(self._get_unique_items(items)),
+            headers=None
+        )
+
+        return self._split_batch_response(response, items)
+
+    async def _aexecute_batch(self, function, key, items):
+        args, params = key
+
+        response = await function.execute(
+            args=dict(args),
+            params=dict(params),
+            json=self._create_batch_payload(self._get_unique_items(items)),
+            headers=None
         )
 
-        return self._create_endpoint_response(response)
+        return self._split_batch_response(response, items)
+
+    def _execute(self, bound_endpoint, kwargs):
+        future = bound_endpoint.batcher.submit(
+            self._create_batch_key(kwargs), self._create_item(kwargs))
+
+        return future.result()
+
+    async def _execute_async(self, bound_endpoint, kwargs):
+        return await bound_endpoint.batcher.submit(
+            self._create_batch_key(kwargs), self._create_item(kwargs))
+
+
+class BoundBatchEndpoint(BoundEndpoint):
+    """Batch endpoint that is bound to a client object"""
+
+    __slots__ = ("batcher",)
+
+    def __init__(self, endpoint, function, batcher):
+        """Create a new BoundBatchEndpoint object
+
+        :param BatchEndpoint endpoint: the endpoint declaration
+        :param Function function: the function that executes the requests
+        :param Batcher batcher: the batcher of the calls
+        """
+        super(BoundBatchEndpoint, self).__init__(endpoint, function)
+        self.batcher = batcher
+
+
+class AsyncBoundBatchEndpoint(AsyncBoundEndpoint):
+    """Batch endpoint that is bound to an asynchronous client object"""
+
+    __slots__ = ("batcher",)
+
+    def __init__(self, endpoint, function, batcher):
+        """Create a new AsyncBoundBatchEndpoint object
+
+        :param BatchEndpoint endpoint: the endpoint declaration
+        :param AsyncFunction function: the function that executes the
+        requests
+        :param AsyncBatcher batcher: the batcher of the calls
+        """
+        super(AsyncBoundBatchEndpoint, self).__init__(endpoint, function)
+        self.batcher = batcher
@@ -60,5 +60,32 @@ class EndpointTimeout(RequestExecutionError):
     pass
 
 
+class DeadlineExceeded(EndpointTimeout):
+    pass
+
+
 class EndpointRequestError(RequestExecutionError):
     pass
+
+
+class EndpointConnectionError(EndpointRequestError):
+    pass
+
+
+class CircuitOpenError(RequestExecutionError):
+    pass
+
+
+class RateLimitExceeded(RequestExecutionError):
+    pass
+
+
+class BatchExecutionError(EndpointError):
+    def __init__(self, reason=None, error=None, *args):
+        super(BatchExecutionError, self).__init__(reason, error, *args)
+
+        self.error = error
+
+
+class EndpointDeclarationError(ClientlibException):
+    pass
@@ -1,11 +1,26 @@
-from clientlib.requests import APIRequest
+from functools import partial
+
+from clientlib.coalescing import COALESCABLE_METHODS, create_coalescing_key
+from clientlib.exceptions import RateLimitExceeded, DeadlineExceeded
+from clientlib.instrumentation import NO_INSTRUMENTATION
+from clientlib.requests import (
+    APIRequest, AsyncAPIRequest, RequestPrototype, can_use_request_prototype
+)
+from clientlib.timeouts import deadline
+from clientlib.urls import URLTemplate
 
 
 class Function(object):
     """API function object"""
 
+    request_class = APIRequest
+
     def __init__(self, session, base_url, method, endpoint, auth=None,
-                 timeout=5, verify=True):
+                 timeout=5, verify=True, stream=False, retry_policy=None,
+                 circuit_breaker=None, rate_limiters=None, url_template=None,
+                 json_codec=None, single_flight=None, instrumentation=None,
+                 transport=None, compression=None, process_pool=None,
+                 hedging_policy=None):
         """Create a new Function object
 
         :param Session session: the session to use
@@ -13,8 +28,32 @@ class Function(object):
         :param str method: the http method to use
         :param str endpoint: the endpoint path
         :param AuthBase auth: the authenticator object to use
-        :param int timeout: the request timeout value
+        :param int|float|tuple|Timeout timeout: the request timeout, a
+        (connect, read) tuple or a Timeout object. The deadline of a Timeout
+        object limits the total time of an execution, including its retries
         :param boolean verify: flag that indicates whether to verify ssl
+        :param boolean stream: flag that indicates whether to stream the
+        items of the json array in the response body
+        :param RetryPolicy retry_policy: the retry policy to use
+        :param CircuitBreaker circuit_breaker: the circuit breaker to use
+        :param list[TokenBucketRateLimiter] rate_limiters: the rate limiters
+        that every request must acquire a token from
+        :param URLTemplate url_template: the compiled endpoint url template.
+        It is compiled from the endpoint when this is None
+        :param JSONCodec json_codec: the codec of the request and response
+        bodies
+        :param SingleFlight|AsyncSingleFlight single_flight: the object that
+        coalesces the identical concurrent GET and HEAD requests
+        :param Instrumentation instrumentation: the instrumentation that the
+        request metrics are reported to
+        :param Transport transport: the transport to send the requests with.
+        The requests are sent with the session when this is None
+        :param Compression compression: the compression settings of the
+        requests
+        :param ProcessPoolDeserializer process_pool: the process pool that
+        deserializes the large response bodies
+        :param HedgingPolicy hedging_policy: the policy that hedges the slow
+        requests of idempotent methods
         """
         self.session = session
         self.base_url = base_url
@@ -22,18 +61,69 @@ class Function(object):
         self.endpoint = endpoint
         self.auth = auth
         self.timeout = timeout
+        self.deadline = getattr(timeout, "deadline", None)
         self.verify = verify
+        self.stream = stream
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.rate_limiters = tuple(rate_limiters or ())
+        self.url_template = (url_template or URLTemplate(endpoint)) \
+            .with_base_url(base_url)
+        self.json_codec = json_codec
+        self.single_flight = single_flight
+        self.instrumentation = instrumentation or NO_INSTRUMENTATION
+        self.transport = transport
+        self.compression = compression
+        self.process_pool = process_pool
+        self.hedging_policy = hedging_policy
+        self.prototype = self._create_prototype()
 
-    def execute(self, args=None, params=None, json=None):
-        """Execute the function
+    def _create_prototype(self):
+        if not can_use_request_prototype(
+                self.base_url, self.endpoint, self.auth):
+            return None
+
+        return RequestPrototype(method=self.method, auth=self.auth)
+
+    def create_url(self, args=None):
+        """Create the url of the function
 
         :param dict args: the endpoint arguments
-        :param dict params: the endpoint url parameters
-        :param dict json: the payload
-        :rtype: Response
-        :return: the function execution result
+        :rtype: str
+        :return: the url
         """
-        request = APIRequest(
+        return self.url_template.render(args)
+
+    def _can_retry(self):
+        return self.retry_policy is not None and \
+            self.retry_policy.can_retry_method(self.method)
+
+    def _can_hedge(self):
+        # streamed responses are read after the request is executed, so the
+        # request that lost can't be cancelled
+        return self.hedging_policy is not None \
+            and self.hedging_policy.can_hedge_method(self.method) \
+            and not self.stream
+
+    def _can_coalesce(self, json):
+        # streamed responses can be consumed only once, so they can't be
+        # shared
+        return self.single_flight is not None \
+            and self.method in COALESCABLE_METHODS \
+            and not self.stream \
+            and json is None
+
+    def _create_coalescing_key(self, args, params, headers):
+        return create_coalescing_key(
+            method=self.method,
+            url=self.create_url(args),
+            params=params,
+            auth=self.auth,
+            headers=headers
+        )
+
+    def _create_request(self, args, params, json, headers):
+        return self.request_class(
             session=self.session,
             base_url=self.base_url,
             method=self.method,
@@ -43,7 +133,195 @@ class Function(object):
             json=json,
             auth=self.auth,
             timeout=self.timeout,
-            verify=self.verify
+            verify=self.verify,
+            headers=headers,
+            stream=self.stream,
+            url_template=self.url_template,
+            prototype=self.prototype,
+            json_codec=self.json_codec,
+            instrumentation=self.instrumentation,
+            transport=self.transport,
+            compression=self.compression,
+            process_pool=self.process_pool
+        )
+
+    def _create_rate_limit_error(self):
+        return RateLimitExceeded(
+            reason="the rate limit has been exceeded",
+            base_url=self.base_url,
+            method=self.method,
+            endpoint=self.endpoint
+        )
+
+    def _create_deadline_error(self, error):
+        return DeadlineExceeded(
+            reason=error.reason,
+            base_url=self.base_url,
+            method=self.method,
+            endpoint=self.endpoint
         )
 
-        return request.execute()
+    def _create_event_callback(self, event):
+        if not self.instrumentation.enabled:
+            return None
+
+        return partial(
+            self.instrumentation.record_event,
+            self.method,
+            self.endpoint,
+            event
+        )
+
+    def _create_retry_callback(self):
+        return self._create_event_callback("retry")
+
+    def _update_rate_limiters(self, response):
+        for rate_limiter in self.rate_limiters:
+            rate_limiter.update(response.headers)
+
+    def _execute_request(self, request):
+        for rate_limiter in self.rate_limiters:
+            try:
+                acquired = rate_limiter.acquire()
+            except DeadlineExceeded as e:
+                raise self._create_deadline_error(e) from e
+
+            if not acquired:
+                raise self._create_rate_limit_error()
+
+        if self.circuit_breaker is None:
+            response = request.execute()
+        else:
+            response = self.circuit_breaker.call(request)
+
+        self._update_rate_limiters(response)
+
+        return response
+
+    def execute(self, args=None, params=None, json=None, headers=None):
+        """Execute the function
+
+        :param dict args: the endpoint arguments
+        :param dict params: the endpoint url parameters
+        :param dict json: the payload
+        :param dict headers: additional request headers
+        :rtype: Response
+        :return: the function execution result
+        """
+        if self.deadline is None:
+            return self._execute_call(args, params, json, headers)
+
+        with deadline(self.deadline):
+            return self._execute_call(args, params, json, headers)
+
+    def _execute_call(self, args, params, json, headers):
+        request = self._create_request(args, params, json, headers)
+
+        if self._can_coalesce(json):
+            try:
+                return self.single_flight.execute(
+                    self._create_coalescing_key(args, params, headers),
+                    partial(self._execute, request)
+                )
+            except DeadlineExceeded as e:
+                raise self._create_deadline_error(e) from e
+
+        return self._execute(request)
+
+    def _execute_attempt(self, request):
+        if not self._can_hedge():
+            return self._execute_request(request)
+
+        return self.hedging_policy.execute(
+            partial(self._execute_request, request),
+            method=self.method,
+            endpoint=self.endpoint,
+            on_hedge=self._create_event_callback("hedge"),
+            on_hedge_win=self._create_event_callback("hedge_win")
+        )
+
+    def _execute(self, request):
+        if self._can_retry():
+            return self.retry_policy.execute(
+                partial(self._execute_attempt, request),
+                on_retry=self._create_retry_callback()
+            )
+
+        return self._execute_attempt(request)
+
+
+class AsyncFunction(Function):
+    """Asynchronous API function object"""
+
+    request_class = AsyncAPIRequest
+
+    async def _execute_request(self, request):
+        for rate_limiter in self.rate_limiters:
+            try:
+                acquired = await rate_limiter.acquire_async()
+            except DeadlineExceeded as e:
+                raise self._create_deadline_error(e) from e
+
+            if not acquired:
+                raise self._create_rate_limit_error()
+
+        if self.circuit_breaker is None:
+            response = await request.execute()
+        else:
+            response = await self.circuit_breaker.call_async(request)
+
+        self._update_rate_limiters(response)
+
+        return response
+
+    async def execute(self, args=None, params=None, json=None,
+                      headers=None):
+        """Execute the function
+
+        :param dict args: the endpoint arguments
+        :param dict params: the endpoint url parameters
+        :param dict json: the payload
+        :param dict headers: additional request headers
+        :rtype: Response
+        :return: the function execution result
+        """
+        if self.deadline is None:
+            return await self._execute_call(args, params, json, headers)
+
+        with deadline(self.deadline):
+            return await self._execute_call(args, params, json, headers)
+
+    async def _execute_call(self, args, params, json, headers):
+        request = self._create_request(args, params, json, headers)
+
+        if self._can_coalesce(json):
+            try:
+                return await self.single_flight.execute(
+                    self._create_coalescing_key(args, params, headers),
+                    partial(self._execute, request)
+                )
+            except DeadlineExceeded as e:
+                raise self._create_deadline_error(e) from e
+
+        return await self._execute(request)
+
+    async def _execute_attempt(self, request):
+        if not self._can_hedge():
+            return await self._execute_request(request)
+
+        return await self.hedging_policy.execute_async(
+            partial(self._execute_request, request),
+            method=self.method,
+            endpoint=self.endpoint,
+            on_hedge=self._create_event_callback("hedge"),
+            on_hedge_win=self._create_event_callback("hedge_win")
+        )
+
+    async def _execute(self, request):
+        if self._can_retry():
+            return await self.retry_policy.execute_async(
+                partial(self._execute_attempt, request),
+                on_retry=self._create_retry_callback()
+            )
+
+        return await self._execute_attempt(request)
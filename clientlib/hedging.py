@@ -0,0 +1,390 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import (
+    ThreadPoolExecutor, wait, FIRST_COMPLETED
+)
+from contextvars import copy_context
+from functools import partial
+from time import perf_counter
+
+from clientlib.retries import IDEMPOTENT_METHODS, RetryBudget
+from clientlib.timeouts import LatencyWindow
+
+
+logger = logging.getLogger(__name__)
+
+
+# the number of hedged requests that are sent per request
+MAX_HEDGES = 1
+
+
+def _get_winner(done, first):
+    succeeded = [future for future in done if future.exception() is None]
+    if not succeeded:
+        return None
+
+    # the first request wins a tie
+    return first if first in succeeded else succeeded[0]
+
+
+class _Attempt(object):
+    """A request attempt that records when it starts running"""
+
+    def __init__(self, function):
+        self.function = function
+        self.started = threading.Event()
+        self.start = None
+
+    def __call__(self):
+        self.start = perf_counter()
+        self.started.set()
+
+        return self.function()
+
+
+class _Slots(object):
+    """Counts the requests that are executed on a thread pool"""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.used = 0
+
+        self._lock = threading.Lock()
+
+    def try_acquire(self):
+        with self._lock:
+            if self.used >= self.limit:
+                return False
+
+            self.used += 1
+
+        return True
+
+    def release(self, future=None):
+        with self._lock:
+            self.used -= 1
+
+
+class HedgingPolicy(object):
+    """Sends a second request when the first one is slow
+
+    A hedged request is sent when the first request hasn't completed within
+    the hedging delay, which is either fixed or the observed latency
+    percentile of the endpoint. The response that arrives first is used.
+    Only idempotent requests are hedged and the hedges are limited to a
+    fraction of the requests, so that they increase the load of the
+    upstream only marginally.
+
+    The asynchronous requests that lose are cancelled. The synchronous
+    requests are executed on the bounded thread pool of the policy, whose
+    idle threads are reused. When the pool is saturated a request is
+    executed on the thread of the caller, or its hedge is skipped, so the
+    pool never queues requests. The hedging delay and the latencies are
+    measured from the time that a request starts running. A request of the
+    requests library can't be interrupted while it is in flight, so the
+    synchronous requests that lose complete in the background and their
+    responses are discarded.
+    """
+
+    def __init__(self, delay=None, percentile=95, min_samples=20,
+                 max_hedge_ratio=0.05, max_burst=10, window_size=200,
+                 max_concurrency=16):
+        """Create a new HedgingPolicy object
+
+        :param float delay: the time in seconds to wait for the first
+        request before a hedged request is sent. The latency percentile of
+        the endpoint is used when this is None
+        :param float percentile: the latency percentile that is used as the
+        hedging delay, between 0 and 100
+        :param int min_samples: the number of latencies to observe before
+        the requests to an endpoint are hedged with the percentile delay
+        :param float max_hedge_ratio: the number of hedged requests allowed
+        per request
+        :param int max_burst: the maximum number of hedged requests that can
+        be accumulated while the endpoints are fast
+        :param int window_size: the number of recent latencies to keep per
+        endpoint
+        :param int max_concurrency: the maximum number of synchronous
+        requests that are executed on the thread pool of the policy. The
+        pool has a thread for each of them and for each of their hedges.
+        The requests beyond it are executed on the thread of the caller and
+        they aren't hedged
+        """
+        if max_concurrency < 1:
+            raise ValueError("the concurrency must be at least 1")
+
+        self.delay = delay
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.window_size = window_size
+        self.max_concurrency = max_concurrency
+        self.max_workers = max_concurrency * (1 + MAX_HEDGES)
+        self.budget = RetryBudget(
+            ratio=max_hedge_ratio,
+            min_retries_per_second=0,
+            max_balance=max_burst
+        )
+
+        self._lock = threading.Lock()
+        self._windows = {}
+        self._executor = None
+        self._slots = _Slots(max_concurrency)
+        self._hedge_slots = _Slots(max_concurrency * MAX_HEDGES)
+
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    @property
+    def hedge_win_rate(self):
+        """The fraction of the hedged requests whose response was used
+
+        :rtype: float
+        """
+        with self._lock:
+            if self.hedges == 0:
+                return 0.0
+
+            return self.hedge_wins / self.hedges
+
+    def can_hedge_method(self, method):
+        """Check if requests with the given method can be hedged
+
+        :param str method: the http method
+        :rtype: boolean
+        :return: True if the requests are idempotent
+        """
+        return method.upper() in IDEMPOTENT_METHODS
+
+    def _get_window(self, method, endpoint):
+        key = (method, endpoint)
+
+        window = self._windows.get(key)
+        if window is None:
+            with self._lock:
+                window = self._windows.setdefault(
+                    key, LatencyWindow(self.window_size))
+
+        return window
+
+    def get_delay(self, method, endpoint):
+        """Get the hedging delay of an endpoint
+
+        :param str method: the http method
+        :param str endpoint: the endpoint path template
+        :rtype: float
+        :return: the delay in seconds, or None if not enough latencies have
+        been observed
+        """
+        if self.delay is not None:
+            return self.delay
+
+        window = self._windows.get((method, endpoint))
+        if window is None or len(window) < self.min_samples:
+            return None
+
+        return window.percentile(self.percentile)
+
+    def _record_request(self):
+        self.budget.record_request()
+
+        with self._lock:
+            self.requests += 1
+
+    def _try_hedge(self, on_hedge):
+        if not self.budget.try_withdraw():
+            return False
+
+        with self._lock:
+            self.hedges += 1
+
+        if on_hedge is not None:
+            on_hedge()
+
+        return True
+
+    def _record_hedge_win(self, on_hedge_win):
+        with self._lock:
+            self.hedge_wins += 1
+
+        if on_hedge_win is not None:
+            on_hedge_win()
+
+    def _record_latency(self, window, start, future):
+        if not future.cancelled() and future.exception() is None:
+            window.add(perf_counter() - start)
+
+    def _record_attempt_latency(self, window, attempt, future):
+        if attempt.start is not None:
+            self._record_latency(window, attempt.start, future)
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="clientlib-hedge"
+                )
+
+            return self._executor
+
+    def _submit(self, function, release):
+        attempt = _Attempt(function)
+
+        # the request is executed with the context of the caller, so that
+        # the deadline of the current operation applies to it
+        future = self._get_executor().submit(copy_context().run, attempt)
+        future.add_done_callback(release)
+
+        return attempt, future
+
+    def execute(self, function, method, endpoint, on_hedge=None,
+                on_hedge_win=None):
+        """Execute a request and hedge it if it is slow
+
+        :param callable function: a callable that executes the request and
+        returns a Response object
+        :param str method: the http method
+        :param str endpoint: the endpoint path template
+        :param callable on_hedge: a callable that is called when a hedged
+        request is sent
+        :param callable on_hedge_win: a callable that is called when the
+        response of the hedged request is used
+        :rtype: Response
+        :return: the response that arrived first
+        """
+        self._record_request()
+
+        window = self._get_window(method, endpoint)
+        delay = self.get_delay(method, endpoint)
+        start = perf_counter()
+
+        if delay is None or not self._slots.try_acquire():
+            # the request is executed inline while the latencies of the
+            # endpoint are observed, or when the thread pool is saturated
+            response = function()
+            window.add(perf_counter() - start)
+
+            return response
+
+        attempt, first = self._submit(function, self._slots.release)
+        first.add_done_callback(
+            partial(self._record_attempt_latency, window, attempt))
+
+        # the request isn't hedged while it waits for a thread
+        attempt.started.wait()
+        timeout = max(0, attempt.start + delay - perf_counter())
+
+        done, _ = wait([first], timeout=timeout)
+        if done:
+            return first.result()
+
+        if not self._hedge_slots.try_acquire():
+            logger.debug(
+                "the thread pool is saturated, %s %s isn't hedged",
+                method, endpoint
+            )
+
+            return first.result()
+
+        if not self._try_hedge(on_hedge):
+            self._hedge_slots.release()
+
+            return first.result()
+
+        logger.debug("sending a hedged request to %s %s", method, endpoint)
+
+        _, hedge = self._submit(function, self._hedge_slots.release)
+        pending = {first, hedge}
+
+        while True:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+            winner = _get_winner(done, first)
+            if winner is not None or not pending:
+                break
+
+        for future in pending:
+            future.cancel()
+
+        if winner is None:
+            # both requests failed, the error of the first one is raised
+            return first.result()
+
+        if winner is hedge:
+            self._record_hedge_win(on_hedge_win)
+
+        return winner.result()
+
+    async def execute_async(self, function, method, endpoint, on_hedge=None,
+                            on_hedge_win=None):
+        """Execute a request asynchronously and hedge it if it is slow
+
+        :param function: a coroutine function that executes the request and
+        returns a Response object
+        :param str method: the http method
+        :param str endpoint: the endpoint path template
+        :param callable on_hedge: a callable that is called when a hedged
+        request is sent
+        :param callable on_hedge_win: a callable that is called when the
+        response of the hedged request is used
+        :rtype: Response
+        :return: the response that arrived first
+        """
+        self._record_request()
+
+        window = self._get_window(method, endpoint)
+        delay = self.get_delay(method, endpoint)
+        start = perf_counter()
+
+        if delay is None:
+            response = await function()
+            window.add(perf_counter() - start)
+
+            return response
+
+        first = asyncio.ensure_future(function())
+        first.add_done_callback(
+            partial(self._record_latency, window, start))
+        pending = {first}
+
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if done or not self._try_hedge(on_hedge):
+                return await first
+
+            logger.debug(
+                "sending a hedged request to %s %s", method, endpoint)
+
+            hedge = asyncio.ensure_future(function())
+            pending.add(hedge)
+
+            while True:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED)
+
+                winner = _get_winner(done, first)
+                if winner is not None or not pending:
+                    break
+
+            if winner is None:
+                return first.result()
+
+            if winner is hedge:
+                self._record_hedge_win(on_hedge_win)
+
+            return winner.result()
+        finally:
+            # the request that lost, or both requests when the caller was
+            # cancelled
+            for task in pending:
+                task.cancel()
+
+    def close(self):
+        """Stop the threads of the policy"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+
+        if executor is not None:
+            executor.shutdown(wait=False)
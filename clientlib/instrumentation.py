@@ -0,0 +1,271 @@
+import threading
+from bisect import bisect_left
+from collections import Counter
+
+
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+    2.5, 5.0, 10.0
+)
+
+
+class Instrumentation(object):
+    """Instrumentation base class
+
+    The base class doesn't record anything. The request pipeline checks the
+    enabled attribute before it takes any measurement, so the default
+    instrumentation doesn't add any work to the requests.
+
+    The timings are reported for the following phases:
+
+    - url_build: the rendering of the endpoint url
+    - ttfb: the time until the response headers are received, including the
+      time to connect
+    - body_read: the time to read the response body
+    - json_decode: the time to decode the response body
+    - schema_load: the time to deserialize the response with the response
+      schema
+    """
+
+    enabled = False
+
+    def record_timing(self, method, endpoint, phase, duration):
+        """Record the duration of a request phase
+
+        :param str method: the http method
+        :param str endpoint: the endpoint path template
+        :param str phase: the request phase
+        :param float duration: the duration in seconds
+        """
+
+    def record_response(self, method, endpoint, status_code, bytes_sent,
+                        bytes_received):
+        """Record a response
+
+        :param str method: the http method
+        :param str endpoint: the endpoint path template
+        :param int status_code: the response status code
+        :param int bytes_sent: the size of the request body
+        :param int bytes_received: the size of the response body on the wire,
+        before it is decompressed. This is 0 for streamed responses
+        """
+
+    def record_event(self, method, endpoint, event):
+        """Record an event
+
+        :param str method: the http method
+        :param str endpoint: the endpoint path template
+        :param str event: the event name, for example retry, hedge or
+        cache_hit
+        """
+
+
+NO_INSTRUMENTATION = Instrumentation()
+
+
+class Histogram(object):
+    """Cumulative histogram of durations"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """Create a new Histogram object
+
+        :param tuple[float] buckets: the sorted upper bounds of the buckets
+        """
+        self.buckets = tuple(buckets)
+        self.bucket_counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        """Add a value to the histogram
+
+        :param float value: the value
+        """
+        self.bucket_counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative_counts(self):
+        """Get the number of values that are less than or equal to each
+        bucket bound
+
+        :rtype: list[tuple[float, int]]
+        :return: the bucket bounds and counts. The last bound is infinity
+        """
+        counts = []
+        total = 0
+
+        for bound, count in zip(self.buckets + (float("inf"),),
+                                self.bucket_counts):
+            total += count
+            counts.append((bound, total))
+
+        return counts
+
+    def percentile(self, percentile):
+        """Estimate a percentile
+
+        :param float percentile: the percentile, between 0 and 100
+        :rtype: float
+        :return: the upper bound of the bucket that contains the percentile,
+        or None if the histogram is empty
+        """
+        if self.count == 0:
+            return None
+
+        rank = self.count * percentile / 100.0
+
+        for bound, count in self.cumulative_counts():
+            if count >= rank:
+                return bound
+
+
+class InMemoryMetrics(Instrumentation):
+    """Instrumentation that keeps the metrics in memory
+
+    The timings are aggregated in histograms per method, endpoint template
+    and phase.
+    """
+
+    enabled = True
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """Create a new InMemoryMetrics object
+
+        :param tuple[float] buckets: the histogram bucket bounds in seconds
+        """
+        self.buckets = buckets
+
+        self._lock = threading.Lock()
+        self.timings = {}
+        self.responses = Counter()
+        self.bytes_sent = Counter()
+        self.bytes_received = Counter()
+        self.events = Counter()
+
+    def record_timing(self, method, endpoint, phase, duration):
+        key = (method, endpoint, phase)
+
+        with self._lock:
+            histogram = self.timings.get(key)
+            if histogram is None:
+                histogram = self.timings[key] = Histogram(self.buckets)
+
+            histogram.observe(duration)
+
+    def record_response(self, method, endpoint, status_code, bytes_sent,
+                        bytes_received):
+        with self._lock:
+            self.responses[(method, endpoint, status_code)] += 1
+            self.bytes_sent[(method, endpoint)] += bytes_sent
+            self.bytes_received[(method, endpoint)] += bytes_received
+
+    def record_event(self, method, endpoint, event):
+        with self._lock:
+            self.events[(method, endpoint, event)] += 1
+
+
+def _escape_label_value(value):
+    return str(value) \
+        .replace("\\", "\\\\") \
+        .replace("\n", "\\n") \
+        .replace('"', '\\"')
+
+
+def _format_labels(**labels):
+    return "{{{}}}".format(",".join(
+        '{}="{}"'.format(name, _escape_label_value(value))
+        for name, value in labels.items()
+    ))
+
+
+def _format_bound(bound):
+    if bound == float("inf"):
+        return "+Inf"
+
+    return repr(float(bound))
+
+
+def format_prometheus(metrics, namespace="clientlib"):
+    """Export metrics in the Prometheus text format
+
+    :param InMemoryMetrics metrics: the metrics to export
+    :param str namespace: the prefix of the metric names
+    :rtype: str
+    :return: the metrics
+    """
+    with metrics._lock:
+        timings = {
+            key: (histogram.cumulative_counts(), histogram.sum,
+                  histogram.count)
+            for key, histogram in metrics.timings.items()
+        }
+        responses = dict(metrics.responses)
+        bytes_sent = dict(metrics.bytes_sent)
+        bytes_received = dict(metrics.bytes_received)
+        events = dict(metrics.events)
+
+    lines = []
+
+    name = "{}_request_phase_seconds".format(namespace)
+    lines += [
+        "# HELP {} The duration of the request phases".format(name),
+        "# TYPE {} histogram".format(name),
+    ]
+    for (method, endpoint, phase), (counts, total, count) in sorted(
+            timings.items()):
+        for bound, bucket_count in counts:
+            lines.append("{}_bucket{} {}".format(
+                name,
+                _format_labels(
+                    method=method, endpoint=endpoint, phase=phase,
+                    le=_format_bound(bound)
+                ),
+                bucket_count
+            ))
+
+        labels = _format_labels(method=method, endpoint=endpoint, phase=phase)
+        lines.append("{}_sum{} {!r}".format(name, labels, total))
+        lines.append("{}_count{} {}".format(name, labels, count))
+
+    name = "{}_responses_total".format(namespace)
+    lines += [
+        "# HELP {} The number of responses".format(name),
+        "# TYPE {} counter".format(name),
+    ]
+    for (method, endpoint, status_code), count in sorted(responses.items()):
+        lines.append("{}{} {}".format(
+            name,
+            _format_labels(
+                method=method, endpoint=endpoint, status_code=status_code),
+            count
+        ))
+
+    for name, description, counter in (
+            ("request_bytes_total", "The size of the request bodies",
+             bytes_sent),
+            ("response_bytes_total",
+             "The size of the response bodies on the wire", bytes_received)):
+        name = "{}_{}".format(namespace, name)
+        lines += [
+            "# HELP {} {}".format(name, description),
+            "# TYPE {} counter".format(name),
+        ]
+        for (method, endpoint), count in sorted(counter.items()):
+            lines.append("{}{} {}".format(
+                name, _format_labels(method=method, endpoint=endpoint), count))
+
+    name = "{}_events_total".format(namespace)
+    lines += [
+        "# HELP {} The number of retries, hedges and cache lookups".format(
+            name),
+        "# TYPE {} counter".format(name),
+    ]
+    for (method, endpoint, event), count in sorted(events.items()):
+        lines.append("{}{} {}".format(
+            name,
+            _format_labels(method=method, endpoint=endpoint, event=event),
+            count
+        ))
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,146 @@
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover
+    msgspec = None
+
+try:
+    import ujson
+except ImportError:  # pragma: no cover
+    ujson = None
+
+
+class JSONCodec(object):
+    """JSON codec base class
+
+    A codec encodes the request payloads to bytes and decodes the response
+    bodies directly from bytes.
+    """
+
+    name = None
+
+    def encode(self, data):
+        """Encode an object to json
+
+        :param object data: the object to encode
+        :rtype: bytes
+        :return: the json document
+        """
+        raise NotImplementedError()
+
+    def decode(self, content):
+        """Decode a json document
+
+        :param bytes content: the json document
+        :rtype: object
+        :return: the decoded object
+        :raises ValueError: if the document isn't valid json
+        """
+        raise NotImplementedError()
+
+
+class StdlibJSONCodec(JSONCodec):
+    """JSON codec that uses the json module of the standard library"""
+
+    name = "json"
+
+    def encode(self, data):
+        return json.dumps(data, allow_nan=False).encode("utf-8")
+
+    def decode(self, content):
+        return json.loads(content)
+
+
+class OrjsonCodec(JSONCodec):
+    """JSON codec that uses orjson"""
+
+    name = "orjson"
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("orjson is required in order to use OrjsonCodec")
+
+    def encode(self, data):
+        return orjson.dumps(data)
+
+    def decode(self, content):
+        return orjson.loads(content)
+
+
+class MsgspecCodec(JSONCodec):
+    """JSON codec that uses msgspec"""
+
+    name = "msgspec"
+
+    def __init__(self):
+        if msgspec is None:
+            raise ImportError(
+                "msgspec is required in order to use MsgspecCodec")
+
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def encode(self, data):
+        return self._encoder.encode(data)
+
+    def decode(self, content):
+        return self._decoder.decode(content)
+
+
+class UjsonCodec(JSONCodec):
+    """JSON codec that uses ujson"""
+
+    name = "ujson"
+
+    def __init__(self):
+        if ujson is None:
+            raise ImportError("ujson is required in order to use UjsonCodec")
+
+    def encode(self, data):
+        return ujson.dumps(data, ensure_ascii=False).encode("utf-8")
+
+    def decode(self, content):
+        return ujson.loads(content)
+
+
+def get_available_codecs():
+    """Get the codecs whose libraries are installed
+
+    :rtype: list[JSONCodec]
+    :return: the codecs, fastest first
+    """
+    codecs = []
+
+    if orjson is not None:
+        codecs.append(OrjsonCodec())
+
+    if msgspec is not None:
+        codecs.append(MsgspecCodec())
+
+    if ujson is not None:
+        codecs.append(UjsonCodec())
+
+    codecs.append(StdlibJSONCodec())
+
+    return codecs
+
+
+def get_fastest_codec():
+    """Get the fastest available codec
+
+    The codecs of the third party libraries don't encode every payload like
+    the json module does, for example they reject dictionaries with non
+    string keys and integers that exceed 64 bits. The clients use the json
+    module by default and the fastest codec has to be selected explicitly
+    with ``Client(json_codec=get_fastest_codec())``.
+
+    :rtype: JSONCodec
+    :return: the codec
+    """
+    return get_available_codecs()[0]
@@ -0,0 +1,129 @@
+from collections.abc import Sequence
+from operator import index as to_index
+
+
+_NOT_LOADED = object()
+
+
+class LazyList(Sequence):
+    """List whose items are deserialized on first access
+
+    The deserialized items are cached, so every item is deserialized at most
+    once.
+    """
+
+    def __init__(self, items, load_item):
+        """Create a new LazyList object
+
+        :param list items: the raw items
+        :param callable load_item: the function that deserializes an item.
+        It is called with the item index and the raw item
+        """
+        self._items = items
+        self._load_item = load_item
+        self._loaded = [_NOT_LOADED] * len(items)
+
+    def _get(self, index):
+        item = self._loaded[index]
+
+        if item is _NOT_LOADED:
+            item = self._load_item(index, self._items[index])
+            self._loaded[index] = item
+
+        return item
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, index):
+        size = len(self._items)
+
+        if isinstance(index, slice):
+            return [self._get(i) for i in range(*index.indices(size))]
+
+        index = to_index(index)
+        if index < 0:
+            index += size
+
+        if not 0 <= index < size:
+            raise IndexError("list index out of range")
+
+        return self._get(index)
+
+    def __iter__(self):
+        for i in range(len(self._items)):
+            yield self._get(i)
+
+    def __eq__(self, other):
+        if not isinstance(other, (list, LazyList)):
+            return NotImplemented
+
+        return len(self) == len(other) and list(self) == list(other)
+
+    def __repr__(self):
+        loaded = sum(1 for item in self._loaded if item is not _NOT_LOADED)
+
+        return "<LazyList {} items, {} loaded>".format(len(self), loaded)
+
+
+class LazyEndpointResponse(object):
+    """Endpoint response whose data is deserialized on first access
+
+    The object can be unpacked to the response and data like an
+    EndpointResponse.
+    """
+
+    __slots__ = ("response", "_load", "_data")
+
+    def __init__(self, response, load):
+        """Create a new LazyEndpointResponse object
+
+        :param Response response: the api response
+        :param callable load: the function that returns the deserialized data
+        """
+        self.response = response
+        self._load = load
+        self._data = _NOT_LOADED
+
+    @property
+    def data(self):
+        """The deserialized response data
+
+        :raises ResponseDeserializationError: if the response can't be
+        deserialized
+        """
+        if self._data is _NOT_LOADED:
+            self._data = self._load()
+            self._load = None
+
+        return self._data
+
+    def __iter__(self):
+        yield self.response
+        yield self.data
+
+    def __repr__(self):
+        return "LazyEndpointResponse(response={!r})".format(self.response)
+
+
+def can_load_items_lazily(schema):
+    """Check if the items of a response can be deserialized one at a time
+
+    This is possible for the schemas with many=True that don't have any
+    hooks which process the whole collection.
+
+    :param Schema|CompiledSchema schema: the response schema
+    :rtype: boolean
+    :return: True if the items can be deserialized separately
+    """
+    # compiled schemas keep the marshmallow schema in the schema attribute
+    schema = getattr(schema, "schema", schema)
+
+    if not schema.many:
+        return False
+
+    return not any(
+        pass_many
+        for hooks in schema._hooks.values()
+        for _, pass_many, _ in hooks
+    )
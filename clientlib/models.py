@@ -2,3 +2,4 @@ from collections import namedtuple
 
 Response = namedtuple("Response", ["status_code", "headers", "json"])
 EndpointResponse = namedtuple("EndpointResponse", ["response", "data"])
+BatchResult = namedtuple("BatchResult", ["kwargs", "response", "error"])
@@ -0,0 +1,252 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from urllib.parse import urlsplit, parse_qsl
+
+from requests.utils import parse_header_links
+
+
+def _get_field(data, path):
+    for name in path.split("."):
+        if data is None:
+            return None
+
+        data = data.get(name)
+
+    return data
+
+
+class Pagination(object):
+    """Pagination specification base class"""
+
+    def __init__(self, items_field=None):
+        """Create a new Pagination object
+
+        :param str items_field: the response field that contains the page
+        items. Nested fields are separated with dots. The response itself is
+        the list of items when this is None
+        """
+        self.items_field = items_field
+
+    def extract_items(self, response):
+        """Get the items of a page
+
+        :param Response response: the page response
+        :rtype: list
+        :return: the page items
+        """
+        if self.items_field is None:
+            return response.json
+
+        return _get_field(response.json, self.items_field) or []
+
+    def first_page_params(self):
+        """Get the url parameters of the first page
+
+        :rtype: dict
+        :return: the url parameters
+        """
+        return {}
+
+    def next_page_params(self, params, response, items):
+        """Get the url parameters of the next page
+
+        :param dict params: the url parameters of the current page
+        :param Response response: the response of the current page
+        :param list items: the items of the current page
+        :rtype: dict|None
+        :return: the url parameters or None if this is the last page
+        """
+        raise NotImplementedError()
+
+
+class OffsetPagination(Pagination):
+    """Offset and limit pagination"""
+
+    def __init__(self, offset_param="offset", limit_param="limit", limit=100,
+                 items_field=None):
+        """Create a new OffsetPagination object
+
+        :param str offset_param: the offset url parameter
+        :param str limit_param: the limit url parameter
+        :param int limit: the number of items to request on every page
+        :param str items_field: the response field that contains the items
+        """
+        super(OffsetPagination, self).__init__(items_field)
+
+        self.offset_param = offset_param
+        self.limit_param = limit_param
+        self.limit = limit
+
+    def first_page_params(self):
+        return {
+            self.offset_param: 0,
+            self.limit_param: self.limit
+        }
+
+    def next_page_params(self, params, response, items):
+        limit = int(params[self.limit_param])
+
+        if len(items) < limit:
+            return None
+
+        return dict(
+            params,
+            **{self.offset_param: int(params[self.offset_param]) + len(items)}
+        )
+
+
+class PageNumberPagination(Pagination):
+    """Page number pagination
+
+    The last page is the first page that is empty or, if the page size is
+    known, the first page that has less items than the page size.
+    """
+
+    def __init__(self, page_param="page", first_page=1, page_size_param=None,
+                 page_size=None, items_field=None):
+        """Create a new PageNumberPagination object
+
+        :param str page_param: the page number url parameter
+        :param int first_page: the number of the first page
+        :param str page_size_param: the page size url parameter
+        :param int page_size: the number of items on every page
+        :param str items_field: the response field that contains the items
+        """
+        super(PageNumberPagination, self).__init__(items_field)
+
+        self.page_param = page_param
+        self.first_page = first_page
+        self.page_size_param = page_size_param
+        self.page_size = page_size
+
+    def first_page_params(self):
+        params = {self.page_param: self.first_page}
+
+        if self.page_size_param is not None and self.page_size is not None:
+            params[self.page_size_param] = self.page_size
+
+        return params
+
+    def next_page_params(self, params, response, items):
+        if not items:
+            return None
+
+        if self.page_size is not None and len(items) < self.page_size:
+            return None
+
+        return dict(
+            params,
+            **{self.page_param: int(params[self.page_param]) + 1}
+        )
+
+
+class CursorPagination(Pagination):
+    """Pagination with the cursor of the next page in the response body"""
+
+    def __init__(self, cursor_param="cursor", cursor_field="next_cursor",
+                 items_field="items"):
+        """Create a new CursorPagination object
+
+        :param str cursor_param: the cursor url parameter
+        :param str cursor_field: the response field that contains the cursor
+        of the next page. Nested fields are separated with dots
+        :param str items_field: the response field that contains the items
+        """
+        super(CursorPagination, self).__init__(items_field)
+
+        self.cursor_param = cursor_param
+        self.cursor_field = cursor_field
+
+    def next_page_params(self, params, response, items):
+        cursor = _get_field(response.json, self.cursor_field)
+
+        if not cursor:
+            return None
+
+        return dict(params, **{self.cursor_param: cursor})
+
+
+class LinkHeaderPagination(Pagination):
+    """Pagination with the next page url in the Link header
+
+    The url parameters of the next page are taken from the query of the next
+    link. The link is expected to point to the same endpoint.
+    """
+
+    def next_page_params(self, params, response, items):
+        for link in parse_header_links(response.headers.get("Link", "")):
+            if link.get("rel") == "next":
+                query = urlsplit(link["url"]).query
+
+                return dict(parse_qsl(query, keep_blank_values=True))
+
+        return None
+
+
+def iter_pages(fetch_page, pagination, params):
+    """Iterate over the pages of a paginated endpoint
+
+    The next page is requested on a background thread as soon as the current
+    page has been received, so that it is downloaded while the items of the
+    current page are consumed. The pages are requested with the context of
+    the iteration, so the deadline of the current operation applies to them.
+
+    :param fetch_page: a callable that accepts the url parameters of a page
+    and returns the page response
+    :param Pagination pagination: the pagination specification
+    :param dict params: the url parameters of the first page
+    :rtype: collections.Iterable[tuple[Response, list]]
+    :return: the page responses and their items
+    """
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(copy_context().run, fetch_page, params)
+
+        try:
+            while future is not None:
+                response = future.result()
+                items = pagination.extract_items(response)
+
+                params = pagination.next_page_params(params, response, items)
+                if params is not None:
+                    future = executor.submit(
+                        copy_context().run, fetch_page, params)
+                else:
+                    future = None
+
+                yield response, items
+        finally:
+            if future is not None:
+                future.cancel()
+
+
+async def aiter_pages(fetch_page, pagination, params):
+    """Asynchronously iterate over the pages of a paginated endpoint
+
+    The next page is requested on a separate task as soon as the current page
+    has been received.
+
+    :param fetch_page: a coroutine function that accepts the url parameters
+    of a page and returns the page response
+    :param Pagination pagination: the pagination specification
+    :param dict params: the url parameters of the first page
+    :rtype: collections.AsyncIterable[tuple[Response, list]]
+    :return: the page responses and their items
+    """
+    task = asyncio.ensure_future(fetch_page(params))
+
+    try:
+        while task is not None:
+            response = await task
+            items = pagination.extract_items(response)
+
+            params = pagination.next_page_params(params, response, items)
+            if params is not None:
+                task = asyncio.ensure_future(fetch_page(params))
+            else:
+                task = None
+
+            yield response, items
+    finally:
+        if task is not None:
+            task.cancel()
@@ -0,0 +1,276 @@
+import asyncio
+import multiprocessing
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import count
+
+from marshmallow.exceptions import ValidationError
+
+from clientlib.columnar import ColumnarLoader
+from clientlib.deserialization import CompiledSchema
+
+
+DEFAULT_THRESHOLD = 256 * 1024
+
+
+# the loaders of the worker processes, keyed by the loader token
+_loaders = {}
+
+
+def _create_loader(spec):
+    codec_class, schema, validation_sample_rate, columnar = \
+        pickle.loads(spec)
+
+    if columnar:
+        load = ColumnarLoader(schema).load
+    elif validation_sample_rate is not None:
+        load = CompiledSchema(schema, validation_sample_rate).load
+    else:
+        load = schema.load
+
+    return codec_class().decode, load
+
+
+def _get_shared_memory_class():
+    # imported on use, so that the endpoints can be imported without
+    # multiprocessing.shared_memory, which requires Python 3.8
+    from multiprocessing.shared_memory import SharedMemory
+
+    return SharedMemory
+
+
+def _read_shared_memory(name, size):
+    shared_memory = _get_shared_memory_class()(name=name)
+
+    try:
+        with shared_memory.buf[:size] as buffer:
+            return bytes(buffer)
+    finally:
+        shared_memory.close()
+
+
+def _load_shared(token, spec, name, size):
+    loader = _loaders.get(token)
+    if loader is None:
+        loader = _loaders[token] = _create_loader(spec)
+
+    decode, load = loader
+    content = _read_shared_memory(name, size)
+
+    # the errors are raised again with their messages only, since the
+    # original exceptions may reference objects that can't be pickled
+    try:
+        data = decode(content)
+    except (ValueError, TypeError) as e:
+        raise ValueError(str(e)) from None
+
+    try:
+        return load(data)
+    except ValidationError as e:
+        raise ValidationError(e.messages) from None
+
+
+def _release_shared_memory(shared_memory, future):
+    shared_memory.close()
+    shared_memory.unlink()
+
+
+class DeferredJSON(object):
+    """Response body whose decoding and deserialization is executed by a
+    ProcessPoolDeserializer
+
+    The body is loaded once, so the responses that are shared by coalesced
+    requests or stored in a cache are not deserialized again.
+    """
+
+    __slots__ = ("content", "_process_pool", "_json_codec", "_future",
+                 "_lock")
+
+    def __init__(self, process_pool, content, json_codec):
+        """Create a new DeferredJSON object
+
+        :param ProcessPoolDeserializer process_pool: the process pool
+        :param bytes content: the response body
+        :param JSONCodec json_codec: the codec of the response body
+        """
+        self.content = content
+        self._process_pool = process_pool
+        self._json_codec = json_codec
+        self._future = None
+        self._lock = threading.Lock()
+
+    def _submit(self, schema, columnar):
+        with self._lock:
+            if self._future is None:
+                self._future = self._process_pool.submit(
+                    content=self.content,
+                    schema=schema,
+                    columnar=columnar,
+                    json_codec=self._json_codec
+                )
+
+            return self._future
+
+    def load(self, schema, columnar=False):
+        """Decode and deserialize the response body
+
+        :param Schema|CompiledSchema schema: the response schema
+        :param boolean columnar: flag that indicates whether to load the
+        items in a ColumnarResult
+        :raises ValueError: if the body isn't valid json
+        :raises ValidationError: if the data is not valid
+        :return: the deserialized data
+        """
+        return self._submit(schema, columnar).result()
+
+    async def aload(self, schema, columnar=False):
+        """Decode and deserialize the response body without blocking the
+        event loop
+
+        :param Schema|CompiledSchema schema: the response schema
+        :param boolean columnar: flag that indicates whether to load the
+        items in a ColumnarResult
+        :raises ValueError: if the body isn't valid json
+        :raises ValidationError: if the data is not valid
+        :return: the deserialized data
+        """
+        return await asyncio.wrap_future(self._submit(schema, columnar))
+
+
+class ProcessPoolDeserializer(object):
+    """Process pool that decodes and deserializes large responses
+
+    Schema.load holds the GIL, so the deserialization of large responses
+    doesn't scale with the number of threads. The endpoints that use a
+    process pool keep sending the requests from their threads or event loop,
+    while the bodies that exceed the size threshold are decoded and
+    deserialized by the worker processes. The bodies are passed to the
+    workers through shared memory and the deserialized objects are pickled
+    back, so the response schemas, their post_load results and the json
+    codec class must be picklable. The codec class is instantiated without
+    arguments in the workers.
+
+    The columnar results are returned as typed arrays, which is the most
+    compact form to transfer.
+    """
+
+    def __init__(self, max_workers=None, threshold=DEFAULT_THRESHOLD,
+                 mp_context=None):
+        """Create a new ProcessPoolDeserializer object
+
+        :param int max_workers: the number of worker processes. The number
+        of processors is used when this is None
+        :param int threshold: the minimum size in bytes of the response
+        bodies that are deserialized in the worker processes. The smaller
+        bodies are deserialized inline
+        :param BaseContext mp_context: the multiprocessing context of the
+        workers. The spawn context is used when this is None, since forking a
+        process that runs threads isn't safe
+        """
+        self.max_workers = max_workers
+        self.threshold = threshold
+        self.mp_context = mp_context or multiprocessing.get_context("spawn")
+
+        self._lock = threading.Lock()
+        self._executor = None
+        self._tokens = count()
+        self._specs = {}
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=self.mp_context
+                )
+
+            return self._executor
+
+    def _create_spec(self, schema, columnar, json_codec):
+        validation_sample_rate = None
+        if isinstance(schema, CompiledSchema):
+            validation_sample_rate = schema.validation_sample_rate
+            schema = schema.schema
+
+        return pickle.dumps(
+            (type(json_codec), schema, validation_sample_rate, columnar))
+
+    def _get_spec(self, schema, columnar, json_codec):
+        key = (id(schema), columnar, type(json_codec))
+
+        with self._lock:
+            spec = self._specs.get(key)
+            if spec is None:
+                # the schema is kept in the entry, so that its id is not
+                # reused
+                spec = self._specs[key] = (
+                    next(self._tokens),
+                    self._create_spec(schema, columnar, json_codec),
+                    schema
+                )
+
+        return spec[0], spec[1]
+
+    def should_offload(self, content):
+        """Check if a response body must be deserialized in the workers
+
+        :param bytes content: the response body
+        :rtype: boolean
+        :return: True if the body exceeds the threshold
+        """
+        return len(content) >= self.threshold
+
+    def defer(self, content, json_codec):
+        """Create the deferred json of a response body
+
+        :param bytes content: the response body
+        :param JSONCodec json_codec: the codec of the response body
+        :rtype: DeferredJSON
+        :return: the deferred json
+        """
+        return DeferredJSON(self, content, json_codec)
+
+    def submit(self, content, schema, columnar, json_codec):
+        """Submit a response body to the workers
+
+        :param bytes content: the response body
+        :param Schema|CompiledSchema schema: the response schema
+        :param boolean columnar: flag that indicates whether to load the
+        items in a ColumnarResult
+        :param JSONCodec json_codec: the codec of the response body
+        :rtype: concurrent.futures.Future
+        :return: the future of the deserialized data
+        """
+        token, spec = self._get_spec(schema, columnar, json_codec)
+
+        shared_memory = _get_shared_memory_class()(
+            create=True, size=max(len(content), 1))
+        shared_memory.buf[:len(content)] = content
+
+        try:
+            future = self._get_executor().submit(
+                _load_shared, token, spec, shared_memory.name, len(content))
+        except BaseException:
+            _release_shared_memory(shared_memory, None)
+            raise
+
+        future.add_done_callback(
+            partial(_release_shared_memory, shared_memory))
+
+        return future
+
+    def close(self):
+        """Stop the worker processes"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+
+        if executor is not None:
+            executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,174 @@
+import asyncio
+import threading
+import time
+
+from clientlib.exceptions import DeadlineExceeded
+from clientlib.timeouts import get_remaining_time
+
+
+class TokenBucketRateLimiter(object):
+    """Token bucket rate limiter
+
+    The bucket is refilled continuously at the configured rate and every
+    request consumes one token. A waiting request reserves its token in
+    advance, so concurrent callers are scheduled one after the other at
+    exactly the configured rate instead of competing for every new token.
+    A capacity of 1 turns the limiter into a leaky bucket which does not
+    allow any bursts.
+
+    A request doesn't wait for a token beyond the deadline of the current
+    operation. The limiter is safe to share between threads, endpoints and
+    clients.
+    """
+
+    def __init__(self, rate, capacity=None, blocking=True, timeout=None,
+                 adaptive=False):
+        """Create a new TokenBucketRateLimiter object
+
+        :param float rate: the number of requests per second
+        :param float capacity: the maximum burst size. This defaults to one
+        second worth of requests
+        :param boolean blocking: flag that indicates whether to wait for a
+        token or to fail immediately when the bucket is empty
+        :param float timeout: the maximum number of seconds to wait for a
+        token when blocking. There isn't a limit when this is None
+        :param boolean adaptive: flag that indicates whether to adjust the
+        available tokens using the X-RateLimit-Remaining and
+        X-RateLimit-Reset response headers
+        :raises ValueError: if the rate isn't positive or the capacity is less
+        than 1
+        """
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None
+                              else max(1.0, self.rate))
+
+        if self.rate <= 0:
+            raise ValueError("the rate must be positive")
+
+        if self.capacity < 1:
+            raise ValueError("the capacity must be at least 1")
+        self.blocking = blocking
+        self.timeout = timeout
+        self.adaptive = adaptive
+
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity,
+            self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+
+    def _reserve(self, blocking, timeout):
+        remaining = get_remaining_time()
+
+        with self._lock:
+            self._refill()
+
+            wait = max(0.0, (1 - self._tokens) / self.rate)
+            if wait > 0 and (not blocking or
+                             (timeout is not None and wait > timeout)):
+                return None
+
+            if wait > 0 and remaining is not None and wait > remaining:
+                raise DeadlineExceeded(
+                    reason="the deadline would be exceeded while waiting "
+                           "for a rate limit token"
+                )
+
+            # the balance can become negative. The callers that come later
+            # have to wait for the debt to be repaid
+            self._tokens -= 1
+
+            return wait
+
+    def _get_options(self, blocking, timeout):
+        return (
+            self.blocking if blocking is None else blocking,
+            self.timeout if timeout is None else timeout
+        )
+
+    def acquire(self, blocking=None, timeout=None):
+        """Acquire a token
+
+        :param boolean blocking: flag that indicates whether to wait for a
+        token. The default of the limiter is used when this is None
+        :param float timeout: the maximum number of seconds to wait. The
+        default of the limiter is used when this is None
+        :rtype: boolean
+        :return: True if the token was acquired
+        :raises DeadlineExceeded: if the token can't be acquired before the
+        deadline of the current operation
+        """
+        wait = self._reserve(*self._get_options(blocking, timeout))
+        if wait is None:
+            return False
+
+        if wait > 0:
+            time.sleep(wait)
+
+        return True
+
+    async def acquire_async(self, blocking=None, timeout=None):
+        """Acquire a token without blocking the event loop
+
+        :param boolean blocking: flag that indicates whether to wait for a
+        token. The default of the limiter is used when this is None
+        :param float timeout: the maximum number of seconds to wait. The
+        default of the limiter is used when this is None
+        :rtype: boolean
+        :return: True if the token was acquired
+        :raises DeadlineExceeded: if the token can't be acquired before the
+        deadline of the current operation
+        """
+        wait = self._reserve(*self._get_options(blocking, timeout))
+        if wait is None:
+            return False
+
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+        return True
+
+    def _parse_reset(self, value):
+        reset = float(value)
+
+        # some apis send the time of the reset as a unix timestamp instead
+        # of the number of seconds until the reset
+        if reset > 1000000000:
+            reset -= time.time()
+
+        return max(0.0, reset)
+
+    def update(self, headers):
+        """Adjust the available tokens using the rate limit response headers
+
+        This does nothing when the limiter is not adaptive.
+
+        :param dict headers: the response headers
+        """
+        if not self.adaptive:
+            return
+
+        try:
+            remaining = headers.get("X-RateLimit-Remaining")
+            remaining = float(remaining) if remaining is not None else None
+            reset = headers.get("X-RateLimit-Reset")
+            reset = self._parse_reset(reset) if reset is not None else None
+        except ValueError:
+            return
+
+        if remaining is None:
+            return
+
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, remaining)
+
+            if remaining < 1 and reset is not None:
+                # the next token becomes available when the quota resets
+                self._tokens = min(self._tokens, 1 - reset * self.rate)
@@ -1,24 +1,144 @@
 import logging
+from functools import lru_cache
+from time import perf_counter
 
-from requests import Request
-from requests.exceptions import RequestException, Timeout
+from requests import Request, PreparedRequest
+from requests.exceptions import (
+    RequestException, Timeout, ConnectionError as RequestsConnectionError
+)
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
 
+from clientlib.instrumentation import NO_INSTRUMENTATION
+from clientlib.json_codecs import StdlibJSONCodec
 from clientlib.models import Response
+from clientlib.streaming import iter_json_array, aiter_json_array
+from clientlib.timeouts import (
+    Timeout as TimeoutSettings, clamp_timeout, get_remaining_time,
+    is_deadline_exceeded
+)
+from clientlib.transports import RequestsTransport, create_httpx_timeout
+from clientlib.urls import URLTemplate
 from clientlib.exceptions import (
-    InvalidResponseContentType, EndpointTimeout, EndpointRequestError
+    InvalidResponseContentType, EndpointTimeout, EndpointRequestError,
+    EndpointConnectionError, DeadlineExceeded
 )
 
 
 logger = logging.getLogger(__name__)
 
+STREAM_CHUNK_SIZE = 64 * 1024
+
+DEFAULT_JSON_CODEC = StdlibJSONCodec()
+
+
+@lru_cache(maxsize=256)
+def compile_url_template(base_url, endpoint):
+    """Compile the url template of an endpoint
+
+    :param str base_url: the api base url
+    :param str endpoint: the endpoint path template
+    :rtype: URLTemplate
+    :return: the compiled url template
+    """
+    return URLTemplate(endpoint, base_url)
+
+
+def can_use_request_prototype(base_url, endpoint, auth):
+    """Check if the requests of an endpoint can be created from a prototype
+
+    The urls of the prototype requests are not normalized by requests, so the
+    base url and the endpoint must already be valid ascii urls without
+    credentials.
+
+    :param str base_url: the api base url
+    :param str endpoint: the endpoint path template
+    :param AuthBase auth: the authenticator
+    :rtype: boolean
+    :return: True if a prototype can be used
+    """
+    url = base_url + endpoint
+
+    return url.isascii() and "@" not in url and " " not in url and \
+        (auth is None or callable(auth))
+
+
+class RequestPrototype(object):
+    """Prepared request prototype
+
+    The method and the static headers of the requests of an endpoint are
+    prepared once. A request is then created by copying the prototype and
+    only setting its url, query, body and authentication, which is a lot
+    cheaper than preparing a requests.Request object.
+    """
+
+    def __init__(self, method, auth=None):
+        """Create a new RequestPrototype object
+
+        :param str method: the http method
+        :param AuthBase auth: the authenticator. It is applied on every
+        request, so that changes to its credentials take effect immediately
+        """
+        prototype = PreparedRequest()
+        prototype.prepare_method(method)
+        prototype.prepare_headers(None)
+        # requests stores the cookies of the redirect responses in the cookie
+        # jar of the request, so every copy needs one
+        prototype.prepare_cookies(None)
+        prototype.prepare_body(data=None, files=None, json=None)
+        prototype.prepare_hooks(None)
+
+        self._prototype = prototype
+        self._auth = auth
+
+    def prepare(self, url, params=None, body=None, headers=None):
+        """Create a prepared request
+
+        :param str url: the request url
+        :param dict params: the url parameters
+        :param bytes body: the encoded request payload
+        :param dict headers: additional request headers
+        :rtype: PreparedRequest
+        :return: the prepared request
+        """
+        request = self._prototype.copy()
+
+        if params:
+            query = PreparedRequest._encode_params(params)
+            if query:
+                url = "{}{}{}".format(url, "&" if "?" in url else "?", query)
+
+        request.url = url
+
+        if headers:
+            request.headers.update(headers)
+
+        if body is not None:
+            request.prepare_body(data=body, files=None)
+
+        if self._auth is not None:
+            request.prepare_auth(self._auth, url)
+
+        return request
+
 
 class APIRequest(object):
     """API request object"""
 
     def __init__(self, session, base_url, method, endpoint, args=None,
-                 params=None, json=None, auth=None, timeout=5, verify=True):
+                 params=None, json=None, auth=None, timeout=5, verify=True,
+                 headers=None, stream=False, url_template=None,
+                 prototype=None, json_codec=None, instrumentation=None,
+                 transport=None, compression=None, process_pool=None):
         """Create a new APIRequest object
 
+        When stream is True the body of a successful response must contain a
+        json array. The body is not read in advance and the json attribute of
+        the response is an iterator over the items of the array.
+
         :param Session session: the session object to use for the requests
         :param str base_url: the api base url
         :param str method: the http method to use
@@ -27,8 +147,33 @@ class APIRequest(object):
         :param dict params: the request url parameters
         :param dict json: the request payload
         :param AuthBase auth: the authenticator object to use
-        :param int timeout: the request timeout
+        :param int|float|tuple|Timeout timeout: the request timeout, a
+        (connect, read) tuple or a Timeout object. The timeouts are limited
+        to the time that remains until the deadline of the current operation
         :param boolean verify: flag that indicated whether to verify ssl
+        :param dict headers: additional request headers
+        :param boolean stream: flag that indicates whether to stream the
+        response
+        :param URLTemplate url_template: the compiled url template of the
+        endpoint, prefixed with the base url. It is compiled from the base
+        url and the endpoint when this is None
+        :param RequestPrototype prototype: the prototype to create the
+        prepared request from. The request is prepared by requests when this
+        is None
+        :param JSONCodec json_codec: the codec to encode the payload and
+        decode the response with. The json module of the standard library is
+        used when this is None
+        :param Instrumentation instrumentation: the instrumentation that the
+        request timings and responses are reported to
+        :param Transport transport: the transport to send the request with.
+        The request is sent with the session when this is None
+        :param Compression compression: the compression settings of the
+        request. When this is None the payload is not compressed and the
+        response is requested uncompressed
+        :param ProcessPoolDeserializer process_pool: the process pool that
+        deserializes the large response bodies. The json attribute of the
+        successful responses whose body exceeds the threshold of the pool is
+        a DeferredJSON object
         """
         self.session = session
         self.base_url = base_url
@@ -40,42 +185,182 @@ class APIRequest(object):
         self.auth = auth
         self.timeout = timeout
         self.verify = verify
+        self.headers = headers
+        self.stream = stream
+        self.url_template = url_template or \
+            compile_url_template(base_url, endpoint)
+        self.prototype = prototype
+        self.json_codec = json_codec or DEFAULT_JSON_CODEC
+        self.instrumentation = instrumentation or NO_INSTRUMENTATION
+        self.transport = transport or self._create_default_transport()
+        self.compression = compression
+        self.process_pool = process_pool
 
-    def _create_endpoint(self):
-        if self.args is None:
-            return self.endpoint
-        else:
-            return self.endpoint.format(**self.args)
+    def _create_default_transport(self):
+        return RequestsTransport(self.session)
+
+    def _record_timing(self, phase, start):
+        self.instrumentation.record_timing(
+            self.method, self.endpoint, phase, perf_counter() - start)
+
+    def _get_timeout(self):
+        timeout = self.timeout
+        if isinstance(timeout, TimeoutSettings):
+            timeout = timeout.get_timeouts(self.method, self.endpoint)
+
+        remaining = get_remaining_time()
+        if remaining is None:
+            return timeout
+
+        if remaining <= 0:
+            raise self._create_timeout_error()
+
+        return clamp_timeout(timeout, remaining)
+
+    def _start_latency_measurement(self):
+        if isinstance(self.timeout, TimeoutSettings) and self.timeout.adaptive:
+            return perf_counter()
+
+        return None
+
+    def _record_latency(self, start):
+        if start is not None:
+            self.timeout.record_latency(
+                self.method, self.endpoint, perf_counter() - start)
 
     def _create_url(self):
-        return "{base_url}{endpoint}".format(
-            base_url=self.base_url,
-            endpoint=self._create_endpoint()
-        )
+        return self.url_template.render(self.args)
+
+    def _create_body(self):
+        headers = self.headers
+        if self.compression is not None:
+            headers = dict(self.compression.headers, **(headers or {}))
+
+        if self.json is None:
+            return None, headers
+
+        body = self.json_codec.encode(self.json)
+        headers = dict(headers or {}, **{"Content-Type": "application/json"})
+
+        if self.compression is not None \
+                and self.compression.should_compress(body):
+            body = self.compression.compress(body)
+            headers["Content-Encoding"] = "gzip"
+
+        return body, headers
+
+    def _build_url(self):
+        if not self.instrumentation.enabled:
+            return self._create_url()
+
+        start = perf_counter()
+        url = self._create_url()
+        self._record_timing("url_build", start)
+
+        return url
+
+    def _create_request(self, url):
+        body, headers = self._create_body()
 
-    def _create_request(self):
         return Request(
             method=self.method,
-            url=self._create_url(),
+            url=url,
+            headers=headers,
             params=self.params,
-            json=self.json,
+            data=body,
             auth=self.auth
         )
 
+    def _prepare_request(self):
+        url = self._build_url()
+
+        if self.prototype is None:
+            return self._create_request(url).prepare()
+
+        body, headers = self._create_body()
+
+        return self.prototype.prepare(
+            url=url,
+            params=self.params,
+            body=body,
+            headers=headers
+        )
+
     def _send_request(self):
-        request = self._create_request()
-        prepared_request = request.prepare()
+        timeout = self._get_timeout()
+        prepared_request = self._prepare_request()
 
-        with self.session:
-            return self.session.send(
+        if not self.instrumentation.enabled:
+            return self.transport.send(
                 request=prepared_request,
+                timeout=timeout,
                 verify=self.verify,
-                timeout=self.timeout
+                stream=self.stream
             )
 
+        # the response is streamed in order to measure the time to the
+        # first byte separately from the time to read the body
+        start = perf_counter()
+        response = self.transport.send(
+            request=prepared_request,
+            timeout=timeout,
+            verify=self.verify,
+            stream=True
+        )
+        self._record_timing("ttfb", start)
+
+        bytes_received = 0
+        if not self.stream:
+            start = perf_counter()
+            response.content
+            self._record_timing("body_read", start)
+            bytes_received = self._get_bytes_received(response)
+
+        self._record_response(prepared_request, response, bytes_received)
+
+        return response
+
+    def _get_bytes_received(self, response):
+        # the size of the body on the wire, which is smaller than the content
+        # of the compressed responses
+        size = response.raw.tell()
+
+        return size if isinstance(size, int) else len(response.content)
+
+    def _record_response(self, prepared_request, response, bytes_received):
+        self.instrumentation.record_response(
+            method=self.method,
+            endpoint=self.endpoint,
+            status_code=response.status_code,
+            bytes_sent=len(prepared_request.body or b""),
+            bytes_received=bytes_received
+        )
+
+    def _decode(self, content):
+        if not self.instrumentation.enabled:
+            return self.json_codec.decode(content)
+
+        start = perf_counter()
+        data = self.json_codec.decode(content)
+        self._record_timing("json_decode", start)
+
+        return data
+
+    def _can_defer(self, response):
+        return self.process_pool is not None \
+            and 200 <= response.status_code < 300 \
+            and self.process_pool.should_offload(response.content)
+
     def _extract_data(self, response):
+        if response.status_code == 304:
+            # a not modified response doesn't have a body
+            return None
+
+        if self._can_defer(response):
+            return self.process_pool.defer(response.content, self.json_codec)
+
         try:
-            return response.json()
+            return self._decode(response.content)
         except (ValueError, TypeError) as e:
             logger.exception("failed to convert response content to json")
 
@@ -84,37 +369,170 @@ class APIRequest(object):
                 content=response.text
             ) from e
 
-    def execute(self):
-        """Execute the api request
+    def _create_stream_content_error(self, response):
+        logger.exception("failed to decode the streamed json array")
+
+        return InvalidResponseContentType(status_code=response.status_code)
+
+    def _stream_data(self, response):
+        chunks = response.iter_content(chunk_size=STREAM_CHUNK_SIZE)
 
-        :rtype: Response
-        :return: the request result
-        """
         try:
-            response = self._send_request()
+            yield from iter_json_array(chunks)
         except Timeout as e:
-            logger.error("a timeout occurred while executing request")
-
-            raise EndpointTimeout(
-                reason="a timeout occurred while executing request",
-                base_url=self.base_url,
-                method=self.method,
-                endpoint=self.endpoint
-            ) from e
+            raise self._create_timeout_error() from e
         except RequestException as e:
-            logger.exception("an error occurred while executing request")
+            raise self._create_request_error() from e
+        except ValueError as e:
+            raise self._create_stream_content_error(response) from e
+        finally:
+            response.close()
+
+    def _create_timeout_error(self):
+        if is_deadline_exceeded():
+            logger.error("the deadline of the request has been exceeded")
 
-            raise EndpointRequestError(
-                reason="an error occurred while executing request",
+            return DeadlineExceeded(
+                reason="the deadline of the request has been exceeded",
                 base_url=self.base_url,
                 method=self.method,
                 endpoint=self.endpoint
-            ) from e
+            )
 
-        json = self._extract_data(response)
+        logger.error("a timeout occurred while executing request")
+
+        return EndpointTimeout(
+            reason="a timeout occurred while executing request",
+            base_url=self.base_url,
+            method=self.method,
+            endpoint=self.endpoint
+        )
+
+    def _create_request_error(self, error_class=EndpointRequestError):
+        logger.exception("an error occurred while executing request")
+
+        return error_class(
+            reason="an error occurred while executing request",
+            base_url=self.base_url,
+            method=self.method,
+            endpoint=self.endpoint
+        )
+
+    def _create_response(self, response):
+        if self.stream and 200 <= response.status_code < 300:
+            json = self._stream_data(response)
+        else:
+            json = self._extract_data(response)
 
         return Response(
             status_code=response.status_code,
             headers=response.headers,
             json=json
         )
+
+    def execute(self):
+        """Execute the api request
+
+        :rtype: Response
+        :return: the request result
+        """
+        start = self._start_latency_measurement()
+
+        try:
+            response = self._send_request()
+        except Timeout as e:
+            self._record_latency(start)
+            raise self._create_timeout_error() from e
+        except RequestsConnectionError as e:
+            raise self._create_request_error(EndpointConnectionError) from e
+        except RequestException as e:
+            raise self._create_request_error() from e
+
+        self._record_latency(start)
+
+        return self._create_response(response)
+
+
+class AsyncAPIRequest(APIRequest):
+    """Asynchronous API request object
+
+    The request is prepared exactly like an APIRequest, so that the
+    authenticators keep working, and it is then sent using an
+    httpx.AsyncClient session.
+    """
+
+    def _create_default_transport(self):
+        # the requests are sent with the httpx session, not with a transport
+        return None
+
+    async def _send_request(self):
+        timeout = self._get_timeout()
+        prepared_request = self._prepare_request()
+
+        request = self.session.build_request(
+            method=prepared_request.method,
+            url=prepared_request.url,
+            headers=dict(prepared_request.headers),
+            content=prepared_request.body,
+            timeout=create_httpx_timeout(timeout)
+        )
+
+        if not self.instrumentation.enabled:
+            response = await self.session.send(request, stream=self.stream)
+
+            if self.stream and not (200 <= response.status_code < 300):
+                await response.aread()
+
+            return response
+
+        start = perf_counter()
+        response = await self.session.send(request, stream=True)
+        self._record_timing("ttfb", start)
+
+        bytes_received = 0
+        if not self.stream or not (200 <= response.status_code < 300):
+            start = perf_counter()
+            await response.aread()
+            bytes_received = response.num_bytes_downloaded
+            self._record_timing("body_read", start)
+
+        self._record_response(prepared_request, response, bytes_received)
+
+        return response
+
+    async def _stream_data(self, response):
+        chunks = response.aiter_bytes(chunk_size=STREAM_CHUNK_SIZE)
+
+        try:
+            async for item in aiter_json_array(chunks):
+                yield item
+        except httpx.TimeoutException as e:
+            raise self._create_timeout_error() from e
+        except httpx.HTTPError as e:
+            raise self._create_request_error() from e
+        except ValueError as e:
+            raise self._create_stream_content_error(response) from e
+        finally:
+            await response.aclose()
+
+    async def execute(self):
+        """Execute the api request
+
+        :rtype: Response
+        :return: the request result
+        """
+        start = self._start_latency_measurement()
+
+        try:
+            response = await self._send_request()
+        except httpx.TimeoutException as e:
+            self._record_latency(start)
+            raise self._create_timeout_error() from e
+        except (httpx.ConnectError, httpx.RemoteProtocolError) as e:
+            raise self._create_request_error(EndpointConnectionError) from e
+        except httpx.HTTPError as e:
+            raise self._create_request_error() from e
+
+        self._record_latency(start)
+
+        return self._create_response(response)
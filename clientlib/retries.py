@@ -0,0 +1,271 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+
+from clientlib.exceptions import EndpointTimeout, EndpointConnectionError
+from clientlib.timeouts import get_remaining_time
+
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = frozenset(
+    ["GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"])
+
+
+def parse_retry_after(value):
+    """Parse the value of a Retry-After header
+
+    :param str value: the header value. This can be a number of seconds or
+    an http date
+    :rtype: float|None
+    :return: the number of seconds to wait or None if the value is invalid
+    """
+    if value is None:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryBudget(object):
+    """Limits the number of retries relative to the number of requests
+
+    Every request deposits a fraction of a retry in the budget and every
+    retry withdraws a whole one. A small number of retries per second is
+    always allowed, so that clients with low traffic can still retry. When
+    an upstream fails completely the retries are limited to a fraction of the
+    traffic instead of multiplying it.
+    """
+
+    def __init__(self, ratio=0.1, min_retries_per_second=1.0,
+                 max_balance=100):
+        """Create a new RetryBudget object
+
+        :param float ratio: the number of retries allowed per request
+        :param float min_retries_per_second: the number of retries that are
+        allowed every second regardless of the traffic
+        :param float max_balance: the maximum number of retries that can be
+        accumulated
+        """
+        self.ratio = ratio
+        self.min_retries_per_second = min_retries_per_second
+        self.max_balance = max_balance
+
+        self._balance = max_balance
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _deposit(self, amount):
+        self._balance = min(self.max_balance, self._balance + amount)
+
+    def record_request(self):
+        """Record the execution of a request"""
+        with self._lock:
+            self._deposit(self.ratio)
+
+    def try_withdraw(self):
+        """Try to withdraw a retry from the budget
+
+        :rtype: boolean
+        :return: True if the retry is allowed
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._deposit(
+                (now - self._updated_at) * self.min_retries_per_second)
+            self._updated_at = now
+
+            if self._balance < 1:
+                return False
+
+            self._balance -= 1
+
+            return True
+
+
+DEFAULT_RETRY_BUDGET = RetryBudget()
+
+
+class RetryPolicy(object):
+    """Retry policy with exponential backoff and jitter
+
+    Timeouts, connection errors and responses with one of the retryable
+    status codes are retried. Only idempotent requests are retried unless
+    the policy explicitly allows otherwise. All the retries are also subject
+    to a retry budget which by default is shared by the whole process.
+    """
+
+    def __init__(self, max_retries=3, backoff_factor=0.1, max_backoff=10,
+                 jitter=True, status_codes=(429, 502, 503, 504),
+                 retry_non_idempotent=False, respect_retry_after=True,
+                 budget=DEFAULT_RETRY_BUDGET):
+        """Create a new RetryPolicy object
+
+        :param int max_retries: the maximum number of retries of a request
+        :param float backoff_factor: the backoff of the first retry in
+        seconds. The backoff is doubled on every retry
+        :param float max_backoff: the maximum backoff in seconds. A response
+        whose Retry-After header asks for a longer wait is not retried
+        :param boolean jitter: flag that indicates whether to randomize the
+        backoff between zero and its exponential value
+        :param tuple[int] status_codes: the response status codes to retry
+        :param boolean retry_non_idempotent: flag that indicates whether to
+        retry requests with non idempotent methods, like POST
+        :param boolean respect_retry_after: flag that indicates whether to
+        wait for the time requested in the Retry-After response header
+        :param RetryBudget budget: the retry budget or None to disable it
+        """
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.status_codes = frozenset(status_codes)
+        self.retry_non_idempotent = retry_non_idempotent
+        self.respect_retry_after = respect_retry_after
+        self.budget = budget
+
+    def can_retry_method(self, method):
+        """Check if requests with the given method can be retried
+
+        :param str method: the http method
+        :rtype: boolean
+        :return: True if the requests can be retried
+        """
+        return self.retry_non_idempotent or \
+            method.upper() in IDEMPOTENT_METHODS
+
+    def get_backoff(self, attempt):
+        """Get the backoff before a retry
+
+        :param int attempt: the number of the retry, starting from 0
+        :rtype: float
+        :return: the number of seconds to wait
+        """
+        backoff = min(self.max_backoff, self.backoff_factor * (2 ** attempt))
+
+        if self.jitter:
+            backoff = random.uniform(0, backoff)
+
+        return backoff
+
+    def _get_response_delay(self, attempt, response):
+        if response.status_code not in self.status_codes:
+            return None
+
+        if self.respect_retry_after:
+            retry_after = parse_retry_after(
+                response.headers.get("Retry-After"))
+
+            if retry_after is not None:
+                return retry_after if retry_after <= self.max_backoff else None
+
+        return self.get_backoff(attempt)
+
+    def _get_delay(self, attempt, response=None):
+        # the response is None when the attempt failed with a timeout or a
+        # connection error
+        if attempt >= self.max_retries:
+            return None
+        elif response is None:
+            delay = self.get_backoff(attempt)
+        else:
+            delay = self._get_response_delay(attempt, response)
+
+        if delay is None:
+            return None
+
+        remaining = get_remaining_time()
+        if remaining is not None and delay >= remaining:
+            logger.warning("the deadline doesn't allow another retry")
+
+            return None
+
+        if self.budget is not None and not self.budget.try_withdraw():
+            logger.warning("the retry budget has been exhausted")
+
+            return None
+
+        logger.warning("retrying request in %.3f seconds", delay)
+
+        return delay
+
+    def execute(self, function, on_retry=None):
+        """Execute a request and retry it according to the policy
+
+        :param function: a callable that executes the request and returns a
+        Response object
+        :param callable on_retry: a callable that is called before every
+        retry
+        :rtype: Response
+        :return: the response of the last attempt
+        """
+        if self.budget is not None:
+            self.budget.record_request()
+
+        attempt = 0
+        while True:
+            try:
+                response = function()
+            except (EndpointTimeout, EndpointConnectionError):
+                delay = self._get_delay(attempt)
+                if delay is None:
+                    raise
+            else:
+                delay = self._get_delay(attempt, response=response)
+                if delay is None:
+                    return response
+
+            if on_retry is not None:
+                on_retry()
+
+            time.sleep(delay)
+            attempt += 1
+
+    async def execute_async(self, function, on_retry=None):
+        """Execute a request asynchronously and retry it according to the
+        policy
+
+        :param function: a coroutine function that executes the request and
+        returns a Response object
+        :param callable on_retry: a callable that is called before every
+        retry
+        :rtype: Response
+        :return: the response of the last attempt
+        """
+        if self.budget is not None:
+            self.budget.record_request()
+
+        attempt = 0
+        while True:
+            try:
+                response = await function()
+            except (EndpointTimeout, EndpointConnectionError):
+                delay = self._get_delay(attempt)
+                if delay is None:
+                    raise
+            else:
+                delay = self._get_delay(attempt, response=response)
+                if delay is None:
+                    return response
+
+            if on_retry is not None:
+                on_retry()
+
+            await asyncio.sleep(delay)
+            attempt += 1
@@ -0,0 +1,150 @@
+import codecs
+import json
+
+
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = ",]" + _WHITESPACE
+
+_BEFORE_ARRAY = 0
+_FIRST_ITEM = 1
+_ITEM = 2
+_AFTER_ITEM = 3
+_DONE = 4
+
+
+class JSONArrayDecoder(object):
+    """Incremental decoder for documents that contain a top level json array
+
+    The document is fed to the decoder in chunks and the items of the array
+    are returned as soon as they have been received completely, so only the
+    current item has to be kept in memory.
+    """
+
+    def __init__(self, encoding="utf-8"):
+        """Create a new JSONArrayDecoder object
+
+        :param str encoding: the document encoding
+        """
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder(encoding)()
+        self._buffer = ""
+        self._state = _BEFORE_ARRAY
+
+    def _skip_whitespace(self, position):
+        buffer = self._buffer
+
+        while position < len(buffer) and buffer[position] in _WHITESPACE:
+            position += 1
+
+        return position
+
+    def _decode_items(self, final):
+        items = []
+        buffer = self._buffer
+        position = self._skip_whitespace(0)
+
+        while position < len(buffer):
+            state = self._state
+            character = buffer[position]
+
+            if state == _BEFORE_ARRAY:
+                if character != "[":
+                    raise ValueError("the document is not a json array")
+                self._state = _FIRST_ITEM
+                position += 1
+            elif state == _FIRST_ITEM and character == "]":
+                self._state = _DONE
+                position += 1
+            elif state in (_FIRST_ITEM, _ITEM):
+                try:
+                    item, end = self._decoder.raw_decode(buffer, position)
+                except ValueError:
+                    if final:
+                        raise
+                    break
+
+                # a number is complete only when it is followed by a
+                # delimiter, since the rest of its digits, fraction or
+                # exponent might be in the next chunk
+                if not final and isinstance(item, (int, float)) and \
+                        (end == len(buffer) or buffer[end] not in _DELIMITERS):
+                    break
+
+                items.append(item)
+                self._state = _AFTER_ITEM
+                position = end
+            elif state == _AFTER_ITEM and character == ",":
+                self._state = _ITEM
+                position += 1
+            elif state == _AFTER_ITEM and character == "]":
+                self._state = _DONE
+                position += 1
+            else:
+                raise ValueError(
+                    "unexpected character {!r} at position {}".format(
+                        character, position)
+                )
+
+            position = self._skip_whitespace(position)
+
+        self._buffer = buffer[position:]
+
+        return items
+
+    def feed(self, data):
+        """Feed a chunk of the document to the decoder
+
+        :param bytes data: the document chunk
+        :rtype: list
+        :return: the array items that have been completed by this chunk
+        """
+        self._buffer += self._text_decoder.decode(data)
+
+        return self._decode_items(final=False)
+
+    def close(self):
+        """Signal the end of the document
+
+        :rtype: list
+        :return: the remaining array items
+        :raises ValueError: if the document isn't a complete json array
+        """
+        self._buffer += self._text_decoder.decode(b"", final=True)
+        items = self._decode_items(final=True)
+
+        if self._state != _DONE:
+            raise ValueError("the json array is incomplete")
+
+        return items
+
+
+def iter_json_array(chunks):
+    """Iterate over the items of a json array document
+
+    :param chunks: an iterable with the chunks of the document
+    :rtype: collections.Iterable
+    :return: the array items
+    """
+    decoder = JSONArrayDecoder()
+
+    for chunk in chunks:
+        yield from decoder.feed(chunk)
+
+    yield from decoder.close()
+
+
+async def aiter_json_array(chunks):
+    """Asynchronously iterate over the items of a json array document
+
+    :param chunks: an asynchronous iterable with the chunks of the document
+    :rtype: collections.AsyncIterable
+    :return: the array items
+    """
+    decoder = JSONArrayDecoder()
+
+    async for chunk in chunks:
+        for item in decoder.feed(chunk):
+            yield item
+
+    for item in decoder.close():
+        yield item
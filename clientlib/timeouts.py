@@ -0,0 +1,300 @@
+import threading
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import monotonic
+
+
+# the monotonic time at which the current operation expires
+_deadline = ContextVar("clientlib_deadline", default=None)
+
+
+def get_deadline():
+    """Get the deadline of the current operation
+
+    :rtype: float
+    :return: the monotonic time at which the operation expires, or None if
+    the operation doesn't have a deadline
+    """
+    return _deadline.get()
+
+
+def get_remaining_time():
+    """Get the time that remains until the deadline of the current operation
+
+    :rtype: float
+    :return: the remaining seconds, or None if the operation doesn't have a
+    deadline. This is negative when the deadline has been exceeded
+    """
+    expires_at = _deadline.get()
+    if expires_at is None:
+        return None
+
+    return expires_at - monotonic()
+
+
+def is_deadline_exceeded():
+    """Check if the deadline of the current operation has been exceeded
+
+    :rtype: boolean
+    :return: True if the deadline has been exceeded
+    """
+    remaining = get_remaining_time()
+
+    return remaining is not None and remaining <= 0
+
+
+@contextmanager
+def deadline_at(expires_at):
+    """Set the deadline of the operations that are executed in the block
+
+    The deadline is propagated to the nested operations, including the calls
+    that execute_many runs on its worker threads and the page requests of
+    paginated endpoints. A nested deadline can't extend the deadline of an
+    enclosing block.
+
+    :param float expires_at: the monotonic time at which the operations
+    expire. The deadline doesn't change when this is None
+    """
+    if expires_at is None:
+        yield
+        return
+
+    current = _deadline.get()
+    if current is not None:
+        expires_at = min(current, expires_at)
+
+    token = _deadline.set(expires_at)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def deadline(seconds):
+    """Set the deadline of the operations that are executed in the block
+
+    For example, ``with deadline(2): client.posts()`` fails with
+    DeadlineExceeded when the request and its retries need more than 2
+    seconds.
+
+    :param float seconds: the time in seconds that the operations may take.
+    The deadline doesn't change when this is None
+    """
+    return deadline_at(get_expiry(seconds))
+
+
+def get_expiry(seconds):
+    """Get the monotonic time at which a deadline expires
+
+    :param float seconds: the deadline in seconds
+    :rtype: float
+    :return: the monotonic time, or None if seconds is None
+    """
+    if seconds is None:
+        return None
+
+    return monotonic() + seconds
+
+
+def _clamp(timeout, remaining):
+    return remaining if timeout is None else min(timeout, remaining)
+
+
+def clamp_timeout(timeout, remaining):
+    """Limit a request timeout to the time that remains until a deadline
+
+    :param float|tuple timeout: the timeout or a (connect, read) tuple
+    :param float remaining: the remaining time in seconds
+    :rtype: float|tuple
+    :return: the limited timeout
+    """
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+
+        return _clamp(connect, remaining), _clamp(read, remaining)
+
+    return _clamp(timeout, remaining)
+
+
+class Timeout(object):
+    """Connect, read and deadline timeouts
+
+    The connect timeout limits the time to establish a connection and the
+    read timeout limits the time to wait for data from the server, on every
+    read of the socket. The deadline limits the total time of an endpoint
+    call, including its retries, and of the iteration of the pages of a
+    paginated endpoint.
+    """
+
+    adaptive = False
+
+    def __init__(self, connect=None, read=None, deadline=None):
+        """Create a new Timeout object
+
+        :param float connect: the connect timeout in seconds
+        :param float read: the read timeout in seconds
+        :param float deadline: the deadline of the endpoint calls in seconds
+        """
+        self.connect = connect
+        self.read = read
+        self.deadline = deadline
+
+    def get_timeouts(self, method, endpoint):
+        """Get the timeouts of a request
+
+        :param str method: the http method
+        :param str endpoint: the endpoint path template
+        :rtype: tuple[float, float]
+        :return: the connect and read timeouts
+        """
+        return self.connect, self.read
+
+    def record_latency(self, method, endpoint, duration):
+        """Record the latency of a request
+
+        :param str method: the http method
+        :param str endpoint: the endpoint path template
+        :param float duration: the time in seconds until the response was
+        received, or until the request timed out
+        """
+
+
+def create_timeout(timeout):
+    """Create a Timeout object from a request timeout
+
+    :param float|tuple|Timeout timeout: the timeout that is used for both the
+    connect and read timeouts, a (connect, read) tuple or a Timeout object
+    :rtype: Timeout
+    :return: the timeout object
+    """
+    if isinstance(timeout, Timeout):
+        return timeout
+
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+
+        return Timeout(connect=connect, read=read)
+
+    return Timeout(connect=timeout, read=timeout)
+
+
+class LatencyWindow(object):
+    """The latencies of the most recent requests to an endpoint"""
+
+    def __init__(self, size):
+        """Create a new LatencyWindow object
+
+        :param int size: the number of latencies to keep
+        """
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=size)
+        self._sorted = None
+
+    def __len__(self):
+        return len(self._latencies)
+
+    def add(self, latency):
+        """Add a latency to the window
+
+        :param float latency: the latency in seconds
+        """
+        with self._lock:
+            self._latencies.append(latency)
+            self._sorted = None
+
+    def percentile(self, percentile):
+        """Get a latency percentile
+
+        :param float percentile: the percentile, between 0 and 100
+        :rtype: float
+        :return: the latency in seconds
+        """
+        with self._lock:
+            if self._sorted is None:
+                self._sorted = sorted(self._latencies)
+
+            latencies = self._sorted
+
+        index = int(round((len(latencies) - 1) * percentile / 100.0))
+
+        return latencies[index]
+
+
+class AdaptiveTimeout(Timeout):
+    """Timeout whose read timeout is derived from the observed latencies
+
+    The latencies of the most recent requests are kept per method and
+    endpoint template. Once enough of them have been observed, the read
+    timeout of an endpoint is a multiple of its latency percentile, limited
+    by the minimum and the configured read timeout. The requests that time
+    out are recorded with the time that they waited, so the timeout grows
+    again when the endpoint slows down.
+    """
+
+    adaptive = True
+
+    def __init__(self, connect=None, read=5, deadline=None, percentile=99,
+                 multiplier=2.0, min_read=0.05, min_samples=20,
+                 window_size=200):
+        """Create a new AdaptiveTimeout object
+
+        :param float connect: the connect timeout in seconds
+        :param float read: the read timeout until enough latencies have been
+        observed. This is also the maximum adaptive read timeout
+        :param float deadline: the deadline of the endpoint calls in seconds
+        :param float percentile: the latency percentile, between 0 and 100
+        :param float multiplier: the multiplier of the latency percentile
+        :param float min_read: the minimum adaptive read timeout in seconds
+        :param int min_samples: the number of latencies to observe before
+        the read timeout is adapted
+        :param int window_size: the number of recent latencies to keep per
+        endpoint
+        """
+        super(AdaptiveTimeout, self).__init__(
+            connect=connect, read=read, deadline=deadline)
+
+        self.percentile = percentile
+        self.multiplier = multiplier
+        self.min_read = min_read
+        self.min_samples = min_samples
+        self.window_size = window_size
+
+        self._lock = threading.Lock()
+        self._windows = {}
+
+    def _get_window(self, method, endpoint):
+        key = (method, endpoint)
+
+        window = self._windows.get(key)
+        if window is None:
+            with self._lock:
+                window = self._windows.setdefault(
+                    key, LatencyWindow(self.window_size))
+
+        return window
+
+    def get_read_timeout(self, method, endpoint):
+        """Get the adaptive read timeout of an endpoint
+
+        :param str method: the http method
+        :param str endpoint: the endpoint path template
+        :rtype: float
+        :return: the read timeout in seconds
+        """
+        window = self._windows.get((method, endpoint))
+        if window is None or len(window) < self.min_samples:
+            return self.read
+
+        read = max(
+            self.min_read,
+            window.percentile(self.percentile) * self.multiplier
+        )
+
+        return read if self.read is None else min(read, self.read)
+
+    def get_timeouts(self, method, endpoint):
+        return self.connect, self.get_read_timeout(method, endpoint)
+
+    def record_latency(self, method, endpoint, duration):
+        self._get_window(method, endpoint).add(duration)
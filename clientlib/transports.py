@@ -0,0 +1,221 @@
+import threading
+
+from requests import Response as RequestsResponse
+from requests.exceptions import (
+    RequestException, ConnectTimeout, ReadTimeout,
+    ConnectionError as RequestsConnectionError
+)
+from requests.structures import CaseInsensitiveDict
+
+from clientlib.compression import DEFAULT_HEADERS
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+
+class Transport(object):
+    """Transport base class
+
+    A transport sends prepared requests and returns requests.Response
+    objects. The errors must be raised as requests exceptions, so that the
+    api requests can map them to the clientlib exceptions.
+    """
+
+    def send(self, request, timeout, verify, stream):
+        """Send a request
+
+        :param PreparedRequest request: the request to send
+        :param int|float|tuple timeout: the request timeout, or a
+        (connect, read) tuple
+        :param boolean verify: flag that indicates whether to verify ssl
+        :param boolean stream: flag that indicates whether to return before
+        the response body is read
+        :rtype: requests.Response
+        :return: the response
+        :raises RequestException: if the request fails
+        """
+        raise NotImplementedError()
+
+    def close(self):
+        """Close the transport and release its connections"""
+
+
+class RequestsTransport(Transport):
+    """Transport that sends the requests with a requests session"""
+
+    def __init__(self, session):
+        """Create a new RequestsTransport object
+
+        :param Session session: the session to use
+        """
+        self.session = session
+
+    def send(self, request, timeout, verify, stream):
+        return self.session.send(
+            request=request,
+            verify=verify,
+            timeout=timeout,
+            stream=stream
+        )
+
+    def close(self):
+        self.session.close()
+
+
+def create_httpx_timeout(timeout):
+    """Convert a request timeout to an httpx timeout
+
+    :param int|float|tuple timeout: the request timeout, or a (connect,
+    read) tuple
+    :rtype: httpx.Timeout
+    :return: the httpx timeout
+    """
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+
+        return httpx.Timeout(read, connect=connect)
+
+    return httpx.Timeout(timeout)
+
+
+def _convert_error(error):
+    if isinstance(error, httpx.ConnectTimeout):
+        return ConnectTimeout(str(error))
+
+    if isinstance(error, httpx.TimeoutException):
+        return ReadTimeout(str(error))
+
+    if isinstance(error, (httpx.ConnectError, httpx.RemoteProtocolError)):
+        return RequestsConnectionError(str(error))
+
+    return RequestException(str(error))
+
+
+class _RawResponse(object):
+    """Adapter that exposes an httpx response as the raw response of a
+    requests.Response"""
+
+    def __init__(self, response):
+        self._response = response
+
+    def stream(self, chunk_size, decode_content=True):
+        try:
+            yield from self._response.iter_bytes(chunk_size=chunk_size)
+        except httpx.HTTPError as e:
+            raise _convert_error(e) from e
+
+    def read(self, amount=None):
+        return self._response.read()
+
+    def tell(self):
+        return self._response.num_bytes_downloaded
+
+    def close(self):
+        self._response.close()
+
+    def release_conn(self):
+        self._response.close()
+
+
+class HTTP2Transport(Transport):
+    """Transport that sends the requests over HTTP/2 using httpx
+
+    The concurrent requests to a host are multiplexed over a single
+    connection. HTTP/2 is negotiated for https urls and the transport falls
+    back to HTTP/1.1 for the servers that don't support it. The redirects
+    are followed and the requests without compression settings ask for
+    uncompressed responses, like they do with requests. The transport is
+    thread safe and it requires the http2 extra of httpx.
+
+    httpx sets the ssl verification per client, so the transport keeps a
+    separate client, with its own connection pool, for every verify value
+    that it is called with.
+    """
+
+    def __init__(self, max_connections=100, max_keepalive_connections=20):
+        """Create a new HTTP2Transport object
+
+        :param int max_connections: the maximum number of connections of each
+        connection pool
+        :param int max_keepalive_connections: the maximum number of idle
+        connections to keep in each connection pool
+        """
+        if httpx is None:
+            raise ImportError(
+                "httpx is required in order to use HTTP2Transport")
+
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+
+        self._lock = threading.Lock()
+        self._clients = {}
+
+    def _create_client(self, verify):
+        return httpx.Client(
+            http2=True,
+            verify=verify,
+            follow_redirects=True,
+            headers=DEFAULT_HEADERS,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections
+            )
+        )
+
+    def _get_client(self, verify):
+        client = self._clients.get(verify)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(verify)
+                if client is None:
+                    client = self._clients[verify] = \
+                        self._create_client(verify)
+
+        return client
+
+    def _create_response(self, request, response, stream):
+        converted = RequestsResponse()
+        converted.status_code = response.status_code
+        converted.reason = response.reason_phrase
+        converted.headers = CaseInsensitiveDict(response.headers.items())
+        converted.url = str(response.url)
+        converted.encoding = response.charset_encoding
+        converted.request = request
+        converted.raw = _RawResponse(response)
+
+        if not stream:
+            converted._content = response.content
+
+        return converted
+
+    def send(self, request, timeout, verify, stream):
+        client = self._get_client(verify)
+        httpx_request = client.build_request(
+            method=request.method,
+            url=request.url,
+            headers=dict(request.headers),
+            content=request.body,
+            timeout=create_httpx_timeout(timeout)
+        )
+
+        try:
+            response = client.send(httpx_request, stream=True)
+
+            if not stream:
+                try:
+                    response.read()
+                finally:
+                    response.close()
+        except httpx.HTTPError as e:
+            raise _convert_error(e) from e
+
+        return self._create_response(request, response, stream)
+
+    def close(self):
+        with self._lock:
+            clients, self._clients = self._clients, {}
+
+        for client in clients.values():
+            client.close()
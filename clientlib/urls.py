@@ -0,0 +1,97 @@
+from string import Formatter
+from urllib.parse import quote
+
+from clientlib.exceptions import EndpointDeclarationError
+
+
+class URLTemplate(object):
+    """Precompiled endpoint url template
+
+    The template is parsed once and rendering it only requires joining its
+    literal parts with the percent encoded argument values.
+    """
+
+    __slots__ = ("template", "base_url", "placeholders", "_parts")
+
+    def __init__(self, template, base_url=""):
+        """Create a new URLTemplate object
+
+        :param str template: the endpoint path template, for example
+        ``/posts/{post_id}``
+        :param str base_url: the base url to prepend to the path
+        :raises EndpointDeclarationError: if the template is invalid
+        """
+        self.template = template
+        self.base_url = base_url
+
+        parts = [base_url]
+        placeholders = []
+
+        try:
+            parsed_template = list(Formatter().parse(template))
+        except ValueError as e:
+            raise EndpointDeclarationError(
+                reason="invalid endpoint template {!r}".format(template)
+            ) from e
+
+        for literal, name, format_spec, conversion in parsed_template:
+            parts[-1] += literal
+
+            if name is None:
+                continue
+
+            if not name.isidentifier() or format_spec or conversion:
+                raise EndpointDeclarationError(
+                    reason="invalid placeholder {!r} in endpoint template "
+                           "{!r}".format(name, template)
+                )
+
+            placeholders.append(name)
+            parts.extend([name, ""])
+
+        self.placeholders = frozenset(placeholders)
+        self._parts = tuple(parts)
+
+    def validate_args(self, args):
+        """Check that the template placeholders match the endpoint arguments
+
+        :param list[str] args: the endpoint arguments
+        :raises EndpointDeclarationError: if they don't match
+        """
+        args = set(args)
+
+        if args != self.placeholders:
+            raise EndpointDeclarationError(
+                reason="the arguments {} don't match the placeholders {} of "
+                       "the endpoint template {!r}".format(
+                           sorted(args), sorted(self.placeholders),
+                           self.template)
+            )
+
+    def with_base_url(self, base_url):
+        """Create a copy of the template that is prefixed with a base url
+
+        :param str base_url: the base url
+        :rtype: URLTemplate
+        :return: the template
+        """
+        return URLTemplate(self.template, base_url + self.base_url)
+
+    def render(self, args=None):
+        """Render the url
+
+        :param dict args: the values of the placeholders
+        :rtype: str
+        :return: the url with the percent encoded argument values
+        """
+        parts = self._parts
+
+        if len(parts) == 1:
+            return parts[0]
+
+        rendered = [parts[0]]
+        for i in range(1, len(parts), 2):
+            rendered.append(quote(str(args[parts[i]]), safe=""))
+            rendered.append(parts[i + 1])
+
+        return "".join(rendered)
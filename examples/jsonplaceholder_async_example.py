@@ -0,0 +1,57 @@
+import asyncio
+from collections import namedtuple
+
+from marshmallow import Schema, post_load, fields
+
+from clientlib.endpoints import Endpoint
+from clientlib.clients import Client, AsyncClient
+
+
+Post = namedtuple("Post", ["userId", "id", "title", "body"])
+
+
+class PostSchema(Schema):
+    userId = fields.Int(required=True)
+    id = fields.Int(required=True)
+    title = fields.Str(required=True)
+    body = fields.Str(required=True)
+
+    @post_load
+    def make_post(self, data, **kwargs):
+        return Post(**data)
+
+
+class JsonPlaceholderEndpoints(object):
+    post = Endpoint(
+        method="GET",
+        endpoint="/posts/{post_id}",
+        args=["post_id"],
+        response_schema=PostSchema()
+    )
+
+
+# the same endpoint declarations can be used by a synchronous client
+class JsonPlaceholder(JsonPlaceholderEndpoints, Client):
+    pass
+
+
+# and by an asynchronous client
+class AsyncJsonPlaceholder(JsonPlaceholderEndpoints, AsyncClient):
+    pass
+
+
+async def main():
+    async with AsyncJsonPlaceholder(
+            base_url="https://jsonplaceholder.typicode.com",
+            timeout=5) as client:
+        # the endpoints of an asynchronous client return awaitables
+        responses = await asyncio.gather(
+            *[client.post(post_id=post_id) for post_id in range(1, 11)]
+        )
+
+    for response in responses:
+        print(response.data)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
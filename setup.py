@@ -35,8 +35,14 @@ setup(
     long_description=get_long_description(),
     long_description_content_type="text/markdown",
     url="https://github.com/pmatigakis/clientlib",
-    packages=find_packages(exclude=["tests"]),
+    packages=find_packages(exclude=["tests", "benchmarks"]),
+    python_requires=">=3.8",
     install_requires=get_requirements(),
+    extras_require={
+        "async": ["httpx"],
+        "http2": ["httpx[http2]"],
+        "orjson": ["orjson"]
+    },
     tests_require=get_test_requirements(),
     test_suite='nose.collector',
     include_package_data=True,
@@ -44,10 +50,10 @@ setup(
     classifiers=(
         "Development Status :: 3 - Alpha",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.5",
-        "Programming Language :: Python :: 3.6",
-        "Programming Language :: Python :: 3.7",
         "Programming Language :: Python :: 3.8",
+        "Programming Language :: Python :: 3.9",
+        "Programming Language :: Python :: 3.10",
+        "Programming Language :: Python :: 3.11",
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
         "Topic :: Software Development :: Libraries"
@@ -0,0 +1,388 @@
+import asyncio
+import json
+import threading
+from unittest import TestCase, IsolatedAsyncioTestCase, main
+from unittest.mock import AsyncMock, patch
+
+import responses
+from marshmallow import Schema, fields, post_load
+
+from clientlib.batching import Batcher, AsyncBatcher
+from clientlib.clients import Client, AsyncClient
+from clientlib.endpoints import BatchEndpoint, AsyncBoundBatchEndpoint
+from clientlib.exceptions import (
+    BatchExecutionError, ExecutionError, ResponseDeserializationError
+)
+from clientlib.instrumentation import NO_INSTRUMENTATION
+from clientlib.models import BatchResult, EndpointResponse, Response
+from clientlib.timeouts import deadline, get_remaining_time
+
+
+class Post(object):
+    def __init__(self, id, title):
+        self.id = id
+        self.title = title
+
+
+class PostSchema(Schema):
+    id = fields.Int(required=True)
+    title = fields.Str(required=True)
+
+    @post_load
+    def make_post(self, data, **kwargs):
+        return Post(**data)
+
+
+class PostIdSchema(Schema):
+    post_id = fields.Int(data_key="id")
+
+
+def echo_batch(key, items):
+    return [
+        BatchResult(kwargs=item, response=(key, item), error=None)
+        for item in items
+    ]
+
+
+class BatcherTests(TestCase):
+    def test_execute_batch_when_the_window_expires(self):
+        batches = []
+
+        def execute_batch(key, items):
+            batches.append(list(items))
+
+            return echo_batch(key, items)
+
+        batcher = Batcher(execute_batch, max_batch_size=10, window=0.05)
+
+        futures = [batcher.submit("key", i) for i in range(3)]
+
+        self.assertEqual(
+            [future.result(timeout=1) for future in futures],
+            [("key", 0), ("key", 1), ("key", 2)]
+        )
+        self.assertEqual(batches, [[0, 1, 2]])
+
+    def test_execute_full_batch_immediately(self):
+        batches = []
+
+        def execute_batch(key, items):
+            batches.append(list(items))
+
+            return echo_batch(key, items)
+
+        batcher = Batcher(execute_batch, max_batch_size=2, window=10)
+
+        futures = [batcher.submit("key", i) for i in range(4)]
+
+        self.assertTrue(all(future.done() for future in futures))
+        self.assertEqual(batches, [[0, 1], [2, 3]])
+
+    def test_group_calls_by_key(self):
+        batches = []
+
+        def execute_batch(key, items):
+            batches.append((key, list(items)))
+
+            return echo_batch(key, items)
+
+        batcher = Batcher(execute_batch, max_batch_size=2, window=10)
+
+        for key, item in (("a", 1), ("b", 2), ("a", 3), ("b", 4)):
+            batcher.submit(key, item)
+
+        self.assertEqual(batches, [("a", [1, 3]), ("b", [2, 4])])
+
+    def test_set_item_errors(self):
+        error = ValueError("invalid item")
+
+        def execute_batch(key, items):
+            return [
+                BatchResult(kwargs=items[0], response=None, error=error),
+                BatchResult(kwargs=items[1], response="result", error=None)
+            ]
+
+        batcher = Batcher(execute_batch, max_batch_size=2, window=10)
+
+        futures = [batcher.submit("key", i) for i in range(2)]
+
+        self.assertIs(futures[0].exception(), error)
+        self.assertEqual(futures[1].result(), "result")
+
+    def test_set_batch_error_to_every_call(self):
+        error = ValueError("request failed")
+
+        def execute_batch(key, items):
+            raise error
+
+        batcher = Batcher(execute_batch, max_batch_size=2, window=10)
+
+        futures = [batcher.submit("key", i) for i in range(2)]
+        errors = [future.exception() for future in futures]
+
+        for batch_error in errors:
+            self.assertIsInstance(batch_error, BatchExecutionError)
+            self.assertIs(batch_error.error, error)
+            self.assertIs(batch_error.__cause__, error)
+        self.assertIsNot(errors[0], errors[1])
+
+    def test_share_scheduler_thread_between_batches(self):
+        batcher = Batcher(echo_batch, max_batch_size=10, window=0.5)
+        thread_count = threading.active_count()
+
+        futures = [batcher.submit(key, 1) for key in range(100)]
+
+        self.assertLessEqual(threading.active_count(), thread_count + 1)
+        self.assertEqual(
+            [future.result(timeout=1) for future in futures],
+            [(key, 1) for key in range(100)]
+        )
+
+    def test_apply_deadline_of_first_call_to_batch(self):
+        remaining = []
+
+        def execute_batch(key, items):
+            remaining.append(get_remaining_time())
+
+            return echo_batch(key, items)
+
+        batcher = Batcher(execute_batch, max_batch_size=10, window=0.01)
+
+        with deadline(10):
+            future = batcher.submit("key", 1)
+
+        self.assertEqual(future.result(timeout=1), ("key", 1))
+        self.assertIsNotNone(remaining[0])
+        self.assertLessEqual(remaining[0], 10)
+
+    def test_batch_calls_of_concurrent_threads(self):
+        batches = []
+
+        def execute_batch(key, items):
+            batches.append(len(items))
+
+            return echo_batch(key, items)
+
+        batcher = Batcher(execute_batch, max_batch_size=100, window=0.1)
+        results = []
+
+        def call(i):
+            results.append(batcher.submit("key", i).result(timeout=1))
+
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(batches, [8])
+        self.assertEqual(sorted(results), [("key", i) for i in range(8)])
+
+
+class AsyncBatcherTests(IsolatedAsyncioTestCase):
+    async def test_execute_batch(self):
+        batches = []
+
+        async def execute_batch(key, items):
+            batches.append(list(items))
+
+            return echo_batch(key, items)
+
+        batcher = AsyncBatcher(execute_batch, max_batch_size=3, window=0.01)
+
+        results = await asyncio.gather(
+            *[batcher.submit("key", i) for i in range(5)])
+
+        self.assertEqual(results, [("key", i) for i in range(5)])
+        self.assertEqual(batches, [[0, 1, 2], [3, 4]])
+
+    async def test_set_batch_error_to_every_call(self):
+        async def execute_batch(key, items):
+            raise ValueError("request failed")
+
+        batcher = AsyncBatcher(execute_batch, window=0.01)
+
+        results = await asyncio.gather(
+            batcher.submit("key", 1), batcher.submit("key", 2),
+            return_exceptions=True
+        )
+
+        for result in results:
+            self.assertIsInstance(result, BatchExecutionError)
+            self.assertIsInstance(result.error, ValueError)
+        self.assertIsNot(results[0], results[1])
+
+
+class PostsClient(Client):
+    posts = BatchEndpoint(
+        method="POST",
+        endpoint="/posts/batch",
+        key="post_id",
+        item_key="id",
+        response_schema=PostSchema(),
+        payload_schema=PostIdSchema(many=True),
+        max_batch_size=3,
+        window=0.05
+    )
+
+    ordered_posts = BatchEndpoint(
+        method="POST",
+        endpoint="/users/{user_id}/posts/batch",
+        args=["user_id"],
+        max_batch_size=2,
+        window=10
+    )
+
+
+class BatchEndpointTests(TestCase):
+    def setUp(self):
+        self.client = PostsClient(base_url="http://localhost")
+
+    def tearDown(self):
+        self.client.close()
+
+    def _add_posts_callback(self):
+        def callback(request):
+            ids = [item["id"] for item in json.loads(request.body)]
+            posts = [
+                {"id": post_id, "title": "title {}".format(post_id)}
+                for post_id in ids
+                if post_id != 404
+            ]
+
+            return 200, {}, json.dumps(list(reversed(posts)))
+
+        responses.add_callback(
+            responses.POST, "http://localhost/posts/batch", callback=callback)
+
+    @responses.activate
+    def test_batch_concurrent_calls(self):
+        self._add_posts_callback()
+
+        results = list(self.client.posts.execute_many(
+            [{"post_id": i} for i in range(1, 6)], concurrency=5))
+
+        self.assertEqual(len(responses.calls), 2)
+        for i, result in enumerate(results, 1):
+            self.assertIsNone(result.error)
+            self.assertIsInstance(result.response, EndpointResponse)
+            self.assertEqual(result.response.data.id, i)
+            self.assertEqual(result.response.data.title, "title {}".format(i))
+
+    @responses.activate
+    def test_send_duplicate_keys_once(self):
+        self._add_posts_callback()
+
+        results = list(self.client.posts.execute_many(
+            [{"post_id": 1}, {"post_id": 1}, {"post_id": 2}], concurrency=3))
+
+        self.assertEqual(len(responses.calls), 1)
+        self.assertEqual(
+            json.loads(responses.calls[0].request.body),
+            [{"id": 1}, {"id": 2}]
+        )
+        self.assertEqual(
+            [result.response.data.id for result in results], [1, 1, 2])
+
+    @responses.activate
+    def test_fail_calls_without_result(self):
+        self._add_posts_callback()
+
+        results = list(self.client.posts.execute_many(
+            [{"post_id": 1}, {"post_id": 404}], concurrency=2))
+
+        self.assertIsNone(results[0].error)
+        self.assertIsInstance(results[1].error, ExecutionError)
+
+    @responses.activate
+    def test_fail_calls_with_invalid_result(self):
+        responses.add(
+            responses.POST, "http://localhost/posts/batch",
+            json=[{"id": 1}]
+        )
+
+        with self.assertRaises(ResponseDeserializationError):
+            self.client.posts(post_id=1)
+
+    @responses.activate
+    def test_fail_every_call_with_unsuccessful_status_code(self):
+        responses.add(
+            responses.POST, "http://localhost/posts/batch", status=500,
+            json={"error": "failed"}
+        )
+
+        results = list(self.client.posts.execute_many(
+            [{"post_id": 1}, {"post_id": 2}], concurrency=2))
+
+        for result in results:
+            self.assertIsInstance(result.error, BatchExecutionError)
+            self.assertIsInstance(result.error.error, ExecutionError)
+
+    @responses.activate
+    def test_match_results_by_position(self):
+        responses.add(
+            responses.POST, "http://localhost/users/1/posts/batch",
+            json=["a", "b"]
+        )
+
+        results = list(self.client.ordered_posts.execute_many(
+            [{"user_id": 1, "id": 10}, {"user_id": 1, "id": 20}],
+            concurrency=2
+        ))
+
+        self.assertEqual(
+            json.loads(responses.calls[0].request.body),
+            [{"id": 10}, {"id": 20}]
+        )
+        self.assertEqual(
+            [result.response.data for result in results], ["a", "b"])
+
+    def test_fail_without_key(self):
+        with self.assertRaises(KeyError):
+            self.client.posts()
+
+
+class SampleAsyncClient(AsyncClient):
+    posts = BatchEndpoint(
+        method="POST",
+        endpoint="/posts/batch",
+        key="post_id",
+        item_key="id",
+        response_schema=PostSchema(),
+        window=0.01
+    )
+
+
+class AsyncBatchEndpointTests(IsolatedAsyncioTestCase):
+    async def test_batch_concurrent_calls(self):
+        function_mock = AsyncMock()
+        function_mock.instrumentation = NO_INSTRUMENTATION
+        function_mock.execute.return_value = Response(
+            status_code=200,
+            headers={},
+            json=[{"id": 2, "title": "b"}, {"id": 1, "title": "a"}]
+        )
+
+        with patch.object(BatchEndpoint, "_create_function",
+                          return_value=function_mock):
+            client = SampleAsyncClient(base_url="http://localhost")
+
+            endpoint = client.posts
+
+        self.assertIsInstance(endpoint, AsyncBoundBatchEndpoint)
+
+        responses = await asyncio.gather(
+            endpoint(post_id=1), endpoint(post_id=2))
+
+        self.assertEqual(
+            [response.data.title for response in responses], ["a", "b"])
+        function_mock.execute.assert_awaited_once_with(
+            args={}, params={}, json=[{"post_id": 1}, {"post_id": 2}],
+            headers=None
+        )
+
+        await client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+from unittest import TestCase, main
+from unittest.mock import MagicMock, patch
+
+from clientlib.caching import ResponseCache, parse_cache_control
+from clientlib.endpoints import Endpoint, BoundEndpoint
+from clientlib.models import Response
+
+
+class ParseCacheControlTests(TestCase):
+    def test_parse(self):
+        self.assertDictEqual(
+            parse_cache_control('public, max-age=60, no-cache="Set-Cookie"'),
+            {
+                "public": True,
+                "max-age": "60",
+                "no-cache": "Set-Cookie"
+            }
+        )
+
+    def test_parse_missing_header(self):
+        self.assertDictEqual(parse_cache_control(None), {})
+
+
+class ResponseCacheTests(TestCase):
+    def test_hit(self):
+        cache = ResponseCache()
+        cache.set("key", "value", {})
+
+        entry, fresh = cache.lookup("key")
+
+        self.assertEqual(entry.value, "value")
+        self.assertTrue(fresh)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 0)
+
+    def test_miss(self):
+        cache = ResponseCache()
+
+        entry, fresh = cache.lookup("key")
+
+        self.assertIsNone(entry)
+        self.assertFalse(fresh)
+        self.assertEqual(cache.misses, 1)
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(max_size=2)
+        cache.set("key-1", 1, {})
+        cache.set("key-2", 2, {})
+        cache.lookup("key-1")
+        cache.set("key-3", 3, {})
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNotNone(cache.lookup("key-1")[0])
+        self.assertIsNone(cache.lookup("key-2")[0])
+        self.assertIsNotNone(cache.lookup("key-3")[0])
+
+    @patch("clientlib.caching.time")
+    def test_ttl_expiration(self, time_mock):
+        time_mock.monotonic.return_value = 100
+        cache = ResponseCache(ttl=10)
+        cache.set("key", "value", {})
+
+        time_mock.monotonic.return_value = 111
+
+        self.assertEqual(cache.lookup("key"), (None, False))
+        self.assertEqual(len(cache), 0)
+
+    @patch("clientlib.caching.time")
+    def test_max_age_is_bounded_by_ttl(self, time_mock):
+        time_mock.monotonic.return_value = 100
+        cache = ResponseCache(ttl=10)
+        cache.set("key-1", 1, {"Cache-Control": "max-age=5"})
+        cache.set("key-2", 2, {"Cache-Control": "max-age=3600"})
+
+        time_mock.monotonic.return_value = 106
+        self.assertIsNone(cache.lookup("key-1")[0])
+        self.assertTrue(cache.lookup("key-2")[1])
+
+        time_mock.monotonic.return_value = 111
+        self.assertIsNone(cache.lookup("key-2")[0])
+
+    def test_no_store(self):
+        cache = ResponseCache()
+        cache.set("key", "value", {"Cache-Control": "no-store"})
+
+        self.assertEqual(len(cache), 0)
+
+    def test_no_cache_with_validator_is_stored_stale(self):
+        cache = ResponseCache()
+        cache.set("key", "value", {"Cache-Control": "no-cache", "ETag": "abc"})
+
+        entry, fresh = cache.lookup("key")
+
+        self.assertFalse(fresh)
+        self.assertDictEqual(
+            entry.create_conditional_headers(), {"If-None-Match": "abc"})
+
+    def test_revalidate(self):
+        cache = ResponseCache()
+        cache.set(
+            "key",
+            "value",
+            {
+                "Cache-Control": "no-cache",
+                "Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"
+            }
+        )
+        entry, _ = cache.lookup("key")
+
+        value = cache.revalidate("key", entry, {"Cache-Control": "max-age=5"})
+
+        self.assertEqual(value, "value")
+        self.assertTrue(cache.lookup("key")[1])
+        self.assertEqual(cache.revalidations, 1)
+
+
+class EndpointCachingTests(TestCase):
+    def _create_endpoint(self, function_mock, cache):
+        endpoint = Endpoint(
+            method="GET",
+            endpoint="/test/{arg1}",
+            args=["arg1"],
+            params=["param1"]
+        )
+
+        return BoundEndpoint(endpoint, function_mock, cache)
+
+    def test_cache_hit_skips_request(self):
+        function_mock = MagicMock()
+        function_mock.create_url.side_effect = \
+            lambda args: "http://localhost/test/{}".format(args["arg1"])
+        function_mock.execute.return_value = Response(
+            status_code=200, headers={}, json={"message": "hello world"})
+        cache = ResponseCache()
+        endpoint = self._create_endpoint(function_mock, cache)
+
+        response_1 = endpoint(arg1=1, param1="a")
+        response_2 = endpoint(arg1=1, param1="a")
+        endpoint(arg1=2, param1="a")
+        endpoint(arg1=1, param1="b")
+
+        self.assertIs(response_1, response_2)
+        self.assertEqual(function_mock.execute.call_count, 3)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 3)
+
+    def test_unsuccessful_responses_are_not_cached(self):
+        function_mock = MagicMock()
+        function_mock.create_url.return_value = "http://localhost/test/1"
+        function_mock.execute.return_value = Response(
+            status_code=500, headers={}, json={"error": "failed"})
+        cache = ResponseCache()
+        endpoint = self._create_endpoint(function_mock, cache)
+
+        endpoint(arg1=1)
+
+        self.assertEqual(len(cache), 0)
+
+    def test_conditional_revalidation(self):
+        function_mock = MagicMock()
+        function_mock.create_url.return_value = "http://localhost/test/1"
+        function_mock.execute.side_effect = [
+            Response(
+                status_code=200,
+                headers={"Cache-Control": "no-cache", "ETag": '"v1"'},
+                json={"message": "hello world"}
+            ),
+            Response(status_code=304, headers={}, json=None)
+        ]
+        cache = ResponseCache()
+        endpoint = self._create_endpoint(function_mock, cache)
+
+        response_1 = endpoint(arg1=1)
+        response_2 = endpoint(arg1=1)
+
+        self.assertIs(response_1, response_2)
+        function_mock.execute.assert_called_with(
+            args={"arg1": 1},
+            params={},
+            json=None,
+            headers={"If-None-Match": '"v1"'}
+        )
+        self.assertEqual(cache.revalidations, 1)
+
+    def test_cache_resolution(self):
+        client = MagicMock()
+        client.cache = ResponseCache()
+        own_cache = ResponseCache()
+
+        self.assertIs(
+            Endpoint("GET", "/test")._resolve_cache(client), client.cache)
+        self.assertIs(
+            Endpoint("GET", "/test", cache=own_cache)._resolve_cache(client),
+            own_cache
+        )
+        self.assertIsNone(
+            Endpoint("GET", "/test", cache=False)._resolve_cache(client))
+        self.assertIsNone(Endpoint("POST", "/test")._resolve_cache(client))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+import threading
+from unittest import TestCase, IsolatedAsyncioTestCase, main
+from unittest.mock import MagicMock, AsyncMock, patch
+
+from clientlib.circuitbreakers import (
+    CircuitBreaker, CircuitBreakerRegistry, CLOSED, OPEN, HALF_OPEN
+)
+from clientlib.exceptions import (
+    CircuitOpenError, EndpointTimeout, InvalidResponseContentType,
+    RequestExecutionError
+)
+from clientlib.models import Response
+
+
+def create_request(status_code=200, side_effect=None):
+    request = MagicMock()
+    request.base_url = "http://localhost"
+    request.method = "GET"
+    request.endpoint = "/test"
+    request.execute.return_value = Response(
+        status_code=status_code, headers={}, json={})
+    request.execute.side_effect = side_effect
+
+    return request
+
+
+class CircuitBreakerTests(TestCase):
+    def _create_breaker(self, **kwargs):
+        self.transitions = []
+
+        def on_state_change(breaker, old_state, new_state):
+            self.transitions.append((old_state, new_state))
+
+        kwargs.setdefault("window_size", 4)
+        kwargs.setdefault("minimum_calls", 4)
+
+        return CircuitBreaker(
+            name="test", on_state_change=on_state_change, **kwargs)
+
+    def test_open_on_failure_rate(self):
+        breaker = self._create_breaker(failure_rate_threshold=0.5)
+
+        breaker.call(create_request(200))
+        breaker.call(create_request(200))
+        breaker.call(create_request(500))
+        self.assertEqual(breaker.state, CLOSED)
+
+        with self.assertRaises(EndpointTimeout):
+            breaker.call(create_request(side_effect=EndpointTimeout()))
+
+        self.assertEqual(breaker.state, OPEN)
+        self.assertEqual(self.transitions, [(CLOSED, OPEN)])
+
+    def test_fail_fast_when_open(self):
+        breaker = self._create_breaker(minimum_calls=1)
+        breaker.call(create_request(503))
+        request = create_request(200)
+
+        with self.assertRaises(CircuitOpenError) as e:
+            breaker.call(request)
+
+        self.assertIsInstance(e.exception, RequestExecutionError)
+        self.assertEqual(e.exception.reason, "the circuit breaker is open")
+        self.assertEqual(e.exception.base_url, "http://localhost")
+        self.assertEqual(e.exception.method, "GET")
+        self.assertEqual(e.exception.endpoint, "/test")
+        request.execute.assert_not_called()
+        self.assertEqual(breaker.rejected_calls, 1)
+
+    def test_open_on_slow_calls(self):
+        breaker = self._create_breaker(
+            minimum_calls=2, slow_call_duration=0.5,
+            slow_call_rate_threshold=1.0
+        )
+
+        breaker.record(False, 1.0)
+        self.assertEqual(breaker.state, CLOSED)
+        breaker.record(False, 1.0)
+
+        self.assertEqual(breaker.state, OPEN)
+
+    def test_response_errors_are_not_failures(self):
+        breaker = self._create_breaker(minimum_calls=1)
+
+        with self.assertRaises(InvalidResponseContentType):
+            breaker.call(
+                create_request(side_effect=InvalidResponseContentType()))
+
+        self.assertEqual(breaker.state, CLOSED)
+
+    @patch("clientlib.circuitbreakers.time")
+    def test_half_open_recovery(self, time_mock):
+        time_mock.monotonic.return_value = 100
+        breaker = self._create_breaker(minimum_calls=1, reset_timeout=10)
+        breaker.call(create_request(500))
+
+        time_mock.monotonic.return_value = 111
+        self.assertTrue(breaker.allow_request())
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertFalse(breaker.allow_request())
+
+        breaker.record(False, 0.1)
+
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertEqual(
+            self.transitions,
+            [(CLOSED, OPEN), (OPEN, HALF_OPEN), (HALF_OPEN, CLOSED)]
+        )
+
+    @patch("clientlib.circuitbreakers.time")
+    def test_half_open_failure_reopens(self, time_mock):
+        time_mock.monotonic.return_value = 100
+        breaker = self._create_breaker(minimum_calls=1, reset_timeout=10)
+        breaker.call(create_request(500))
+
+        time_mock.monotonic.return_value = 111
+        breaker.call(create_request(500))
+
+        self.assertEqual(breaker.state, OPEN)
+
+    def test_thread_safety(self):
+        breaker = CircuitBreaker(window_size=1000, minimum_calls=1000)
+
+        def record():
+            for _ in range(500):
+                if breaker.allow_request():
+                    breaker.record(False, 0.01)
+
+        threads = [threading.Thread(target=record) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(breaker.calls, 4000)
+
+
+class AsyncCircuitBreakerTests(IsolatedAsyncioTestCase):
+    async def test_call_async(self):
+        breaker = CircuitBreaker(minimum_calls=1)
+        request = create_request()
+        request.execute = AsyncMock(
+            return_value=Response(status_code=500, headers={}, json={}))
+
+        await breaker.call_async(request)
+
+        with self.assertRaises(CircuitOpenError):
+            await breaker.call_async(request)
+
+
+class CircuitBreakerRegistryTests(TestCase):
+    def test_get(self):
+        registry = CircuitBreakerRegistry(minimum_calls=5)
+
+        breaker = registry.get("http://localhost", "/test/{id}")
+
+        self.assertIs(registry.get("http://localhost", "/test/{id}"), breaker)
+        self.assertIsNot(registry.get("http://localhost", "/other"), breaker)
+        self.assertEqual(breaker.name, "http://localhost/test/{id}")
+        self.assertEqual(breaker.minimum_calls, 5)
+        self.assertEqual(len(list(registry)), 2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+from unittest import TestCase, IsolatedAsyncioTestCase, main
+from unittest.mock import patch
+
+import httpx
+from requests.adapters import HTTPAdapter
+
+from clientlib.clients import Client, AsyncClient
+from clientlib.endpoints import Endpoint
+from clientlib.json_codecs import StdlibJSONCodec
+
+
+class SampleClient(Client):
+    pass
+
+
+class SampleAsyncClient(AsyncClient):
+    message = Endpoint(method="GET", endpoint="/old")
+
+
+class ClientTests(TestCase):
+    def test_mount_pooled_adapter(self):
+        client = SampleClient(
+            base_url="http://localhost",
+            pool_connections=2,
+            pool_maxsize=20
+        )
+
+        for prefix in ("http://", "https://"):
+            adapter = client.session.get_adapter(prefix + "localhost")
+
+            self.assertIsInstance(adapter, HTTPAdapter)
+            self.assertEqual(adapter._pool_connections, 2)
+            self.assertEqual(adapter._pool_maxsize, 20)
+
+    def test_default_json_codec(self):
+        client = SampleClient(base_url="http://localhost")
+
+        self.assertIsInstance(client.json_codec, StdlibJSONCodec)
+
+    def test_json_codec(self):
+        codec = StdlibJSONCodec()
+
+        client = SampleClient(base_url="http://localhost", json_codec=codec)
+
+        self.assertIs(client.json_codec, codec)
+
+    def test_close(self):
+        client = SampleClient(base_url="http://localhost")
+
+        with patch.object(client.session, "close") as close_mock:
+            client.close()
+
+        close_mock.assert_called_once_with()
+
+    def test_context_manager_closes_client(self):
+        client = SampleClient(base_url="http://localhost")
+
+        with patch.object(client.session, "close") as close_mock:
+            with client as c:
+                self.assertIs(c, client)
+
+            close_mock.assert_called_once_with()
+
+    def test_gather(self):
+        client = SampleClient(base_url="http://localhost")
+
+        results = list(client.gather([
+            (lambda **kwargs: ("first", kwargs), {"post_id": 1}),
+            (lambda **kwargs: ("second", kwargs), {}),
+        ]))
+
+        self.assertEqual(
+            [result.response for result in results],
+            [("first", {"post_id": 1}), ("second", {})]
+        )
+
+
+class AsyncClientTests(IsolatedAsyncioTestCase):
+    async def test_follow_redirects(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+
+            if request.url.path == "/old":
+                return httpx.Response(
+                    301, headers={"Location": "http://localhost/new"})
+
+            return httpx.Response(200, json={"message": "hello world"})
+
+        with patch("httpx._client.AsyncHTTPTransport",
+                   return_value=httpx.MockTransport(handler)):
+            client = SampleAsyncClient(base_url="http://localhost")
+
+        response = await client.message()
+        await client.close()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, {"message": "hello world"})
+        self.assertEqual(
+            [request.headers["Accept-Encoding"] for request in requests],
+            ["identity", "identity"]
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase, IsolatedAsyncioTestCase, main
+from unittest.mock import MagicMock, patch
+
+from clientlib.coalescing import (
+    SingleFlight, AsyncSingleFlight, create_coalescing_key
+)
+from clientlib.exceptions import EndpointTimeout, DeadlineExceeded
+from clientlib.functions import Function
+from clientlib.models import Response
+from clientlib.timeouts import deadline
+
+
+class CreateCoalescingKeyTests(TestCase):
+    def test_params_order_does_not_matter(self):
+        self.assertEqual(
+            create_coalescing_key(
+                "GET", "http://localhost/a", {"a": 1, "b": 2}, None),
+            create_coalescing_key(
+                "GET", "http://localhost/a", {"b": 2, "a": 1}, None)
+        )
+
+    def test_auth_identity(self):
+        self.assertNotEqual(
+            create_coalescing_key("GET", "http://localhost/a", {}, object()),
+            create_coalescing_key("GET", "http://localhost/a", {}, object())
+        )
+
+
+class SingleFlightTests(TestCase):
+    def _execute_concurrently(self, single_flight, function, calls):
+        release = threading.Event()
+
+        def blocking_function():
+            release.wait(1)
+            return function()
+
+        with ThreadPoolExecutor(calls) as executor:
+            futures = [
+                executor.submit(
+                    single_flight.execute, "key", blocking_function)
+                for _ in range(calls)
+            ]
+
+            # wait for all the callers to arrive before the call completes
+            while single_flight.calls < calls:
+                pass
+
+            release.set()
+
+        return futures
+
+    def test_coalesce_concurrent_calls(self):
+        single_flight = SingleFlight()
+        function = MagicMock(return_value="response")
+
+        futures = self._execute_concurrently(single_flight, function, 5)
+
+        self.assertEqual(
+            [future.result() for future in futures], ["response"] * 5)
+        function.assert_called_once_with()
+        self.assertEqual(single_flight.calls, 5)
+        self.assertEqual(single_flight.coalesced_calls, 4)
+
+    def test_share_exception(self):
+        single_flight = SingleFlight()
+        function = MagicMock(side_effect=EndpointTimeout())
+
+        futures = self._execute_concurrently(single_flight, function, 3)
+
+        for future in futures:
+            self.assertIsInstance(future.exception(), EndpointTimeout)
+
+        function.assert_called_once_with()
+
+    def test_do_not_keep_completed_calls(self):
+        single_flight = SingleFlight()
+        function = MagicMock(side_effect=["first", "second"])
+
+        self.assertEqual(single_flight.execute("key", function), "first")
+        self.assertEqual(single_flight.execute("key", function), "second")
+        self.assertEqual(single_flight.coalesced_calls, 0)
+
+    def test_waiting_caller_honours_its_deadline(self):
+        single_flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+
+        def function():
+            started.set()
+            release.wait(5)
+
+            return "response"
+
+        with ThreadPoolExecutor(1) as executor:
+            leader = executor.submit(single_flight.execute, "key", function)
+            started.wait(1)
+
+            with deadline(0.05):
+                with self.assertRaises(DeadlineExceeded):
+                    single_flight.execute("key", function)
+
+            release.set()
+
+        self.assertEqual(leader.result(), "response")
+
+
+class AsyncSingleFlightTests(IsolatedAsyncioTestCase):
+    async def test_coalesce_concurrent_calls(self):
+        single_flight = AsyncSingleFlight()
+        calls = []
+
+        async def function():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "response"
+
+        results = await asyncio.gather(*[
+            single_flight.execute("key", function) for _ in range(5)
+        ])
+
+        self.assertEqual(results, ["response"] * 5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(single_flight.coalesced_calls, 4)
+
+    async def test_cancelled_caller_does_not_cancel_the_call(self):
+        single_flight = AsyncSingleFlight()
+
+        async def function():
+            await asyncio.sleep(0.01)
+            return "response"
+
+        first = asyncio.ensure_future(single_flight.execute("key", function))
+        second = asyncio.ensure_future(single_flight.execute("key", function))
+        await asyncio.sleep(0)
+
+        first.cancel()
+
+        self.assertEqual(await second, "response")
+
+    async def test_waiting_caller_honours_its_deadline(self):
+        single_flight = AsyncSingleFlight()
+
+        async def function():
+            await asyncio.sleep(0.2)
+            return "response"
+
+        leader = asyncio.ensure_future(single_flight.execute("key", function))
+        await asyncio.sleep(0)
+
+        with deadline(0.01):
+            with self.assertRaises(DeadlineExceeded):
+                await single_flight.execute("key", function)
+
+        self.assertEqual(await leader, "response")
+
+
+class FunctionCoalescingTests(TestCase):
+    def _create_function(self, method, **kwargs):
+        return Function(
+            session=MagicMock(),
+            base_url="http://localhost",
+            method=method,
+            endpoint="/test/{item_id}",
+            single_flight=SingleFlight(),
+            **kwargs
+        )
+
+    @patch("clientlib.coalescing.SingleFlight.execute")
+    def test_coalesce_get_requests(self, execute_mock):
+        function = self._create_function("GET")
+
+        function.execute(args={"item_id": 1}, params={"page": 2})
+
+        key, _ = execute_mock.call_args[0]
+        self.assertEqual(
+            key,
+            create_coalescing_key(
+                "GET", "http://localhost/test/1", {"page": 2}, None)
+        )
+
+    @patch("clientlib.functions.APIRequest.execute")
+    @patch("clientlib.coalescing.SingleFlight.execute")
+    def test_do_not_coalesce_other_requests(self, execute_mock,
+                                            request_execute_mock):
+        request_execute_mock.return_value = Response(200, {}, {})
+
+        functions = (
+            self._create_function("POST"),
+            self._create_function("GET", stream=True),
+        )
+
+        for function in functions:
+            function.execute(args={"item_id": 1})
+
+        execute_mock.assert_not_called()
+        self.assertEqual(request_execute_mock.call_count, 2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+from array import array
+from unittest import TestCase, main
+
+from marshmallow import Schema, fields, post_load, validates
+from marshmallow.exceptions import ValidationError
+
+from clientlib.columnar import ColumnarLoader, ColumnarResult
+
+
+class PostSchema(Schema):
+    userId = fields.Int(required=True)
+    id = fields.Int(required=True)
+    title = fields.Str(required=True)
+    score = fields.Float(load_default=None, allow_none=True)
+    draft = fields.Bool(data_key="isDraft", attribute="is_draft")
+
+    @post_load
+    def make_post(self, data, **kwargs):
+        raise AssertionError("post_load hooks must not be executed")
+
+
+class ValidatedPostSchema(PostSchema):
+    @validates("id")
+    def validate_id(self, value, **kwargs):
+        if value < 0:
+            raise ValidationError("negative id")
+
+
+def create_posts(count):
+    return [
+        {
+            "userId": i % 3,
+            "id": i,
+            "title": "title {}".format(i % 2),
+            "score": i / 2,
+            "isDraft": i % 2 == 0
+        }
+        for i in range(count)
+    ]
+
+
+class ColumnarLoaderTests(TestCase):
+    def test_load(self):
+        result = ColumnarLoader(PostSchema(many=True)).load(create_posts(3))
+
+        self.assertIsInstance(result, ColumnarResult)
+        self.assertEqual(len(result), 3)
+        self.assertEqual(
+            result.column_names,
+            ["userId", "id", "title", "score", "is_draft"]
+        )
+        self.assertEqual(result.column("id"), array("q", [0, 1, 2]))
+        self.assertEqual(result.column("score"), array("d", [0, 0.5, 1]))
+        self.assertEqual(result.column("is_draft"), [True, False, True])
+
+        row = result[1]
+        self.assertEqual(row.id, 1)
+        self.assertEqual(row.title, "title 1")
+        self.assertIs(row.is_draft, False)
+
+    def test_rows(self):
+        result = ColumnarLoader(PostSchema(many=True)).load(create_posts(3))
+
+        self.assertEqual([row.id for row in result], [0, 1, 2])
+        self.assertEqual([row.id for row in result[1:]], [1, 2])
+        self.assertEqual(result[-1].id, 2)
+
+        with self.assertRaises(IndexError):
+            result[3]
+
+    def test_intern_repeated_strings(self):
+        posts = create_posts(4)
+        for post in posts:
+            post["title"] = "".join(["title", " ", "1"])
+
+        result = ColumnarLoader(PostSchema(many=True)).load(posts)
+
+        titles = result.column("title")
+        self.assertTrue(all(title is titles[0] for title in titles))
+
+    def test_convert_array_column_to_list(self):
+        posts = create_posts(2)
+        posts[1]["score"] = None
+
+        result = ColumnarLoader(PostSchema(many=True)).load(posts)
+
+        self.assertEqual(result.column("score"), [0, None])
+
+    def test_convert_field_values(self):
+        posts = create_posts(1)
+        posts[0]["id"] = "10"
+
+        result = ColumnarLoader(PostSchema(many=True)).load(posts)
+
+        self.assertEqual(result[0].id, 10)
+
+    def test_raise_validation_error(self):
+        posts = create_posts(2)
+        posts[1]["id"] = "abc"
+
+        with self.assertRaises(ValidationError) as e:
+            ColumnarLoader(PostSchema(many=True)).load(posts)
+
+        self.assertEqual(
+            e.exception.messages, {1: {"id": ["Not a valid integer."]}})
+
+    def test_run_field_validators_of_schemas_that_can_not_be_compiled(self):
+        posts = create_posts(2)
+        posts[1]["id"] = -1
+
+        with self.assertRaises(ValidationError) as e:
+            ColumnarLoader(ValidatedPostSchema(many=True)).load(posts)
+
+        self.assertEqual(e.exception.messages, {1: {"id": ["negative id"]}})
+
+    def test_raise_validation_error_for_invalid_input(self):
+        with self.assertRaises(ValidationError):
+            ColumnarLoader(PostSchema(many=True)).load({"id": 1})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import gzip
+import json
+from unittest import TestCase, main
+
+import responses
+from requests import Session
+
+from clientlib.compression import Compression, get_available_encodings
+from clientlib.requests import APIRequest
+
+
+class CompressionTests(TestCase):
+    def test_advertise_available_encodings(self):
+        compression = Compression()
+
+        self.assertIn("gzip", get_available_encodings())
+        self.assertEqual(
+            compression.headers,
+            {"Accept-Encoding": ", ".join(get_available_encodings())}
+        )
+
+    def test_advertise_selected_encodings(self):
+        self.assertEqual(
+            Compression(encodings=["gzip"]).headers,
+            {"Accept-Encoding": "gzip"}
+        )
+        self.assertEqual(
+            Compression(encodings=[]).headers,
+            {"Accept-Encoding": "identity"}
+        )
+
+    def test_fail_with_unsupported_encoding(self):
+        with self.assertRaises(ValueError):
+            Compression(encodings=["gzip", "lzma"])
+
+    def test_should_compress(self):
+        self.assertFalse(Compression().should_compress(b"a" * 10000))
+        self.assertFalse(
+            Compression(request_threshold=10).should_compress(b"a" * 9))
+        self.assertTrue(
+            Compression(request_threshold=10).should_compress(b"a" * 10))
+
+    def test_compress(self):
+        body = b'{"message": "hello world"}'
+
+        self.assertEqual(gzip.decompress(Compression().compress(body)), body)
+
+
+class APIRequestCompressionTests(TestCase):
+    def _create_request(self, compression, json=None, stream=False):
+        return APIRequest(
+            session=Session(),
+            base_url="http://localhost",
+            method="POST",
+            endpoint="/api/v1/test",
+            json=json,
+            stream=stream,
+            compression=compression
+        )
+
+    @responses.activate
+    def test_compress_large_payload(self):
+        responses.add(
+            responses.POST, "http://localhost/api/v1/test", json={})
+
+        payload = {"items": list(range(1000))}
+
+        request = self._create_request(
+            Compression(encodings=["gzip"], request_threshold=100),
+            json=payload
+        )
+        request.execute()
+
+        sent_request = responses.calls[0].request
+        self.assertEqual(sent_request.headers["Accept-Encoding"], "gzip")
+        self.assertEqual(sent_request.headers["Content-Encoding"], "gzip")
+        self.assertEqual(
+            sent_request.headers["Content-Type"], "application/json")
+        self.assertEqual(
+            json.loads(gzip.decompress(sent_request.body)), payload)
+
+    @responses.activate
+    def test_do_not_compress_small_payload(self):
+        responses.add(
+            responses.POST, "http://localhost/api/v1/test", json={})
+
+        request = self._create_request(
+            Compression(request_threshold=100), json={"message": "hello"})
+        request.execute()
+
+        sent_request = responses.calls[0].request
+        self.assertNotIn("Content-Encoding", sent_request.headers)
+        self.assertEqual(sent_request.body, b'{"message": "hello"}')
+
+    @responses.activate
+    def test_decompress_streamed_response(self):
+        items = [{"id": i} for i in range(1000)]
+
+        responses.add(
+            responses.POST,
+            "http://localhost/api/v1/test",
+            body=gzip.compress(json.dumps(items).encode("utf-8")),
+            headers={"Content-Encoding": "gzip"},
+            content_type="application/json"
+        )
+
+        request = self._create_request(Compression(), stream=True)
+
+        self.assertEqual(list(request.execute().json), items)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import threading
+from unittest import TestCase, main
+from unittest.mock import MagicMock
+
+from clientlib.concurrency import execute_concurrently
+from clientlib.endpoints import Endpoint, BoundEndpoint
+from clientlib.exceptions import EndpointRequestError
+from clientlib.models import BatchResult, Response
+
+
+def echo(**kwargs):
+    return kwargs["value"]
+
+
+def fail_on_odd(**kwargs):
+    if kwargs["value"] % 2 == 1:
+        raise EndpointRequestError(reason="odd value")
+
+    return kwargs["value"]
+
+
+class ExecuteConcurrentlyTests(TestCase):
+    def test_results_are_ordered(self):
+        calls = [(echo, {"value": i}) for i in range(50)]
+
+        results = list(execute_concurrently(calls, concurrency=4))
+
+        self.assertEqual(
+            [result.response for result in results], list(range(50)))
+        self.assertTrue(all(result.error is None for result in results))
+
+    def test_results_as_completed(self):
+        calls = [(echo, {"value": i}) for i in range(50)]
+
+        results = list(
+            execute_concurrently(calls, concurrency=4, ordered=False))
+
+        self.assertEqual(
+            sorted(result.response for result in results), list(range(50)))
+
+    def test_endpoint_errors_are_collected(self):
+        calls = [(fail_on_odd, {"value": i}) for i in range(4)]
+
+        results = list(execute_concurrently(calls, concurrency=2))
+
+        self.assertEqual(results[0], BatchResult({"value": 0}, 0, None))
+        self.assertIsNone(results[1].response)
+        self.assertIsInstance(results[1].error, EndpointRequestError)
+        self.assertEqual(results[2], BatchResult({"value": 2}, 2, None))
+        self.assertIsInstance(results[3].error, EndpointRequestError)
+
+    def test_input_is_consumed_lazily(self):
+        consumed = []
+        lock = threading.Lock()
+
+        def calls():
+            for i in range(1000):
+                with lock:
+                    consumed.append(i)
+                yield echo, {"value": i}
+
+        results = execute_concurrently(calls(), concurrency=2)
+        next(results)
+
+        self.assertLessEqual(len(consumed), 5)
+
+        results.close()
+
+
+class EndpointExecuteManyTests(TestCase):
+    def test_execute_many(self):
+        def execute(args, params, json, headers):
+            return Response(status_code=200, headers={}, json=args)
+
+        function_mock = MagicMock()
+        function_mock.execute.side_effect = execute
+
+        endpoint = Endpoint(
+            method="GET",
+            endpoint="/test/{arg1}",
+            args=["arg1"]
+        )
+        endpoint = BoundEndpoint(endpoint, function_mock)
+
+        results = list(
+            endpoint.execute_many(({"arg1": i} for i in range(20)), 3))
+
+        self.assertEqual(
+            [result.response.json for result in results],
+            [{"arg1": i} for i in range(20)]
+        )
+        self.assertEqual(function_mock.execute.call_count, 20)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+from collections import namedtuple
+from unittest import TestCase, main
+from unittest.mock import patch
+
+from marshmallow import (
+    Schema, fields, post_load, validates_schema, EXCLUDE, INCLUDE
+)
+from marshmallow.exceptions import ValidationError
+
+from clientlib.deserialization import compile_schema, is_compilable_schema
+
+
+Post = namedtuple("Post", ["userId", "id", "title", "body", "author"])
+
+
+class AuthorSchema(Schema):
+    name = fields.Str(required=True)
+    score = fields.Float()
+    active = fields.Bool()
+
+
+class PostSchema(Schema):
+    userId = fields.Int(required=True)
+    id = fields.Int(required=True)
+    title = fields.Str(required=True)
+    body = fields.Str(required=True)
+    author = fields.Nested(AuthorSchema, load_default=None, allow_none=True)
+
+    @post_load
+    def make_post(self, data, **kwargs):
+        return Post(**data)
+
+
+class ValidatedSchema(Schema):
+    value = fields.Int()
+
+    @validates_schema
+    def validate_value(self, data, **kwargs):
+        pass
+
+
+def create_post(post_id, **kwargs):
+    return dict(
+        {
+            "userId": 1,
+            "id": post_id,
+            "title": "title {}".format(post_id),
+            "body": "body {}".format(post_id)
+        },
+        **kwargs
+    )
+
+
+class CompiledSchemaTests(TestCase):
+    def _assert_loads_like_schema(self, schema, data, **kwargs):
+        compiled_schema = compile_schema(schema)
+
+        self.assertTrue(compiled_schema.compiled)
+        self.assertEqual(
+            compiled_schema.load(data, **kwargs), schema.load(data, **kwargs))
+
+    def test_load(self):
+        self._assert_loads_like_schema(PostSchema(), create_post(1))
+
+    def test_load_many(self):
+        data = [
+            create_post(1),
+            create_post(2, author={"name": "me", "score": 1.5}),
+            create_post(3, author=None),
+        ]
+
+        self._assert_loads_like_schema(PostSchema(many=True), data)
+        self._assert_loads_like_schema(PostSchema(), data, many=True)
+
+    def test_load_values_that_need_conversion(self):
+        data = create_post(
+            "1", userId=1.0, author={"name": "me", "score": 1, "active": 1})
+
+        self._assert_loads_like_schema(PostSchema(), data)
+
+    def test_load_defaults_and_data_keys(self):
+        class SampleSchema(Schema):
+            value = fields.Int(data_key="Value", attribute="number")
+            default = fields.Str(load_default="default")
+            optional = fields.Str()
+
+        self._assert_loads_like_schema(SampleSchema(), {"Value": 1})
+
+    def test_unknown_fields(self):
+        for unknown in (EXCLUDE, INCLUDE):
+            with self.subTest(unknown=unknown):
+                self._assert_loads_like_schema(
+                    AuthorSchema(unknown=unknown), {"name": "me", "extra": 1})
+
+    def test_raise_schema_validation_errors(self):
+        invalid_data = (
+            create_post(1, extra=1),
+            create_post(1, id="abc"),
+            create_post(1, title=None),
+            create_post(1, author={"score": float("nan")}),
+            {"userId": 1},
+            [create_post(1)],
+        )
+
+        schema = PostSchema()
+        compiled_schema = compile_schema(schema)
+
+        for data in invalid_data:
+            with self.subTest(data=data):
+                with self.assertRaises(ValidationError) as expected:
+                    schema.load(data)
+
+                with self.assertRaises(ValidationError) as e:
+                    compiled_schema.load(data)
+
+                self.assertEqual(e.exception.messages,
+                                 expected.exception.messages)
+
+    def test_raise_validation_errors_of_many(self):
+        data = [create_post(1), create_post(2, id="abc")]
+
+        with self.assertRaises(ValidationError) as e:
+            compile_schema(PostSchema(many=True)).load(data)
+
+        self.assertEqual(
+            e.exception.messages, {1: {"id": ["Not a valid integer."]}})
+
+    def test_do_not_compile_schema_with_validation_hooks(self):
+        schema = ValidatedSchema()
+
+        self.assertFalse(is_compilable_schema(schema))
+
+        compiled_schema = compile_schema(schema)
+
+        self.assertFalse(compiled_schema.compiled)
+        self.assertEqual(compiled_schema.load({"value": 1}), {"value": 1})
+
+    def test_validation_sample_rate(self):
+        schema = PostSchema()
+        data = create_post(1)
+
+        with patch.object(schema, "load", wraps=schema.load) as load_mock:
+            compiled_schema = compile_schema(schema, validation_sample_rate=1)
+            compiled_schema.load(data)
+
+            compiled_schema.validation_sample_rate = 0
+            compiled_schema.load(data)
+
+        load_mock.assert_called_once_with(data, many=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,22 @@
-from unittest import TestCase, main
-from unittest.mock import MagicMock
+import threading
+from unittest import TestCase, IsolatedAsyncioTestCase, main
+from unittest.mock import MagicMock, AsyncMock, patch
 from collections import namedtuple
 
 from marshmallow import post_load
 from marshmallow.schema import Schema
 from marshmallow.fields import Str
 
-from clientlib.endpoints import Endpoint
+from clientlib.clients import Client, AsyncClient
+from clientlib.columnar import ColumnarResult
+from clientlib.deserialization import compile_schema
+from clientlib.endpoints import Endpoint, BoundEndpoint, AsyncBoundEndpoint
+from clientlib.functions import Function, AsyncFunction
+from clientlib.instrumentation import NO_INSTRUMENTATION
 from clientlib.models import Response, EndpointResponse
-from clientlib.exceptions import ResponseDeserializationError, ExecutionError
+from clientlib.exceptions import (
+    ResponseDeserializationError, ExecutionError, EndpointDeclarationError
+)
 
 
 SampleResponse = namedtuple("SampleResponse", ["message"])
@@ -32,6 +40,14 @@ class SamplePayloadSchema(Schema):
 
 
 class EndpointTests(TestCase):
+    def test_fail_when_args_do_not_match_the_endpoint_template(self):
+        with self.assertRaises(EndpointDeclarationError):
+            Endpoint(
+                method="GET",
+                endpoint="/test/{arg1}",
+                args=["arg2"]
+            )
+
     def test_execute(self):
         function_mock = MagicMock()
         function_mock.execute.return_value = Response(
@@ -48,7 +64,7 @@ class EndpointTests(TestCase):
             method="GET",
             endpoint="/test",
         )
-        endpoint._function = function_mock
+        endpoint = BoundEndpoint(endpoint, function_mock)
 
         response = endpoint.execute()
 
@@ -68,7 +84,28 @@ class EndpointTests(TestCase):
         )
 
         function_mock.execute.assert_called_once_with(
-            args={}, params={}, json=None)
+            args={}, params={}, json=None, headers=None)
+
+    def test_execute_with_function_without_instrumentation(self):
+        function_mock = MagicMock(spec=["execute"])
+        function_mock.execute.return_value = Response(
+            status_code=200,
+            headers={},
+            json={
+                "message": "hello world"
+            }
+        )
+
+        endpoint = Endpoint(
+            method="GET",
+            endpoint="/test",
+            response_schema=SampleResponseSchema()
+        )
+        endpoint = BoundEndpoint(endpoint, function_mock)
+
+        endpoint_response = endpoint()
+
+        self.assertEqual(endpoint_response.data.message, "hello world")
 
     def test_execute_with_args(self):
         function_mock = MagicMock()
@@ -87,7 +124,7 @@ class EndpointTests(TestCase):
             endpoint="/test/{arg1}",
             args=["arg1"]
         )
-        endpoint._function = function_mock
+        endpoint = BoundEndpoint(endpoint, function_mock)
 
         response = endpoint.execute(arg1="value")
 
@@ -111,7 +148,8 @@ class EndpointTests(TestCase):
                 "arg1": "value"
             },
             params={},
-            json=None
+            json=None,
+            headers=None
         )
 
     def test_execute_with_params(self):
@@ -131,7 +169,7 @@ class EndpointTests(TestCase):
             endpoint="/test",
             params=["param1"]
         )
-        endpoint._function = function_mock
+        endpoint = BoundEndpoint(endpoint, function_mock)
 
         response = endpoint.execute(param1="value")
 
@@ -155,7 +193,8 @@ class EndpointTests(TestCase):
             params={
                 "param1": "value"
             },
-            json=None
+            json=None,
+            headers=None
         )
 
     def test_execute_with_response_schema(self):
@@ -175,7 +214,7 @@ class EndpointTests(TestCase):
             endpoint="/test",
             response_schema=SampleResponseSchema()
         )
-        endpoint._function = function_mock
+        endpoint = BoundEndpoint(endpoint, function_mock)
 
         response = endpoint.execute()
 
@@ -198,7 +237,7 @@ class EndpointTests(TestCase):
         self.assertEqual(response.data.message, "hello world")
 
         function_mock.execute.assert_called_once_with(
-            args={}, params={}, json=None)
+            args={}, params={}, json=None, headers=None)
 
     def test_execute_with_response_schema_and_unsuccessful_status_code(self):
         function_mock = MagicMock()
@@ -217,7 +256,7 @@ class EndpointTests(TestCase):
             endpoint="/test",
             response_schema=SampleResponseSchema()
         )
-        endpoint._function = function_mock
+        endpoint = BoundEndpoint(endpoint, function_mock)
 
         with self.assertRaises(ExecutionError) as e:
             endpoint.execute()
@@ -239,7 +278,7 @@ class EndpointTests(TestCase):
         )
 
         function_mock.execute.assert_called_once_with(
-            args={}, params={}, json=None)
+            args={}, params={}, json=None, headers=None)
 
     def test_execute_with_response_schema_and_invalid_response(self):
         function_mock = MagicMock()
@@ -256,7 +295,7 @@ class EndpointTests(TestCase):
             endpoint="/test",
             response_schema=SampleResponseSchema()
         )
-        endpoint._function = function_mock
+        endpoint = BoundEndpoint(endpoint, function_mock)
 
         with self.assertRaises(ResponseDeserializationError) as e:
             endpoint.execute()
@@ -283,7 +322,151 @@ class EndpointTests(TestCase):
         self.assertDictEqual(e.exception.response.json, {})
 
         function_mock.execute.assert_called_once_with(
-            args={}, params={}, json=None)
+            args={}, params={}, json=None, headers=None)
+
+    def test_execute_with_compiled_response_schema(self):
+        function_mock = MagicMock()
+        function_mock.execute.return_value = Response(
+            status_code=200,
+            headers={},
+            json=[{"message": "hello"}, {"message": "world"}]
+        )
+
+        endpoint = Endpoint(
+            method="GET",
+            endpoint="/test",
+            response_schema=compile_schema(SampleResponseSchema(many=True))
+        )
+        endpoint = BoundEndpoint(endpoint, function_mock)
+
+        response = endpoint.execute()
+
+        self.assertEqual(
+            response.data,
+            [SampleResponse(message="hello"), SampleResponse(message="world")]
+        )
+
+    def test_execute_with_compiled_response_schema_and_invalid_data(self):
+        function_mock = MagicMock()
+        function_mock.execute.return_value = Response(
+            status_code=200,
+            headers={},
+            json={"message": 1}
+        )
+
+        endpoint = Endpoint(
+            method="GET",
+            endpoint="/test",
+            response_schema=compile_schema(SampleResponseSchema())
+        )
+        endpoint = BoundEndpoint(endpoint, function_mock)
+
+        with self.assertRaises(ResponseDeserializationError) as e:
+            endpoint.execute()
+
+        self.assertDictEqual(
+            e.exception.errors, {"message": ["Not a valid string."]})
+
+    def test_execute_lazy_endpoint(self):
+        function_mock = MagicMock()
+        function_mock.execute.return_value = Response(
+            status_code=200,
+            headers={},
+            json={"message": "hello world"}
+        )
+
+        schema = SampleResponseSchema()
+        endpoint = Endpoint(
+            method="GET",
+            endpoint="/test",
+            response_schema=schema,
+            lazy=True
+        )
+        endpoint = BoundEndpoint(endpoint, function_mock)
+
+        with patch.object(schema, "load", wraps=schema.load) as load_mock:
+            response = endpoint.execute()
+
+            load_mock.assert_not_called()
+            self.assertEqual(response.response.status_code, 200)
+            self.assertEqual(response.data, SampleResponse("hello world"))
+            load_mock.assert_called_once_with({"message": "hello world"})
+
+    def test_execute_lazy_endpoint_with_many_schema(self):
+        function_mock = MagicMock()
+        function_mock.execute.return_value = Response(
+            status_code=200,
+            headers={},
+            json=[{"message": "hello"}, {"message": 1}]
+        )
+
+        endpoint = Endpoint(
+            method="GET",
+            endpoint="/test",
+            response_schema=SampleResponseSchema(many=True),
+            lazy=True
+        )
+        endpoint = BoundEndpoint(endpoint, function_mock)
+
+        response = endpoint.execute()
+
+        self.assertEqual(len(response.data), 2)
+        self.assertEqual(response.data[0], SampleResponse("hello"))
+
+        with self.assertRaises(ResponseDeserializationError) as e:
+            response.data[1]
+
+        self.assertDictEqual(
+            e.exception.errors, {1: {"message": ["Not a valid string."]}})
+
+    def test_execute_lazy_endpoint_with_unsuccessful_status_code(self):
+        function_mock = MagicMock()
+        function_mock.execute.return_value = Response(
+            status_code=500, headers={}, json={})
+
+        endpoint = Endpoint(
+            method="GET",
+            endpoint="/test",
+            response_schema=SampleResponseSchema(),
+            lazy=True
+        )
+        endpoint = BoundEndpoint(endpoint, function_mock)
+
+        with self.assertRaises(ExecutionError):
+            endpoint.execute()
+
+    def test_execute_columnar_endpoint(self):
+        function_mock = MagicMock()
+        function_mock.execute.return_value = Response(
+            status_code=200,
+            headers={},
+            json=[{"message": "hello"}, {"message": "world"}]
+        )
+
+        endpoint = Endpoint(
+            method="GET",
+            endpoint="/test",
+            response_schema=SampleResponseSchema(many=True),
+            columnar=True
+        )
+        endpoint = BoundEndpoint(endpoint, function_mock)
+
+        response = endpoint.execute()
+
+        self.assertIsInstance(response.data, ColumnarResult)
+        self.assertEqual(response.data.column("message"), ["hello", "world"])
+        self.assertEqual(response.data[1].message, "world")
+
+    def test_fail_to_declare_columnar_endpoint_without_many_schema(self):
+        for response_schema in (None, SampleResponseSchema()):
+            with self.subTest(response_schema=response_schema):
+                with self.assertRaises(EndpointDeclarationError):
+                    Endpoint(
+                        method="GET",
+                        endpoint="/test",
+                        response_schema=response_schema,
+                        columnar=True
+                    )
 
     def test_execute_with_response_schema_and_unknown_response_fields(self):
         function_mock = MagicMock()
@@ -302,7 +485,7 @@ class EndpointTests(TestCase):
             endpoint="/test",
             response_schema=SampleResponseSchema()
         )
-        endpoint._function = function_mock
+        endpoint = BoundEndpoint(endpoint, function_mock)
 
         with self.assertRaises(ResponseDeserializationError) as e:
             endpoint.execute()
@@ -335,7 +518,7 @@ class EndpointTests(TestCase):
         )
 
         function_mock.execute.assert_called_once_with(
-            args={}, params={}, json=None)
+            args={}, params={}, json=None, headers=None)
 
     def test_execute_with_payload(self):
         function_mock = MagicMock()
@@ -355,7 +538,7 @@ class EndpointTests(TestCase):
             payload_schema=SamplePayloadSchema(),
             payload="data"
         )
-        endpoint._function = function_mock
+        endpoint = BoundEndpoint(endpoint, function_mock)
 
         response = endpoint.execute(data={"message": "hello"})
 
@@ -379,7 +562,8 @@ class EndpointTests(TestCase):
             params={},
             json={
                 "message": "hello"
-            }
+            },
+            headers=None
         )
 
     def test_execute_with_payload_schema(self):
@@ -400,7 +584,7 @@ class EndpointTests(TestCase):
             payload_schema=SamplePayloadSchema(),
             payload="data"
         )
-        endpoint._function = function_mock
+        endpoint = BoundEndpoint(endpoint, function_mock)
 
         response = endpoint.execute(data=SamplePayload(message="hello"))
 
@@ -424,9 +608,196 @@ class EndpointTests(TestCase):
             params={},
             json={
                 "message": "hello"
+            },
+            headers=None
+        )
+
+    def test_execute_with_stream(self):
+        function_mock = MagicMock()
+        function_mock.execute.return_value = Response(
+            status_code=200,
+            headers={
+                "Content-Type": "application/json"
+            },
+            json=iter([
+                {"message": "hello"},
+                {"message": "world"}
+            ])
+        )
+
+        endpoint = Endpoint(
+            method="GET",
+            endpoint="/test",
+            response_schema=SampleResponseSchema(many=True),
+            stream=True
+        )
+        endpoint = BoundEndpoint(endpoint, function_mock)
+
+        response = endpoint.execute()
+
+        self.assertIsInstance(response, EndpointResponse)
+        self.assertEqual(next(response.data), SampleResponse("hello"))
+        self.assertEqual(next(response.data), SampleResponse("world"))
+        with self.assertRaises(StopIteration):
+            next(response.data)
+
+    def test_execute_with_stream_and_invalid_item(self):
+        function_mock = MagicMock()
+        function_mock.execute.return_value = Response(
+            status_code=200,
+            headers={},
+            json=iter([
+                {"message": "hello"},
+                {}
+            ])
+        )
+
+        endpoint = Endpoint(
+            method="GET",
+            endpoint="/test",
+            response_schema=SampleResponseSchema(many=True),
+            stream=True
+        )
+        endpoint = BoundEndpoint(endpoint, function_mock)
+
+        response = endpoint.execute()
+
+        self.assertEqual(next(response.data), SampleResponse("hello"))
+        with self.assertRaises(ResponseDeserializationError) as e:
+            next(response.data)
+
+        self.assertDictEqual(
+            e.exception.errors,
+            {
+                "message": ["Missing data for required field."]
             }
         )
 
 
+class SampleEndpoints(object):
+    message = Endpoint(
+        method="GET",
+        endpoint="/message",
+        response_schema=SampleResponseSchema()
+    )
+
+
+class SampleClient(SampleEndpoints, Client):
+    pass
+
+
+class SampleAsyncClient(SampleEndpoints, AsyncClient):
+    pass
+
+
+class EndpointBindingTests(TestCase):
+    def test_bind_to_client(self):
+        client = SampleClient(base_url="http://localhost")
+
+        endpoint = client.message
+
+        self.assertIsInstance(endpoint, BoundEndpoint)
+        self.assertIs(endpoint.endpoint, SampleEndpoints.message)
+        self.assertIsInstance(endpoint.function, Function)
+        self.assertIs(endpoint.function.session, client.session)
+        self.assertIs(client.message, endpoint)
+        self.assertIs(client.__dict__["message"], endpoint)
+
+    def test_bind_to_async_client(self):
+        client = SampleAsyncClient(base_url="http://localhost")
+
+        endpoint = client.message
+
+        self.assertIsInstance(endpoint, AsyncBoundEndpoint)
+        self.assertIsInstance(endpoint.function, AsyncFunction)
+        self.assertIs(client.message, endpoint)
+
+    def test_clients_do_not_share_functions(self):
+        client_1 = SampleClient(base_url="http://localhost:8000", timeout=1)
+        client_2 = SampleClient(base_url="http://localhost:9000", timeout=2)
+
+        self.assertEqual(
+            client_1.message.function.base_url, "http://localhost:8000")
+        self.assertEqual(client_1.message.function.timeout, 1)
+        self.assertEqual(
+            client_2.message.function.base_url, "http://localhost:9000")
+        self.assertEqual(client_2.message.function.timeout, 2)
+
+    def test_concurrent_access_returns_one_bound_endpoint(self):
+        client = SampleClient(base_url="http://localhost")
+        barrier = threading.Barrier(8)
+        endpoints = []
+
+        def access():
+            barrier.wait()
+            endpoints.append(client.message)
+
+        threads = [threading.Thread(target=access) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(endpoints), 8)
+        self.assertTrue(
+            all(endpoint is client.message for endpoint in endpoints))
+
+    def test_access_from_class_returns_declaration(self):
+        self.assertIsInstance(SampleClient.message, Endpoint)
+
+
+class AsyncEndpointTests(IsolatedAsyncioTestCase):
+    async def test_execute_async_with_response_schema(self):
+        function_mock = AsyncMock()
+        function_mock.instrumentation = NO_INSTRUMENTATION
+        function_mock.execute.return_value = Response(
+            status_code=200,
+            headers={
+                "Content-Type": "application/json"
+            },
+            json={
+                "message": "hello world"
+            }
+        )
+
+        endpoint = Endpoint(
+            method="GET",
+            endpoint="/test/{arg1}",
+            args=["arg1"],
+            response_schema=SampleResponseSchema()
+        )
+        endpoint = AsyncBoundEndpoint(endpoint, function_mock)
+
+        response = await endpoint.execute(arg1="value")
+
+        self.assertIsInstance(response, EndpointResponse)
+        self.assertEqual(response.data, SampleResponse(message="hello world"))
+
+        function_mock.execute.assert_awaited_once_with(
+            args={"arg1": "value"}, params={}, json=None,
+            headers=None)
+
+    async def test_execute_async_with_unsuccessful_status_code(self):
+        function_mock = AsyncMock()
+        function_mock.instrumentation = NO_INSTRUMENTATION
+        function_mock.execute.return_value = Response(
+            status_code=500,
+            headers={},
+            json={
+                "error": "operation failed"
+            }
+        )
+
+        endpoint = Endpoint(
+            method="GET",
+            endpoint="/test",
+            response_schema=SampleResponseSchema()
+        )
+        endpoint = AsyncBoundEndpoint(endpoint, function_mock)
+
+        with self.assertRaises(ExecutionError):
+            await endpoint.execute()
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,300 @@
+import asyncio
+import threading
+import time
+from unittest import TestCase, IsolatedAsyncioTestCase, main
+from unittest.mock import MagicMock
+
+from requests import Session
+
+from clientlib.functions import Function
+from clientlib.hedging import HedgingPolicy
+from clientlib.instrumentation import InMemoryMetrics
+
+
+def create_slow_first_call(results, release):
+    """Create a function whose first call blocks until release is set"""
+    calls = []
+    lock = threading.Lock()
+
+    def function():
+        with lock:
+            call = len(calls)
+            calls.append(call)
+
+        if call == 0:
+            release.wait(5)
+
+        result = results[call]
+        if isinstance(result, Exception):
+            raise result
+
+        return result
+
+    function.calls = calls
+
+    return function
+
+
+class HedgingPolicyTests(TestCase):
+    def setUp(self):
+        self.release = threading.Event()
+
+    def tearDown(self):
+        self.release.set()
+
+    def test_get_delay(self):
+        self.assertEqual(HedgingPolicy(delay=0.1).get_delay("GET", "/"), 0.1)
+
+        policy = HedgingPolicy(percentile=50, min_samples=3)
+        function = MagicMock(return_value="response")
+
+        for _ in range(2):
+            policy.execute(function, "GET", "/test")
+        self.assertIsNone(policy.get_delay("GET", "/test"))
+
+        policy.execute(function, "GET", "/test")
+        self.assertIsNotNone(policy.get_delay("GET", "/test"))
+        self.assertIsNone(policy.get_delay("GET", "/other"))
+
+    def test_can_hedge_method(self):
+        policy = HedgingPolicy()
+
+        self.assertTrue(policy.can_hedge_method("GET"))
+        self.assertTrue(policy.can_hedge_method("put"))
+        self.assertFalse(policy.can_hedge_method("POST"))
+
+    def test_fast_request_is_not_hedged(self):
+        policy = HedgingPolicy(delay=1)
+        function = MagicMock(return_value="response")
+
+        self.assertEqual(policy.execute(function, "GET", "/test"), "response")
+
+        function.assert_called_once_with()
+        self.assertEqual(policy.hedges, 0)
+
+    def test_hedged_request_wins(self):
+        policy = HedgingPolicy(delay=0.01)
+        on_hedge = MagicMock()
+        on_hedge_win = MagicMock()
+        function = create_slow_first_call(["first", "hedge"], self.release)
+
+        response = policy.execute(
+            function, "GET", "/test", on_hedge=on_hedge,
+            on_hedge_win=on_hedge_win
+        )
+
+        self.assertEqual(response, "hedge")
+        self.assertEqual(policy.requests, 1)
+        self.assertEqual(policy.hedges, 1)
+        self.assertEqual(policy.hedge_wins, 1)
+        self.assertEqual(policy.hedge_win_rate, 1.0)
+        on_hedge.assert_called_once_with()
+        on_hedge_win.assert_called_once_with()
+
+    def test_limit_hedge_rate(self):
+        policy = HedgingPolicy(delay=0.01, max_hedge_ratio=0, max_burst=1)
+
+        function = create_slow_first_call(["first", "hedge"], self.release)
+        self.assertEqual(policy.execute(function, "GET", "/test"), "hedge")
+
+        release = threading.Event()
+        function = create_slow_first_call(["first", "hedge"], release)
+        threading.Timer(0.05, release.set).start()
+
+        self.assertEqual(policy.execute(function, "GET", "/test"), "first")
+        self.assertEqual(function.calls, [0])
+        self.assertEqual(policy.hedges, 1)
+
+    def test_wait_for_first_request_when_hedge_fails(self):
+        policy = HedgingPolicy(delay=0.01)
+        function = create_slow_first_call(
+            ["first", ValueError("failed")], self.release)
+        threading.Timer(0.05, self.release.set).start()
+
+        self.assertEqual(policy.execute(function, "GET", "/test"), "first")
+        self.assertEqual(policy.hedge_wins, 0)
+        self.assertEqual(policy.hedge_win_rate, 0.0)
+
+    def test_raise_error_of_first_request_when_both_fail(self):
+        policy = HedgingPolicy(delay=0.01)
+        error = ValueError("first failed")
+        function = create_slow_first_call(
+            [error, ValueError("hedge failed")], self.release)
+        threading.Timer(0.05, self.release.set).start()
+
+        with self.assertRaises(ValueError) as context:
+            policy.execute(function, "GET", "/test")
+
+        self.assertIs(context.exception, error)
+
+    def test_concurrency_is_not_limited(self):
+        policy = HedgingPolicy(delay=5)
+        barrier = threading.Barrier(40, timeout=2)
+        results = []
+
+        def function():
+            barrier.wait()
+
+            return "response"
+
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    policy.execute(function, "GET", "/test")))
+            for _ in range(40)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, ["response"] * 40)
+        self.assertEqual(policy.hedges, 0)
+
+    def test_dont_hedge_request_that_waits_for_a_thread(self):
+        policy = HedgingPolicy(delay=0.05, max_concurrency=1)
+        for _ in range(policy.max_workers):
+            policy._get_executor().submit(time.sleep, 0.2)
+
+        response = policy.execute(
+            lambda: time.sleep(0.01) or "response", "GET", "/test")
+
+        self.assertEqual(response, "response")
+        self.assertEqual(policy.hedges, 0)
+        self.assertLess(
+            policy._windows[("GET", "/test")].percentile(100), 0.1)
+
+    def test_execute_request_inline_when_thread_pool_is_saturated(self):
+        policy = HedgingPolicy(delay=0.01, max_concurrency=1)
+        function = create_slow_first_call(["first", "hedge"], self.release)
+        caller = threading.Thread(
+            target=policy.execute, args=(function, "GET", "/test"))
+        caller.start()
+
+        time.sleep(0.05)
+        threads = []
+        response = policy.execute(
+            lambda: threads.append(threading.current_thread()) or "response",
+            "GET", "/test"
+        )
+        self.release.set()
+        caller.join()
+
+        self.assertEqual(response, "response")
+        self.assertEqual(threads, [threading.current_thread()])
+        self.assertEqual(policy.hedges, 1)
+
+    def test_skip_hedge_when_thread_pool_is_saturated(self):
+        policy = HedgingPolicy(delay=0.01, max_concurrency=1)
+        policy._hedge_slots.try_acquire()
+        function = create_slow_first_call(["first", "hedge"], self.release)
+        threading.Timer(0.05, self.release.set).start()
+
+        self.assertEqual(policy.execute(function, "GET", "/test"), "first")
+        self.assertEqual(function.calls, [0])
+        self.assertEqual(policy.hedges, 0)
+        self.assertEqual(policy.budget._balance, 10)
+
+    def test_limit_thread_pool_size(self):
+        policy = HedgingPolicy(max_concurrency=4)
+
+        self.assertEqual(policy.max_workers, 8)
+        self.assertEqual(policy._get_executor()._max_workers, 8)
+
+    def test_fail_with_invalid_concurrency(self):
+        with self.assertRaises(ValueError):
+            HedgingPolicy(max_concurrency=0)
+
+
+class AsyncHedgingPolicyTests(IsolatedAsyncioTestCase):
+    async def test_cancel_request_that_lost(self):
+        policy = HedgingPolicy(delay=0.01)
+        calls = []
+        cancelled = []
+
+        async def function():
+            calls.append(len(calls))
+
+            if len(calls) == 1:
+                try:
+                    await asyncio.sleep(5)
+                except asyncio.CancelledError:
+                    cancelled.append(True)
+                    raise
+
+                return "first"
+
+            return "hedge"
+
+        response = await policy.execute_async(function, "GET", "/test")
+        await asyncio.sleep(0)
+
+        self.assertEqual(response, "hedge")
+        self.assertEqual(cancelled, [True])
+        self.assertEqual(policy.hedge_wins, 1)
+
+    async def test_fast_request_is_not_hedged(self):
+        policy = HedgingPolicy(delay=1)
+
+        async def function():
+            return "response"
+
+        self.assertEqual(
+            await policy.execute_async(function, "GET", "/test"), "response")
+        self.assertEqual(policy.hedges, 0)
+
+
+class FunctionHedgingTests(TestCase):
+    def setUp(self):
+        self.release = threading.Event()
+
+    def tearDown(self):
+        self.release.set()
+
+    def _create_function(self, method, transport, instrumentation=None):
+        return Function(
+            session=Session(),
+            base_url="http://localhost",
+            method=method,
+            endpoint="/test",
+            hedging_policy=HedgingPolicy(delay=0.01),
+            transport=transport,
+            instrumentation=instrumentation
+        )
+
+    def _create_transport(self):
+        responses = [
+            MagicMock(status_code=200, headers={}, content=b'"first"'),
+            MagicMock(status_code=200, headers={}, content=b'"hedge"')
+        ]
+        send = create_slow_first_call(responses, self.release)
+
+        transport = MagicMock()
+        transport.send.side_effect = lambda **kwargs: send()
+
+        return transport
+
+    def test_hedge_idempotent_requests(self):
+        metrics = InMemoryMetrics()
+        function = self._create_function(
+            "GET", self._create_transport(), metrics)
+
+        response = function.execute()
+
+        self.assertEqual(response.json, "hedge")
+        self.assertEqual(metrics.events[("GET", "/test", "hedge")], 1)
+        self.assertEqual(metrics.events[("GET", "/test", "hedge_win")], 1)
+
+    def test_dont_hedge_non_idempotent_requests(self):
+        transport = self._create_transport()
+        function = self._create_function("POST", transport)
+        threading.Timer(0.05, self.release.set).start()
+
+        response = function.execute(json={})
+
+        self.assertEqual(response.json, "first")
+        transport.send.assert_called_once()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+import gzip
+import json
+from unittest import TestCase, main
+from unittest.mock import MagicMock, patch
+
+import responses
+from requests import Session
+
+from clientlib.caching import ResponseCache
+from clientlib.endpoints import Endpoint, BoundEndpoint
+from clientlib.exceptions import EndpointTimeout
+from clientlib.functions import Function
+from clientlib.instrumentation import (
+    Histogram, InMemoryMetrics, format_prometheus
+)
+from clientlib.models import Response
+from clientlib.requests import APIRequest
+from clientlib.retries import RetryPolicy
+
+from tests.test_endpoints import SampleResponseSchema
+
+
+class HistogramTests(TestCase):
+    def test_observe(self):
+        histogram = Histogram(buckets=(0.1, 1.0))
+
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+
+        self.assertEqual(histogram.count, 4)
+        self.assertAlmostEqual(histogram.sum, 2.65)
+        self.assertEqual(
+            histogram.cumulative_counts(),
+            [(0.1, 2), (1.0, 3), (float("inf"), 4)]
+        )
+
+    def test_percentile(self):
+        histogram = Histogram(buckets=(0.1, 1.0))
+
+        self.assertIsNone(histogram.percentile(50))
+
+        for value in (0.05, 0.05, 0.05, 0.5):
+            histogram.observe(value)
+
+        self.assertEqual(histogram.percentile(50), 0.1)
+        self.assertEqual(histogram.percentile(99), 1.0)
+
+
+class InMemoryMetricsTests(TestCase):
+    def test_format_prometheus(self):
+        metrics = InMemoryMetrics(buckets=(0.1,))
+        metrics.record_timing("GET", "/posts/{id}", "ttfb", 0.05)
+        metrics.record_response("GET", "/posts/{id}", 200, 0, 120)
+        metrics.record_event("GET", "/posts/{id}", "retry")
+
+        self.assertEqual(
+            format_prometheus(metrics).splitlines(),
+            [
+                "# HELP clientlib_request_phase_seconds The duration of the "
+                "request phases",
+                "# TYPE clientlib_request_phase_seconds histogram",
+                'clientlib_request_phase_seconds_bucket{method="GET",'
+                'endpoint="/posts/{id}",phase="ttfb",le="0.1"} 1',
+                'clientlib_request_phase_seconds_bucket{method="GET",'
+                'endpoint="/posts/{id}",phase="ttfb",le="+Inf"} 1',
+                'clientlib_request_phase_seconds_sum{method="GET",'
+                'endpoint="/posts/{id}",phase="ttfb"} 0.05',
+                'clientlib_request_phase_seconds_count{method="GET",'
+                'endpoint="/posts/{id}",phase="ttfb"} 1',
+                "# HELP clientlib_responses_total The number of responses",
+                "# TYPE clientlib_responses_total counter",
+                'clientlib_responses_total{method="GET",'
+                'endpoint="/posts/{id}",status_code="200"} 1',
+                "# HELP clientlib_request_bytes_total The size of the "
+                "request bodies",
+                "# TYPE clientlib_request_bytes_total counter",
+                'clientlib_request_bytes_total{method="GET",'
+                'endpoint="/posts/{id}"} 0',
+                "# HELP clientlib_response_bytes_total The size of the "
+                "response bodies on the wire",
+                "# TYPE clientlib_response_bytes_total counter",
+                'clientlib_response_bytes_total{method="GET",'
+                'endpoint="/posts/{id}"} 120',
+                "# HELP clientlib_events_total The number of retries, hedges "
+                "and cache lookups",
+                "# TYPE clientlib_events_total counter",
+                'clientlib_events_total{method="GET",'
+                'endpoint="/posts/{id}",event="retry"} 1',
+            ]
+        )
+
+    def test_escape_label_values(self):
+        metrics = InMemoryMetrics()
+        metrics.record_event("GET", '/a"b\\c', "retry")
+
+        self.assertIn('endpoint="/a\\"b\\\\c"', format_prometheus(metrics))
+
+
+class APIRequestInstrumentationTests(TestCase):
+    @responses.activate
+    def test_record_request_metrics(self):
+        responses.add(
+            responses.POST,
+            "http://localhost/api/v1/test/1",
+            json={"message": "hello world"},
+            status=201
+        )
+
+        metrics = InMemoryMetrics()
+
+        request = APIRequest(
+            session=Session(),
+            base_url="http://localhost",
+            method="POST",
+            endpoint="/api/v1/test/{item_id}",
+            args={"item_id": 1},
+            json={"message": "hello"},
+            instrumentation=metrics
+        )
+
+        response = request.execute()
+
+        self.assertEqual(response.json, {"message": "hello world"})
+        self.assertEqual(
+            sorted(phase for _, _, phase in metrics.timings),
+            ["body_read", "json_decode", "ttfb", "url_build"]
+        )
+        self.assertEqual(
+            metrics.responses, {("POST", "/api/v1/test/{item_id}", 201): 1})
+        self.assertEqual(
+            metrics.bytes_sent[("POST", "/api/v1/test/{item_id}")],
+            len(b'{"message": "hello"}')
+        )
+        self.assertEqual(
+            metrics.bytes_received[("POST", "/api/v1/test/{item_id}")],
+            len(b'{"message": "hello world"}')
+        )
+
+    @responses.activate
+    def test_record_compressed_size_of_response(self):
+        content = json.dumps([{"message": "hello world"}] * 100).encode()
+        body = gzip.compress(content)
+        responses.add(
+            responses.GET,
+            "http://localhost/api/v1/test",
+            body=body,
+            headers={"Content-Encoding": "gzip"},
+            content_type="application/json"
+        )
+
+        metrics = InMemoryMetrics()
+
+        request = APIRequest(
+            session=Session(),
+            base_url="http://localhost",
+            method="GET",
+            endpoint="/api/v1/test",
+            instrumentation=metrics
+        )
+
+        response = request.execute()
+
+        self.assertEqual(len(response.json), 100)
+        self.assertEqual(
+            metrics.bytes_received[("GET", "/api/v1/test")], len(body))
+        self.assertLess(len(body), len(content))
+
+
+class FunctionInstrumentationTests(TestCase):
+    @patch("clientlib.retries.time.sleep")
+    @patch("clientlib.functions.APIRequest.execute")
+    def test_record_retries(self, execute_mock, sleep_mock):
+        execute_mock.side_effect = [
+            EndpointTimeout(), EndpointTimeout(), Response(200, {}, {})]
+        metrics = InMemoryMetrics()
+
+        function = Function(
+            session=MagicMock(),
+            base_url="http://localhost",
+            method="GET",
+            endpoint="/test",
+            retry_policy=RetryPolicy(budget=None),
+            instrumentation=metrics
+        )
+        function.execute()
+
+        self.assertEqual(metrics.events, {("GET", "/test", "retry"): 2})
+
+
+class EndpointInstrumentationTests(TestCase):
+    def test_record_schema_load_and_cache_lookups(self):
+        metrics = InMemoryMetrics()
+
+        function_mock = MagicMock()
+        function_mock.instrumentation = metrics
+        function_mock.create_url.return_value = "http://localhost/test"
+        function_mock.execute.return_value = Response(
+            status_code=200, headers={}, json={"message": "hello"})
+
+        endpoint = BoundEndpoint(
+            Endpoint(
+                method="GET",
+                endpoint="/test",
+                response_schema=SampleResponseSchema()
+            ),
+            function_mock,
+            ResponseCache()
+        )
+
+        endpoint()
+        endpoint()
+
+        self.assertEqual(
+            list(metrics.timings), [("GET", "/test", "schema_load")])
+        self.assertEqual(
+            metrics.events,
+            {
+                ("GET", "/test", "cache_miss"): 1,
+                ("GET", "/test", "cache_hit"): 1
+            }
+        )
+
+
+if __name__ == "__main__":
+    main()
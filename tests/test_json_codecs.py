@@ -0,0 +1,69 @@
+from unittest import TestCase, main
+
+from clientlib.json_codecs import (
+    StdlibJSONCodec, OrjsonCodec, MsgspecCodec, UjsonCodec,
+    get_available_codecs, get_fastest_codec
+)
+
+
+DOCUMENT = {
+    "id": 1,
+    "title": "hello world",
+    "ratio": 0.5,
+    "active": True,
+    "parent": None,
+    "tags": ["a", "b", "é"]
+}
+
+
+class JSONCodecTests(TestCase):
+    def _create_codecs(self):
+        codecs = [StdlibJSONCodec()]
+
+        for codec_class in (OrjsonCodec, MsgspecCodec, UjsonCodec):
+            try:
+                codecs.append(codec_class())
+            except ImportError:
+                pass
+
+        return codecs
+
+    def test_round_trip(self):
+        for codec in self._create_codecs():
+            with self.subTest(codec=codec.name):
+                encoded = codec.encode(DOCUMENT)
+
+                self.assertIsInstance(encoded, bytes)
+                self.assertEqual(codec.decode(encoded), DOCUMENT)
+
+    def test_decode_documents_of_other_codecs(self):
+        codecs = self._create_codecs()
+
+        for encoder in codecs:
+            for decoder in codecs:
+                with self.subTest(encoder=encoder.name, decoder=decoder.name):
+                    self.assertEqual(
+                        decoder.decode(encoder.encode(DOCUMENT)), DOCUMENT)
+
+    def test_invalid_document_raises_value_error(self):
+        for codec in self._create_codecs():
+            with self.subTest(codec=codec.name):
+                with self.assertRaises(ValueError):
+                    codec.decode(b"<html></html>")
+
+    def test_stdlib_codec_rejects_nan(self):
+        with self.assertRaises(ValueError):
+            StdlibJSONCodec().encode({"value": float("nan")})
+
+    def test_stdlib_codec_is_always_available(self):
+        codecs = get_available_codecs()
+
+        self.assertIsInstance(codecs[-1], StdlibJSONCodec)
+        self.assertIs(type(get_fastest_codec()), type(codecs[0]))
+
+    def test_stdlib_codec_converts_keys_to_strings(self):
+        self.assertEqual(StdlibJSONCodec().encode({1: "a"}), b'{"1": "a"}')
+
+
+if __name__ == "__main__":
+    main()
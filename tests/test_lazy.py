@@ -0,0 +1,92 @@
+from unittest import TestCase, main
+from unittest.mock import MagicMock
+
+from marshmallow import Schema, fields, post_load
+
+from clientlib.lazy import (
+    LazyList, LazyEndpointResponse, can_load_items_lazily
+)
+from clientlib.deserialization import compile_schema
+
+
+class LazyListTests(TestCase):
+    def setUp(self):
+        self.load_item = MagicMock(side_effect=lambda index, item: item * 10)
+        self.items = LazyList([1, 2, 3], self.load_item)
+
+    def test_load_items_on_access(self):
+        self.assertEqual(len(self.items), 3)
+        self.load_item.assert_not_called()
+
+        self.assertEqual(self.items[1], 20)
+        self.assertEqual(self.items[-1], 30)
+
+        self.assertEqual(self.load_item.call_count, 2)
+
+    def test_cache_loaded_items(self):
+        self.assertEqual(list(self.items), [10, 20, 30])
+        self.assertEqual(list(self.items), [10, 20, 30])
+
+        self.assertEqual(self.load_item.call_count, 3)
+
+    def test_slice(self):
+        self.assertEqual(self.items[1:], [20, 30])
+        self.assertEqual(self.items[::-1], [30, 20, 10])
+
+    def test_index_out_of_range(self):
+        with self.assertRaises(IndexError):
+            self.items[3]
+
+        with self.assertRaises(IndexError):
+            self.items[-4]
+
+    def test_compare_to_list(self):
+        self.assertEqual(self.items, [10, 20, 30])
+        self.assertNotEqual(self.items, [10, 20])
+
+
+class LazyEndpointResponseTests(TestCase):
+    def test_load_data_on_first_access(self):
+        load = MagicMock(return_value={"message": "hello"})
+
+        endpoint_response = LazyEndpointResponse("response", load)
+
+        load.assert_not_called()
+        self.assertEqual(endpoint_response.data, {"message": "hello"})
+        self.assertEqual(endpoint_response.data, {"message": "hello"})
+        load.assert_called_once_with()
+
+    def test_unpack(self):
+        response, data = LazyEndpointResponse("response", lambda: "data")
+
+        self.assertEqual(response, "response")
+        self.assertEqual(data, "data")
+
+
+class CanLoadItemsLazilyTests(TestCase):
+    def test_can_load_items_lazily(self):
+        class ItemSchema(Schema):
+            value = fields.Int()
+
+            @post_load
+            def make_item(self, data, **kwargs):
+                return data
+
+        self.assertTrue(can_load_items_lazily(ItemSchema(many=True)))
+        self.assertTrue(
+            can_load_items_lazily(compile_schema(ItemSchema(many=True))))
+        self.assertFalse(can_load_items_lazily(ItemSchema()))
+
+    def test_can_not_load_items_with_pass_many_hooks_lazily(self):
+        class ItemSchema(Schema):
+            value = fields.Int()
+
+            @post_load(pass_many=True)
+            def make_items(self, data, many, **kwargs):
+                return data
+
+        self.assertFalse(can_load_items_lazily(ItemSchema(many=True)))
+
+
+if __name__ == "__main__":
+    main()
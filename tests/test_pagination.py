@@ -0,0 +1,192 @@
+import threading
+from unittest import TestCase, IsolatedAsyncioTestCase, main
+from unittest.mock import MagicMock, AsyncMock
+
+from clientlib.endpoints import Endpoint, BoundEndpoint, AsyncBoundEndpoint
+from clientlib.exceptions import ExecutionError
+from clientlib.models import Response
+from clientlib.pagination import (
+    OffsetPagination, PageNumberPagination, CursorPagination,
+    LinkHeaderPagination, iter_pages
+)
+
+from tests.test_endpoints import SampleResponseSchema, SampleResponse
+
+
+def create_response(json, headers=None, status_code=200):
+    return Response(status_code=status_code, headers=headers or {}, json=json)
+
+
+class OffsetPaginationTests(TestCase):
+    def test_pages(self):
+        pagination = OffsetPagination(limit=2, items_field="results")
+        params = pagination.first_page_params()
+
+        self.assertDictEqual(params, {"offset": 0, "limit": 2})
+
+        params = pagination.next_page_params(params, None, [1, 2])
+        self.assertDictEqual(params, {"offset": 2, "limit": 2})
+
+        self.assertIsNone(pagination.next_page_params(params, None, [3]))
+
+    def test_extract_items(self):
+        pagination = OffsetPagination(items_field="data.results")
+
+        self.assertEqual(
+            pagination.extract_items(
+                create_response({"data": {"results": [1, 2]}})),
+            [1, 2]
+        )
+
+
+class PageNumberPaginationTests(TestCase):
+    def test_pages(self):
+        pagination = PageNumberPagination(
+            page_size_param="per_page", page_size=2)
+        params = pagination.first_page_params()
+
+        self.assertDictEqual(params, {"page": 1, "per_page": 2})
+
+        params = pagination.next_page_params(params, None, [1, 2])
+        self.assertDictEqual(params, {"page": 2, "per_page": 2})
+
+        self.assertIsNone(pagination.next_page_params(params, None, [3]))
+
+    def test_stop_on_empty_page(self):
+        pagination = PageNumberPagination()
+
+        self.assertIsNone(pagination.next_page_params({"page": 4}, None, []))
+
+
+class CursorPaginationTests(TestCase):
+    def test_pages(self):
+        pagination = CursorPagination(cursor_field="meta.next")
+
+        self.assertDictEqual(pagination.first_page_params(), {})
+        self.assertDictEqual(
+            pagination.next_page_params(
+                {"q": "a"},
+                create_response({"items": [1], "meta": {"next": "abc"}}),
+                [1]
+            ),
+            {"q": "a", "cursor": "abc"}
+        )
+        self.assertIsNone(
+            pagination.next_page_params(
+                {}, create_response({"items": [1], "meta": {}}), [1])
+        )
+
+
+class LinkHeaderPaginationTests(TestCase):
+    def test_pages(self):
+        pagination = LinkHeaderPagination()
+        response = create_response(
+            json=[1],
+            headers={
+                "Link": '<http://localhost/test?page=3&q=a>; rel="next", '
+                        '<http://localhost/test?page=1&q=a>; rel="first"'
+            }
+        )
+
+        self.assertDictEqual(
+            pagination.next_page_params({}, response, [1]),
+            {"page": "3", "q": "a"}
+        )
+        self.assertIsNone(
+            pagination.next_page_params({}, create_response([1]), [1]))
+
+
+class IterPagesTests(TestCase):
+    def test_next_page_is_prefetched(self):
+        fetched = threading.Event()
+
+        def fetch_page(params):
+            if params["page"] == 2:
+                fetched.set()
+
+            return create_response([params["page"]] if params["page"] < 3
+                                   else [])
+
+        pages = iter_pages(fetch_page, PageNumberPagination(), {"page": 1})
+
+        next(pages)
+        self.assertTrue(fetched.wait(5))
+
+        self.assertEqual([items for _, items in pages], [[2], []])
+
+
+class EndpointPaginationTests(TestCase):
+    def test_execute(self):
+        function_mock = MagicMock()
+        function_mock.execute.side_effect = [
+            create_response([{"message": "a"}, {"message": "b"}]),
+            create_response([{"message": "c"}]),
+        ]
+
+        endpoint = BoundEndpoint(
+            Endpoint(
+                method="GET",
+                endpoint="/test",
+                params=["q"],
+                response_schema=SampleResponseSchema(many=True),
+                pagination=OffsetPagination(limit=2)
+            ),
+            function_mock
+        )
+
+        items = list(endpoint(q="hello"))
+
+        self.assertEqual(
+            items,
+            [SampleResponse("a"), SampleResponse("b"), SampleResponse("c")]
+        )
+        function_mock.execute.assert_called_with(
+            args={},
+            params={"q": "hello", "offset": 2, "limit": 2},
+            json=None,
+            headers=None
+        )
+
+    def test_fail_on_unsuccessful_page(self):
+        function_mock = MagicMock()
+        function_mock.execute.return_value = create_response(
+            {"error": "failed"}, status_code=500)
+
+        endpoint = BoundEndpoint(
+            Endpoint(
+                method="GET",
+                endpoint="/test",
+                pagination=PageNumberPagination()
+            ),
+            function_mock
+        )
+
+        with self.assertRaises(ExecutionError):
+            list(endpoint())
+
+
+class AsyncEndpointPaginationTests(IsolatedAsyncioTestCase):
+    async def test_execute(self):
+        function_mock = AsyncMock()
+        function_mock.execute.side_effect = [
+            create_response({"items": [{"message": "a"}], "next": "x"}),
+            create_response({"items": [{"message": "b"}], "next": None}),
+        ]
+
+        endpoint = AsyncBoundEndpoint(
+            Endpoint(
+                method="GET",
+                endpoint="/test",
+                response_schema=SampleResponseSchema(many=True),
+                pagination=CursorPagination(cursor_field="next")
+            ),
+            function_mock
+        )
+
+        items = [item async for item in await endpoint()]
+
+        self.assertEqual(items, [SampleResponse("a"), SampleResponse("b")])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+import asyncio
+import json
+import os
+import pickle
+import subprocess
+import sys
+from collections import namedtuple
+from unittest import TestCase, main
+
+import responses
+from marshmallow import Schema, fields, post_load
+from marshmallow.exceptions import ValidationError
+
+from clientlib.clients import Client
+from clientlib.columnar import ColumnarResult
+from clientlib.deserialization import compile_schema
+from clientlib.endpoints import Endpoint
+from clientlib.exceptions import (
+    InvalidResponseContentType, ResponseDeserializationError
+)
+from clientlib.json_codecs import StdlibJSONCodec
+from clientlib.process_pool import DeferredJSON, ProcessPoolDeserializer
+
+
+Post = namedtuple("Post", ["id", "title"])
+
+
+class PostSchema(Schema):
+    id = fields.Int(required=True)
+    title = fields.Str(required=True)
+
+    @post_load
+    def make_post(self, data, **kwargs):
+        return Post(**data)
+
+
+def create_posts(count):
+    return [{"id": i, "title": "title {}".format(i)} for i in range(count)]
+
+
+class ProcessPoolTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.process_pool = ProcessPoolDeserializer(max_workers=1, threshold=64)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.process_pool.close()
+
+
+class ProcessPoolDeserializerTests(ProcessPoolTestCase):
+    def _load(self, data, schema, columnar=False):
+        return self.process_pool.submit(
+            content=json.dumps(data).encode("utf-8"),
+            schema=schema,
+            columnar=columnar,
+            json_codec=StdlibJSONCodec()
+        ).result()
+
+    def test_should_offload(self):
+        self.assertFalse(self.process_pool.should_offload(b"a" * 63))
+        self.assertTrue(self.process_pool.should_offload(b"a" * 64))
+
+    def test_load(self):
+        self.assertEqual(
+            self._load(create_posts(3), PostSchema(many=True)),
+            [Post(0, "title 0"), Post(1, "title 1"), Post(2, "title 2")]
+        )
+
+    def test_load_with_compiled_schema(self):
+        self.assertEqual(
+            self._load(create_posts(2), compile_schema(PostSchema(many=True))),
+            [Post(0, "title 0"), Post(1, "title 1")]
+        )
+
+    def test_load_columnar_result(self):
+        result = self._load(create_posts(3), PostSchema(many=True), True)
+
+        self.assertIsInstance(result, ColumnarResult)
+        self.assertEqual(list(result.column("id")), [0, 1, 2])
+        self.assertEqual(result[1].title, "title 1")
+
+    def test_raise_validation_error(self):
+        with self.assertRaises(ValidationError) as context:
+            self._load([{"id": "abc"}], PostSchema(many=True))
+
+        self.assertIn("title", context.exception.messages[0])
+
+    def test_raise_value_error_for_invalid_json(self):
+        future = self.process_pool.submit(
+            content=b"[{",
+            schema=PostSchema(many=True),
+            columnar=False,
+            json_codec=StdlibJSONCodec()
+        )
+
+        with self.assertRaises(ValueError):
+            future.result()
+
+    def test_load_deferred_json_once(self):
+        deferred = self.process_pool.defer(
+            json.dumps(create_posts(2)).encode("utf-8"), StdlibJSONCodec())
+        schema = PostSchema(many=True)
+
+        result = deferred.load(schema)
+
+        self.assertIs(deferred.load(schema), result)
+        self.assertIs(asyncio.run(deferred.aload(schema)), result)
+
+
+class SharedMemoryImportTests(TestCase):
+    def test_import_shared_memory_on_use(self):
+        result = subprocess.run(
+            [
+                sys.executable, "-c",
+                "import sys, clientlib.endpoints; "
+                "print('multiprocessing.shared_memory' in sys.modules)"
+            ],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            stdout=subprocess.PIPE,
+            check=True
+        )
+
+        self.assertEqual(result.stdout.strip(), b"False")
+
+
+class ColumnarResultPickleTests(TestCase):
+    def test_pickle(self):
+        result = ColumnarResult({"id": [1, 2], "title": ["a", "b"]}, 2)
+
+        unpickled = pickle.loads(pickle.dumps(result))
+
+        self.assertEqual(list(unpickled), list(result))
+        self.assertEqual(unpickled[0].title, "a")
+
+
+class PostsClient(Client):
+    posts = Endpoint(
+        method="GET",
+        endpoint="/posts",
+        response_schema=PostSchema(many=True)
+    )
+
+    inline_posts = Endpoint(
+        method="GET",
+        endpoint="/posts",
+        response_schema=PostSchema(many=True),
+        process_pool=False
+    )
+
+
+class EndpointProcessPoolTests(ProcessPoolTestCase):
+    def setUp(self):
+        self.client = PostsClient(
+            base_url="http://localhost", process_pool=self.process_pool)
+
+    def tearDown(self):
+        self.client.close()
+
+    @responses.activate
+    def test_deserialize_large_response_in_process_pool(self):
+        responses.add(
+            responses.GET, "http://localhost/posts", json=create_posts(10))
+
+        response = self.client.posts()
+
+        self.assertIsInstance(response.response.json, DeferredJSON)
+        self.assertEqual(len(response.data), 10)
+        self.assertEqual(response.data[9], Post(9, "title 9"))
+
+    @responses.activate
+    def test_deserialize_small_response_inline(self):
+        responses.add(
+            responses.GET, "http://localhost/posts", json=create_posts(1))
+
+        response = self.client.posts()
+
+        self.assertEqual(response.response.json, create_posts(1))
+        self.assertEqual(response.data, [Post(0, "title 0")])
+
+    @responses.activate
+    def test_deserialize_inline_when_disabled(self):
+        responses.add(
+            responses.GET, "http://localhost/posts", json=create_posts(10))
+
+        response = self.client.inline_posts()
+
+        self.assertEqual(response.response.json, create_posts(10))
+        self.assertEqual(len(response.data), 10)
+
+    @responses.activate
+    def test_raise_deserialization_error(self):
+        responses.add(
+            responses.GET, "http://localhost/posts",
+            json=[{"id": i} for i in range(20)]
+        )
+
+        with self.assertRaises(ResponseDeserializationError) as context:
+            self.client.posts()
+
+        self.assertIn("title", context.exception.errors[0])
+
+    @responses.activate
+    def test_raise_invalid_content_type(self):
+        responses.add(
+            responses.GET, "http://localhost/posts", body="[{" * 100)
+
+        with self.assertRaises(InvalidResponseContentType):
+            self.client.posts()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+import threading
+import time
+from unittest import TestCase, IsolatedAsyncioTestCase, main
+from unittest.mock import MagicMock, AsyncMock, patch
+
+from clientlib.exceptions import RateLimitExceeded, DeadlineExceeded
+from clientlib.functions import Function
+from clientlib.models import Response
+from clientlib.ratelimiters import TokenBucketRateLimiter
+from clientlib.timeouts import deadline
+
+
+@patch("clientlib.ratelimiters.time")
+class TokenBucketRateLimiterTests(TestCase):
+    def test_burst_then_wait(self, time_mock):
+        time_mock.monotonic.return_value = 100
+        limiter = TokenBucketRateLimiter(rate=2, capacity=2)
+
+        self.assertTrue(limiter.acquire())
+        self.assertTrue(limiter.acquire())
+        time_mock.sleep.assert_not_called()
+
+        self.assertTrue(limiter.acquire())
+        time_mock.sleep.assert_called_once_with(0.5)
+
+    def test_waiting_callers_are_scheduled_in_order(self, time_mock):
+        time_mock.monotonic.return_value = 100
+        limiter = TokenBucketRateLimiter(rate=10, capacity=1)
+
+        limiter.acquire()
+        limiter.acquire()
+        limiter.acquire()
+
+        waits = [c[0][0] for c in time_mock.sleep.call_args_list]
+        self.assertAlmostEqual(waits[0], 0.1)
+        self.assertAlmostEqual(waits[1], 0.2)
+
+    def test_non_blocking(self, time_mock):
+        time_mock.monotonic.return_value = 100
+        limiter = TokenBucketRateLimiter(rate=1, blocking=False)
+
+        self.assertTrue(limiter.acquire())
+        self.assertFalse(limiter.acquire())
+
+        time_mock.monotonic.return_value = 101
+        self.assertTrue(limiter.acquire())
+        time_mock.sleep.assert_not_called()
+
+    def test_timeout(self, time_mock):
+        time_mock.monotonic.return_value = 100
+        limiter = TokenBucketRateLimiter(rate=1, timeout=0.5)
+
+        limiter.acquire()
+
+        self.assertFalse(limiter.acquire())
+        self.assertTrue(limiter.acquire(timeout=2))
+
+    def test_dont_wait_beyond_deadline(self, time_mock):
+        time_mock.monotonic.return_value = 100
+        limiter = TokenBucketRateLimiter(rate=1)
+
+        limiter.acquire()
+
+        with deadline(0.5):
+            with self.assertRaises(DeadlineExceeded):
+                limiter.acquire()
+
+        time_mock.sleep.assert_not_called()
+
+        with deadline(2):
+            self.assertTrue(limiter.acquire())
+
+        # the token was not reserved by the call that failed
+        time_mock.sleep.assert_called_once_with(1.0)
+
+    def test_adaptive_update(self, time_mock):
+        time_mock.monotonic.return_value = 100
+        time_mock.time.return_value = 1600000000
+        limiter = TokenBucketRateLimiter(rate=10, capacity=10, adaptive=True)
+
+        limiter.update({
+            "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset": "1600000002"
+        })
+        limiter.acquire()
+
+        time_mock.sleep.assert_called_once_with(2.0)
+
+    def test_update_is_ignored_when_not_adaptive(self, time_mock):
+        time_mock.monotonic.return_value = 100
+        limiter = TokenBucketRateLimiter(rate=10)
+
+        limiter.update({"X-RateLimit-Remaining": "0"})
+        limiter.acquire()
+
+        time_mock.sleep.assert_not_called()
+
+
+class TokenBucketRateLimiterValidationTests(TestCase):
+    def test_fail_with_invalid_rate(self):
+        for rate in (0, -1):
+            with self.subTest(rate=rate):
+                with self.assertRaises(ValueError):
+                    TokenBucketRateLimiter(rate=rate)
+
+    def test_fail_with_invalid_capacity(self):
+        with self.assertRaises(ValueError):
+            TokenBucketRateLimiter(rate=1, capacity=0.5)
+
+        self.assertEqual(TokenBucketRateLimiter(rate=0.5).capacity, 1)
+
+
+class TokenBucketRateLimiterConcurrencyTests(TestCase):
+    def test_throughput_under_contention(self):
+        limiter = TokenBucketRateLimiter(rate=500, capacity=1)
+
+        def acquire():
+            for _ in range(25):
+                limiter.acquire()
+
+        threads = [threading.Thread(target=acquire) for _ in range(8)]
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - start
+
+        # 200 tokens at 500 per second with one token available at start
+        self.assertGreaterEqual(elapsed, 0.39)
+        self.assertLess(elapsed, 1.0)
+
+
+class AsyncTokenBucketRateLimiterTests(IsolatedAsyncioTestCase):
+    @patch("clientlib.ratelimiters.asyncio.sleep", new_callable=AsyncMock)
+    async def test_acquire_async(self, sleep_mock):
+        limiter = TokenBucketRateLimiter(rate=1)
+
+        self.assertTrue(await limiter.acquire_async())
+        self.assertTrue(await limiter.acquire_async())
+
+        sleep_mock.assert_awaited_once()
+
+
+class FunctionRateLimitTests(TestCase):
+    @patch("clientlib.functions.APIRequest.execute")
+    def test_raise_when_rate_limit_is_exceeded(self, execute_mock):
+        execute_mock.return_value = Response(
+            status_code=200, headers={}, json={})
+        limiter = TokenBucketRateLimiter(rate=0.1, blocking=False)
+        function = Function(
+            session=MagicMock(),
+            base_url="http://localhost",
+            method="GET",
+            endpoint="/test",
+            rate_limiters=[limiter]
+        )
+
+        function.execute()
+
+        with self.assertRaises(RateLimitExceeded) as e:
+            function.execute()
+
+        self.assertEqual(
+            e.exception.reason, "the rate limit has been exceeded")
+        self.assertEqual(e.exception.endpoint, "/test")
+        self.assertEqual(execute_mock.call_count, 1)
+
+    @patch("clientlib.functions.APIRequest.execute")
+    def test_raise_when_token_is_not_available_before_deadline(
+            self, execute_mock):
+        execute_mock.return_value = Response(
+            status_code=200, headers={}, json={})
+        limiter = TokenBucketRateLimiter(rate=0.1)
+        function = Function(
+            session=MagicMock(),
+            base_url="http://localhost",
+            method="GET",
+            endpoint="/test",
+            rate_limiters=[limiter]
+        )
+
+        function.execute()
+
+        with deadline(1):
+            with self.assertRaises(DeadlineExceeded) as e:
+                function.execute()
+
+        self.assertEqual(e.exception.endpoint, "/test")
+        self.assertEqual(execute_mock.call_count, 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+from unittest import TestCase, IsolatedAsyncioTestCase, main
+from unittest.mock import MagicMock, AsyncMock, patch
+
+from clientlib.exceptions import (
+    EndpointTimeout, EndpointConnectionError, EndpointRequestError
+)
+from clientlib.functions import Function
+from clientlib.models import Response
+from clientlib.retries import RetryPolicy, RetryBudget, parse_retry_after
+
+
+def create_response(status_code, headers=None):
+    return Response(status_code=status_code, headers=headers or {}, json={})
+
+
+class ParseRetryAfterTests(TestCase):
+    def test_parse_seconds(self):
+        self.assertEqual(parse_retry_after("3"), 3.0)
+
+    def test_parse_date_in_the_past(self):
+        self.assertEqual(
+            parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+
+    def test_parse_invalid_value(self):
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertIsNone(parse_retry_after(None))
+
+
+class RetryBudgetTests(TestCase):
+    @patch("clientlib.retries.time")
+    def test_budget(self, time_mock):
+        time_mock.monotonic.return_value = 100
+        budget = RetryBudget(
+            ratio=0.5, min_retries_per_second=1, max_balance=2)
+
+        self.assertTrue(budget.try_withdraw())
+        self.assertTrue(budget.try_withdraw())
+        self.assertFalse(budget.try_withdraw())
+
+        budget.record_request()
+        budget.record_request()
+        self.assertTrue(budget.try_withdraw())
+        self.assertFalse(budget.try_withdraw())
+
+        time_mock.monotonic.return_value = 101
+        self.assertTrue(budget.try_withdraw())
+
+
+@patch("clientlib.retries.time.sleep")
+class RetryPolicyTests(TestCase):
+    def test_retry_status_code(self, sleep_mock):
+        function = MagicMock(side_effect=[
+            create_response(503), create_response(200)])
+        policy = RetryPolicy(budget=None)
+
+        response = policy.execute(function)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(function.call_count, 2)
+        sleep_mock.assert_called_once()
+
+    def test_retry_errors(self, sleep_mock):
+        function = MagicMock(side_effect=[
+            EndpointTimeout(), EndpointConnectionError(),
+            create_response(200)
+        ])
+        policy = RetryPolicy(budget=None)
+
+        self.assertEqual(policy.execute(function).status_code, 200)
+        self.assertEqual(sleep_mock.call_count, 2)
+
+    def test_do_not_retry_other_request_errors(self, sleep_mock):
+        function = MagicMock(side_effect=EndpointRequestError())
+        policy = RetryPolicy(budget=None)
+
+        with self.assertRaises(EndpointRequestError):
+            policy.execute(function)
+
+        self.assertEqual(function.call_count, 1)
+
+    def test_give_up_after_max_retries(self, sleep_mock):
+        function = MagicMock(side_effect=EndpointTimeout())
+        policy = RetryPolicy(max_retries=2, budget=None)
+
+        with self.assertRaises(EndpointTimeout):
+            policy.execute(function)
+
+        self.assertEqual(function.call_count, 3)
+
+    def test_exponential_backoff(self, sleep_mock):
+        function = MagicMock(side_effect=[
+            create_response(502), create_response(502),
+            create_response(502), create_response(502)
+        ])
+        policy = RetryPolicy(
+            max_retries=3, backoff_factor=0.5, max_backoff=1.5,
+            jitter=False, budget=None
+        )
+
+        response = policy.execute(function)
+
+        self.assertEqual(response.status_code, 502)
+        self.assertEqual(
+            [c[0][0] for c in sleep_mock.call_args_list], [0.5, 1.0, 1.5])
+
+    def test_respect_retry_after(self, sleep_mock):
+        function = MagicMock(side_effect=[
+            create_response(429, {"Retry-After": "2"}),
+            create_response(200)
+        ])
+        policy = RetryPolicy(budget=None)
+
+        policy.execute(function)
+
+        sleep_mock.assert_called_once_with(2.0)
+
+    def test_do_not_retry_when_retry_after_exceeds_max_backoff(
+            self, sleep_mock):
+        function = MagicMock(return_value=create_response(
+            429, {"Retry-After": "120"}))
+        policy = RetryPolicy(max_backoff=10, budget=None)
+
+        self.assertEqual(policy.execute(function).status_code, 429)
+        self.assertEqual(function.call_count, 1)
+
+    def test_budget_limits_retries(self, sleep_mock):
+        function = MagicMock(side_effect=EndpointTimeout())
+        budget = RetryBudget(
+            ratio=0, min_retries_per_second=0, max_balance=1)
+        policy = RetryPolicy(budget=budget)
+
+        with self.assertRaises(EndpointTimeout):
+            policy.execute(function)
+
+        self.assertEqual(function.call_count, 2)
+
+    def test_can_retry_method(self, sleep_mock):
+        self.assertTrue(RetryPolicy().can_retry_method("get"))
+        self.assertFalse(RetryPolicy().can_retry_method("POST"))
+        self.assertTrue(
+            RetryPolicy(retry_non_idempotent=True).can_retry_method("POST"))
+
+
+@patch("clientlib.retries.asyncio.sleep", new_callable=AsyncMock)
+class AsyncRetryPolicyTests(IsolatedAsyncioTestCase):
+    async def test_retry(self, sleep_mock):
+        function = AsyncMock(side_effect=[
+            EndpointTimeout(), create_response(200)])
+        policy = RetryPolicy(budget=None)
+
+        response = await policy.execute_async(function)
+
+        self.assertEqual(response.status_code, 200)
+        sleep_mock.assert_awaited_once()
+
+
+@patch("clientlib.retries.time.sleep")
+class FunctionRetryTests(TestCase):
+    def _create_function(self, method):
+        return Function(
+            session=MagicMock(),
+            base_url="http://localhost",
+            method=method,
+            endpoint="/test",
+            retry_policy=RetryPolicy(budget=None)
+        )
+
+    @patch("clientlib.functions.APIRequest.execute")
+    def test_retry_idempotent_request(self, execute_mock, sleep_mock):
+        execute_mock.side_effect = [EndpointTimeout(), create_response(200)]
+
+        response = self._create_function("GET").execute()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(execute_mock.call_count, 2)
+
+    @patch("clientlib.functions.APIRequest.execute")
+    def test_do_not_retry_non_idempotent_request(self, execute_mock,
+                                                 sleep_mock):
+        execute_mock.side_effect = [EndpointTimeout(), create_response(200)]
+
+        with self.assertRaises(EndpointTimeout):
+            self._create_function("POST").execute()
+
+
+if __name__ == "__main__":
+    main()
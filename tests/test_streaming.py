@@ -0,0 +1,72 @@
+import json
+from unittest import TestCase, main
+
+from clientlib.streaming import JSONArrayDecoder, iter_json_array
+
+
+class JSONArrayDecoderTests(TestCase):
+    def _chunk(self, document, size):
+        return [
+            document[i:i + size]
+            for i in range(0, len(document), size)
+        ]
+
+    def test_decode_in_chunks(self):
+        items = [
+            {"id": i, "title": "title é {}".format(i), "tags": [1.5, None]}
+            for i in range(100)
+        ] + [12345, "string", [], True]
+        document = json.dumps(items).encode("utf-8")
+
+        for chunk_size in (1, 2, 3, 7, 64, len(document)):
+            self.assertEqual(
+                list(iter_json_array(self._chunk(document, chunk_size))),
+                items
+            )
+
+    def test_decode_numbers_in_chunks(self):
+        items = [1.5, -2.25e-3, 1e5, 0, -17, 3.0E+2, 123456789]
+        document = json.dumps(items).replace(", ", ",").encode("utf-8")
+
+        for chunk_size in (1, 2, 3, 5, len(document)):
+            self.assertEqual(
+                list(iter_json_array(self._chunk(document, chunk_size))),
+                items
+            )
+
+    def test_numbers_split_at_chunk_boundary(self):
+        self.assertEqual(list(iter_json_array([b"[1.", b"5, 2]"])), [1.5, 2])
+        self.assertEqual(list(iter_json_array([b"[1e", b"5]"])), [1e5])
+        self.assertEqual(list(iter_json_array([b"[-", b"1]"])), [-1])
+
+    def test_items_are_returned_as_soon_as_they_are_complete(self):
+        decoder = JSONArrayDecoder()
+
+        self.assertEqual(decoder.feed(b'[{"id": 1}, {"id"'), [{"id": 1}])
+        self.assertEqual(decoder.feed(b': 2}, 1'), [{"id": 2}])
+        self.assertEqual(decoder.feed(b'23'), [])
+        self.assertEqual(decoder.feed(b']'), [123])
+        self.assertEqual(decoder.close(), [])
+
+    def test_empty_array(self):
+        self.assertEqual(list(iter_json_array([b" [ ", b" ] "])), [])
+
+    def test_fail_when_document_is_not_an_array(self):
+        with self.assertRaises(ValueError):
+            list(iter_json_array([b'{"id": 1}']))
+
+    def test_fail_when_array_is_incomplete(self):
+        with self.assertRaises(ValueError):
+            list(iter_json_array([b'[{"id": 1}, ']))
+
+    def test_fail_with_invalid_separator(self):
+        with self.assertRaises(ValueError):
+            list(iter_json_array([b'[1 2]']))
+
+    def test_fail_with_trailing_data(self):
+        with self.assertRaises(ValueError):
+            list(iter_json_array([b'[1] 2']))
+
+
+if __name__ == "__main__":
+    main()
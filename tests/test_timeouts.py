@@ -0,0 +1,272 @@
+import threading
+from unittest import TestCase, IsolatedAsyncioTestCase, main
+from unittest.mock import MagicMock, patch
+
+import httpx
+from requests import Session
+from requests.exceptions import ReadTimeout
+
+from clientlib.concurrency import execute_concurrently
+from clientlib.exceptions import DeadlineExceeded, EndpointTimeout
+from clientlib.functions import Function
+from clientlib.models import Response
+from clientlib.requests import APIRequest, AsyncAPIRequest
+from clientlib.retries import RetryPolicy
+from clientlib.timeouts import (
+    AdaptiveTimeout, Timeout, clamp_timeout, create_timeout, deadline,
+    get_remaining_time, is_deadline_exceeded
+)
+
+
+class TimeoutTests(TestCase):
+    def test_create_timeout(self):
+        timeout = create_timeout(5)
+        self.assertEqual(timeout.get_timeouts("GET", "/test"), (5, 5))
+
+        timeout = create_timeout((1, 5))
+        self.assertEqual(timeout.get_timeouts("GET", "/test"), (1, 5))
+
+        timeout = Timeout(connect=1, read=2, deadline=10)
+        self.assertIs(create_timeout(timeout), timeout)
+
+    def test_clamp_timeout(self):
+        self.assertEqual(clamp_timeout(5, 2), 2)
+        self.assertEqual(clamp_timeout(1, 2), 1)
+        self.assertEqual(clamp_timeout(None, 2), 2)
+        self.assertEqual(clamp_timeout((1, 5), 2), (1, 2))
+        self.assertEqual(clamp_timeout((None, None), 2), (2, 2))
+
+
+class DeadlineTests(TestCase):
+    def test_no_deadline(self):
+        self.assertIsNone(get_remaining_time())
+        self.assertFalse(is_deadline_exceeded())
+
+    @patch("clientlib.timeouts.monotonic")
+    def test_deadline(self, monotonic_mock):
+        monotonic_mock.return_value = 100
+
+        with deadline(10):
+            self.assertEqual(get_remaining_time(), 10)
+
+            monotonic_mock.return_value = 111
+            self.assertTrue(is_deadline_exceeded())
+
+        self.assertIsNone(get_remaining_time())
+
+    @patch("clientlib.timeouts.monotonic")
+    def test_nested_deadline_cant_extend_deadline(self, monotonic_mock):
+        monotonic_mock.return_value = 100
+
+        with deadline(10):
+            with deadline(20):
+                self.assertEqual(get_remaining_time(), 10)
+
+            with deadline(5):
+                self.assertEqual(get_remaining_time(), 5)
+
+            with deadline(None):
+                self.assertEqual(get_remaining_time(), 10)
+
+    def test_propagate_deadline_to_concurrent_calls(self):
+        def call():
+            return get_remaining_time()
+
+        with deadline(10):
+            results = list(execute_concurrently([(call, {})] * 3))
+
+        for result in results:
+            self.assertIsNotNone(result.response)
+            self.assertLessEqual(result.response, 10)
+
+    def test_deadline_is_local_to_thread(self):
+        remaining = []
+
+        with deadline(10):
+            thread = threading.Thread(
+                target=lambda: remaining.append(get_remaining_time()))
+            thread.start()
+            thread.join()
+
+        self.assertEqual(remaining, [None])
+
+
+class AdaptiveTimeoutTests(TestCase):
+    def test_use_read_timeout_until_enough_samples(self):
+        timeout = AdaptiveTimeout(connect=1, read=5, min_samples=3)
+
+        timeout.record_latency("GET", "/test", 0.1)
+        timeout.record_latency("GET", "/test", 0.1)
+
+        self.assertEqual(timeout.get_timeouts("GET", "/test"), (1, 5))
+
+    def test_adapt_read_timeout(self):
+        timeout = AdaptiveTimeout(
+            read=5, percentile=90, multiplier=2, min_samples=10)
+
+        for i in range(1, 11):
+            timeout.record_latency("GET", "/test", i / 100.0)
+
+        self.assertAlmostEqual(timeout.get_read_timeout("GET", "/test"), 0.18)
+        self.assertEqual(timeout.get_read_timeout("GET", "/other"), 5)
+
+    def test_limit_read_timeout(self):
+        timeout = AdaptiveTimeout(
+            read=1, min_read=0.05, multiplier=2, min_samples=1)
+
+        timeout.record_latency("GET", "/fast", 0.001)
+        timeout.record_latency("GET", "/slow", 10)
+
+        self.assertEqual(timeout.get_read_timeout("GET", "/fast"), 0.05)
+        self.assertEqual(timeout.get_read_timeout("GET", "/slow"), 1)
+
+    def test_keep_recent_latencies(self):
+        timeout = AdaptiveTimeout(
+            read=10, percentile=100, multiplier=1, min_samples=1,
+            window_size=2)
+
+        for latency in (5, 0.1, 0.2):
+            timeout.record_latency("GET", "/test", latency)
+
+        self.assertEqual(timeout.get_read_timeout("GET", "/test"), 0.2)
+
+
+class APIRequestTimeoutTests(TestCase):
+    def _create_request(self, timeout, transport):
+        return APIRequest(
+            session=Session(),
+            base_url="http://localhost",
+            method="GET",
+            endpoint="/test",
+            timeout=timeout,
+            transport=transport
+        )
+
+    def _create_transport(self):
+        transport = MagicMock()
+        transport.send.return_value = MagicMock(
+            status_code=200, headers={}, content=b"{}")
+
+        return transport
+
+    def test_send_connect_and_read_timeouts(self):
+        transport = self._create_transport()
+
+        self._create_request(Timeout(connect=1, read=5), transport).execute()
+
+        self.assertEqual(transport.send.call_args[1]["timeout"], (1, 5))
+
+    def test_limit_timeouts_to_deadline(self):
+        transport = self._create_transport()
+
+        with deadline(2):
+            self._create_request(5, transport).execute()
+
+        timeout = transport.send.call_args[1]["timeout"]
+        self.assertGreater(timeout, 1)
+        self.assertLessEqual(timeout, 2)
+
+    def test_fail_without_sending_when_deadline_is_exceeded(self):
+        transport = self._create_transport()
+
+        with deadline(-1):
+            with self.assertRaises(DeadlineExceeded):
+                self._create_request(5, transport).execute()
+
+        transport.send.assert_not_called()
+
+    def test_record_latencies_of_adaptive_timeout(self):
+        timeout = AdaptiveTimeout(min_samples=1)
+        transport = self._create_transport()
+
+        self._create_request(timeout, transport).execute()
+
+        transport.send.side_effect = ReadTimeout()
+        with self.assertRaises(EndpointTimeout) as context:
+            self._create_request(timeout, transport).execute()
+
+        self.assertNotIsInstance(context.exception, DeadlineExceeded)
+        self.assertEqual(len(timeout._windows[("GET", "/test")]), 2)
+
+
+class AsyncAPIRequestTimeoutTests(IsolatedAsyncioTestCase):
+    async def test_send_connect_and_read_timeouts(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+
+            return httpx.Response(200, json={})
+
+        async with httpx.AsyncClient(
+                transport=httpx.MockTransport(handler)) as session:
+            request = AsyncAPIRequest(
+                session=session,
+                base_url="http://localhost",
+                method="GET",
+                endpoint="/test",
+                timeout=Timeout(connect=1, read=5)
+            )
+
+            await request.execute()
+
+        self.assertEqual(
+            requests[0].extensions["timeout"],
+            {"connect": 1, "read": 5, "write": 5, "pool": 5}
+        )
+
+
+class FunctionDeadlineTests(TestCase):
+    @patch("clientlib.retries.time.sleep")
+    def test_stop_retrying_at_deadline(self, sleep_mock):
+        transport = MagicMock()
+        transport.send.return_value = MagicMock(
+            status_code=503, headers={}, content=b"{}")
+
+        function = Function(
+            session=Session(),
+            base_url="http://localhost",
+            method="GET",
+            endpoint="/test",
+            timeout=Timeout(connect=1, read=5, deadline=0.5),
+            retry_policy=RetryPolicy(
+                max_retries=10, backoff_factor=1, jitter=False, budget=None),
+            transport=transport
+        )
+
+        response = function.execute()
+
+        self.assertEqual(response.status_code, 503)
+        transport.send.assert_called_once()
+        sleep_mock.assert_not_called()
+
+    def test_apply_deadline_to_execution(self):
+        remaining = []
+
+        def send(request, timeout, verify, stream):
+            remaining.append(get_remaining_time())
+
+            return MagicMock(status_code=200, headers={}, content=b"{}")
+
+        transport = MagicMock()
+        transport.send.side_effect = send
+
+        function = Function(
+            session=Session(),
+            base_url="http://localhost",
+            method="GET",
+            endpoint="/test",
+            timeout=Timeout(connect=1, read=5, deadline=2),
+            transport=transport
+        )
+
+        self.assertEqual(
+            function.execute(), Response(status_code=200, headers={}, json={}))
+
+        self.assertLessEqual(remaining[0], 2)
+        self.assertLessEqual(transport.send.call_args[1]["timeout"][1], 2)
+        self.assertIsNone(get_remaining_time())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+import json
+from unittest import TestCase, main
+from unittest.mock import MagicMock, patch
+
+import httpx
+from requests import Session
+
+from clientlib.clients import Client
+from clientlib.exceptions import (
+    EndpointTimeout, EndpointConnectionError, EndpointRequestError
+)
+from clientlib.requests import APIRequest
+from clientlib.transports import (
+    HTTP2Transport, RequestsTransport, create_httpx_timeout
+)
+
+
+class SampleClient(Client):
+    pass
+
+
+class RequestsTransportTests(TestCase):
+    def test_send(self):
+        session = MagicMock()
+        request = MagicMock()
+
+        transport = RequestsTransport(session)
+        response = transport.send(
+            request, timeout=5, verify=False, stream=True)
+
+        self.assertIs(response, session.send.return_value)
+        session.send.assert_called_once_with(
+            request=request, verify=False, timeout=5, stream=True)
+
+    def test_client_default_transport(self):
+        client = SampleClient(base_url="http://localhost")
+
+        self.assertIsInstance(client.transport, RequestsTransport)
+        self.assertIs(client.transport.session, client.session)
+
+
+class HTTP2TransportTests(TestCase):
+    def setUp(self):
+        self.handler = None
+        self.verify = []
+
+        patcher = patch(
+            "httpx._client.HTTPTransport",
+            side_effect=self._create_http_transport
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _create_http_transport(self, verify, **kwargs):
+        self.verify.append(verify)
+
+        return httpx.MockTransport(self.handler)
+
+    def _create_transport(self, handler):
+        self.handler = handler
+
+        return HTTP2Transport()
+
+    def _create_request(self, transport, **kwargs):
+        return APIRequest(
+            session=Session(),
+            base_url="http://localhost",
+            method=kwargs.pop("method", "GET"),
+            endpoint="/api/v1/test",
+            transport=transport,
+            **kwargs
+        )
+
+    def test_execute(self):
+        def handler(request):
+            self.assertEqual(request.method, "POST")
+            self.assertEqual(str(request.url), "http://localhost/api/v1/test")
+            self.assertEqual(json.loads(request.content), {"message": "hi"})
+            self.assertEqual(
+                request.headers["Content-Type"], "application/json")
+
+            return httpx.Response(
+                201, json={"message": "hello world"}, headers={"X-Id": "1"})
+
+        request = self._create_request(
+            self._create_transport(handler),
+            method="POST",
+            json={"message": "hi"}
+        )
+
+        response = request.execute()
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.headers["x-id"], "1")
+        self.assertEqual(response.json, {"message": "hello world"})
+
+    def test_execute_with_stream(self):
+        def handler(request):
+            return httpx.Response(200, json=[{"id": 1}, {"id": 2}])
+
+        request = self._create_request(
+            self._create_transport(handler), stream=True)
+
+        response = request.execute()
+
+        self.assertEqual(list(response.json), [{"id": 1}, {"id": 2}])
+
+    def test_follow_redirects(self):
+        def handler(request):
+            if request.url.path == "/api/v1/test":
+                return httpx.Response(
+                    301, headers={"Location": "http://localhost/api/v1/new"})
+
+            return httpx.Response(200, json={"message": "hello world"})
+
+        request = self._create_request(self._create_transport(handler))
+
+        response = request.execute()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, {"message": "hello world"})
+
+    def test_verify(self):
+        def handler(request):
+            return httpx.Response(200, json={})
+
+        transport = self._create_transport(handler)
+
+        for verify in (True, False, False):
+            self._create_request(transport, verify=verify).execute()
+
+        self.assertEqual(self.verify, [True, False])
+
+    def test_map_exceptions(self):
+        errors = (
+            (httpx.ConnectTimeout("timeout"), EndpointTimeout),
+            (httpx.ReadTimeout("timeout"), EndpointTimeout),
+            (httpx.ConnectError("failed"), EndpointConnectionError),
+            (httpx.RemoteProtocolError("failed"), EndpointConnectionError),
+            (httpx.DecodingError("failed"), EndpointRequestError),
+        )
+
+        for error, expected_error in errors:
+            with self.subTest(error=error):
+                def handler(request):
+                    raise error
+
+                request = self._create_request(
+                    self._create_transport(handler))
+
+                with self.assertRaises(expected_error):
+                    request.execute()
+
+    def test_timeout(self):
+        self.assertEqual(create_httpx_timeout(5), httpx.Timeout(5))
+        self.assertEqual(
+            create_httpx_timeout((1, 5)), httpx.Timeout(5, connect=1))
+
+    def test_close(self):
+        transport = self._create_transport(
+            lambda request: httpx.Response(200, json={}))
+        self._create_request(transport).execute()
+        httpx_client = transport._get_client(True)
+
+        client = SampleClient(base_url="http://localhost", transport=transport)
+        session = client.session = MagicMock()
+        client.close()
+
+        self.assertTrue(httpx_client.is_closed)
+        session.close.assert_called_once_with()
+
+
+if __name__ == "__main__":
+    main()
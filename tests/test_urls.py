@@ -0,0 +1,68 @@
+from unittest import TestCase, main
+
+from clientlib.exceptions import EndpointDeclarationError
+from clientlib.urls import URLTemplate
+
+
+class URLTemplateTests(TestCase):
+    def test_render(self):
+        template = URLTemplate("/users/{user_id}/posts/{post_id}")
+
+        self.assertEqual(
+            template.placeholders, frozenset(["user_id", "post_id"]))
+        self.assertEqual(
+            template.render({"user_id": 1, "post_id": "abc"}),
+            "/users/1/posts/abc"
+        )
+
+    def test_render_without_placeholders(self):
+        template = URLTemplate("/posts")
+
+        self.assertEqual(template.render(), "/posts")
+
+    def test_render_with_base_url(self):
+        template = URLTemplate("/posts/{post_id}") \
+            .with_base_url("http://localhost")
+
+        self.assertEqual(
+            template.render({"post_id": 1}), "http://localhost/posts/1")
+
+    def test_argument_values_are_percent_encoded(self):
+        template = URLTemplate("/files/{name}")
+
+        self.assertEqual(
+            template.render({"name": "a b/c?d#é"}),
+            "/files/a%20b%2Fc%3Fd%23%C3%A9"
+        )
+
+    def test_escaped_braces(self):
+        template = URLTemplate("/{{literal}}/{value}")
+
+        self.assertEqual(template.render({"value": 1}), "/{literal}/1")
+
+    def test_fail_with_positional_placeholder(self):
+        with self.assertRaises(EndpointDeclarationError):
+            URLTemplate("/posts/{}")
+
+    def test_fail_with_format_spec(self):
+        with self.assertRaises(EndpointDeclarationError):
+            URLTemplate("/posts/{post_id:d}")
+
+    def test_fail_with_unbalanced_braces(self):
+        with self.assertRaises(EndpointDeclarationError):
+            URLTemplate("/posts/{post_id")
+
+    def test_validate_args(self):
+        template = URLTemplate("/posts/{post_id}")
+
+        template.validate_args(["post_id"])
+
+        with self.assertRaises(EndpointDeclarationError):
+            template.validate_args([])
+
+        with self.assertRaises(EndpointDeclarationError):
+            template.validate_args(["post_id", "user_id"])
+
+
+if __name__ == "__main__":
+    main()